@@ -0,0 +1,43 @@
+"""
+Runs a single day's solvers: `python -m common 14`. Only that day's modules are imported, so a single day starts
+as quickly as its own imports allow. Use --import-times to see which modules are slow to import.
+"""
+import argparse
+import time
+
+from common.imports import ImportTimer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m common', description="Run a single day's solvers.")
+    parser.add_argument('day', type=int)
+    parser.add_argument('--file', action='append', dest='files', metavar='NAME',
+                        help="solve NAME (relative to the day's directory) rather than the default inputs")
+    parser.add_argument('--shard-jobs', type=int, default=1, metavar='N',
+                        help='split each line solver input across N processes where its solutions can be merged')
+    parser.add_argument('--import-times', action='store_true', help='report how long each module took to import')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with ImportTimer() as timer:
+        from common.days import get_day_solvers, in_day_directory
+        solvers = get_day_solvers(args.day)
+    import_seconds = time.perf_counter() - start
+
+    with in_day_directory(args.day):
+        for solver in solvers:
+            if hasattr(solver, 'jobs'):
+                solver.jobs = args.shard_jobs
+            if args.files:
+                for file_name in args.files:
+                    solver.solve_file(file_name)
+            else:
+                solver.solve_all()
+
+    if args.import_times:
+        print(f'Imported day {args.day} in {import_seconds * 1000:0.2f}ms:')
+        print(timer.format_report(limit=25))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+from typing import Any, Callable, Iterable, Sequence, TypeVar, Optional
+
+import numpy as np
+
+from common.grid import CARDINAL_DIRS, Direction, Grid, InvalidPointException, PositionType
+
+T = TypeVar('T')
+
+# Either a cell value, or a predicate applied to the whole array at once which returns a boolean array
+ValueOrPredicate = Any | Callable[[np.ndarray], np.ndarray]
+
+
+class ArrayGrid(Grid[T]):
+    """
+    A Grid stored as a single contiguous NumPy array. Single cell access behaves like Grid (and returns plain Python
+    values), while the bulk operations below work on the whole grid at once without any per-cell Python overhead.
+    """
+
+    def __init__(self, grid: Sequence[Sequence[T]] | np.ndarray, dtype: Optional[Any] = None) -> None:
+        if not isinstance(grid, np.ndarray):
+            # Split up rows given as strings, which NumPy would otherwise treat as single values
+            grid = [list(row) for row in grid]
+        self._array = np.ascontiguousarray(grid, dtype=dtype)
+        if self._array.ndim != 2:
+            raise ValueError(f'Expected a 2D grid, got shape {self._array.shape}')
+        self.height, self.width = self._array.shape
+
+    @classmethod
+    def create_empty_grid(cls, height: int, width: int) -> 'ArrayGrid[Optional[T]]':
+        return ArrayGrid(np.full((height, width), None, dtype=object))
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._array
+
+    def __getitem__(self, point: PositionType) -> T:
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}. Width: {self.width}, Height: {self.height}')
+        return self._array.item(point)
+
+    def __setitem__(self, point: PositionType, value: T) -> None:
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}')
+        if self._tracks_writes:
+            self._before_write(point, value)
+        self._array[point] = value
+
+    def iter_points_and_values(
+        self,
+        row_order_asc: bool = True,
+        col_order_asc: bool = True,
+    ) -> Iterable[tuple[PositionType, T]]:
+        ordered = self._array[::1 if row_order_asc else -1, ::1 if col_order_asc else -1]
+        return zip(self.iter_points(row_order_asc, col_order_asc), ordered.ravel().tolist())
+
+    def format_str(self, format_val: Callable[[T], str] = str) -> str:
+        return '\n'.join(
+            ''.join(map(format_val, row))
+            for row in self._array.tolist()
+        )
+
+    def _line_values(self, start: PositionType, step: PositionType, length: int) -> list[T]:
+        (row, col), (d_row, d_col) = start, step
+        steps = np.arange(length)
+        return self._array[row + steps * d_row, col + steps * d_col].tolist()
+
+    def copy(self) -> 'ArrayGrid[T]':
+        return ArrayGrid(self._array.copy())
+
+    def mask(self, value_or_predicate: ValueOrPredicate) -> np.ndarray:
+        """
+        A boolean array which is true wherever the grid equals the given value or, if given a predicate, wherever
+        the predicate (applied to the whole array, e.g. `lambda a: a > 3`) is true.
+        """
+        if callable(value_or_predicate):
+            return np.asarray(value_or_predicate(self._array), dtype=bool)
+        return self._array == value_or_predicate
+
+    @staticmethod
+    def where(mask: np.ndarray) -> list[PositionType]:
+        rows, cols = np.nonzero(mask)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def find_all(self, value_or_predicate: ValueOrPredicate) -> list[PositionType]:
+        return self.where(self.mask(value_or_predicate))
+
+    def shift(
+        self,
+        direction: Direction | PositionType,
+        fill_value: T,
+        array: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Returns an array where each cell holds the value of its neighbour in the given direction (a Direction or any
+        offset), or `fill_value` where that neighbour would be off the grid. Shifts `array` instead of the grid's
+        own values if given, e.g. to shift a mask.
+        """
+        source = self._array if array is None else array
+        d_row, d_col = direction.value if isinstance(direction, Direction) else direction
+        result = np.full_like(source, fill_value)
+        if abs(d_row) >= self.height or abs(d_col) >= self.width:
+            return result
+        result[_dest_slice(d_row), _dest_slice(d_col)] = source[_source_slice(d_row), _source_slice(d_col)]
+        return result
+
+    def count_neighbors(
+        self,
+        value_or_predicate: ValueOrPredicate,
+        directions: Sequence[Direction] = tuple(CARDINAL_DIRS),
+    ) -> np.ndarray:
+        """
+        For every cell, how many of its neighbours in the given directions match the value or predicate.
+        """
+        mask = self.mask(value_or_predicate)
+        counts = np.zeros(mask.shape, dtype=np.int64)
+        for direction in directions:
+            counts += self.shift(direction, False, array=mask)
+        return counts
+
+
+def _source_slice(offset: int) -> slice:
+    # The part of the source which has a neighbour `offset` away
+    return slice(offset, None) if offset >= 0 else slice(None, offset)
+
+
+def _dest_slice(offset: int) -> slice:
+    return slice(None, -offset or None) if offset >= 0 else slice(-offset, None)
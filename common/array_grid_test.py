@@ -0,0 +1,51 @@
+import importlib.util
+import io
+import unittest
+
+from common.grid import Direction, load_char_grid, load_digit_grid
+
+
+@unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy is not installed')
+class TestArrayGrid(unittest.TestCase):
+    def setUp(self) -> None:
+        self.grid = load_char_grid(io.StringIO('ab.\n.#b\n'), as_array=True)
+
+    def test_matches_grid_api(self):
+        plain = load_char_grid(io.StringIO('ab.\n.#b\n'))
+        self.assertEqual(self.grid.dimensions(), plain.dimensions())
+        self.assertEqual(self.grid.format_str(), plain.format_str())
+        self.assertEqual(list(self.grid.iter_points_and_values(False, False)),
+                         list(plain.iter_points_and_values(False, False)))
+        self.assertEqual(list(self.grid.iter_neighboring_points((0, 0))), [(0, 1), (1, 0)])
+        self.assertEqual(self.grid[1, 1], '#')
+
+    def test_ignores_blank_lines(self):
+        grid = load_char_grid(io.StringIO('ab.\n.#b\n\n'), as_array=True)
+        self.assertEqual(grid.format_str(), self.grid.format_str())
+
+    def test_find_all_and_shift(self):
+        self.assertEqual(self.grid.find_all('b'), [(0, 1), (1, 2)])
+        self.assertEqual(self.grid.shift(Direction.EAST, '~').tolist(), [['b', '.', '~'], ['#', 'b', '~']])
+        self.assertEqual(self.grid.shift(Direction.NORTH, '~').tolist(), [['~', '~', '~'], ['a', 'b', '.']])
+
+    def test_count_neighbors(self):
+        digits = load_digit_grid(io.StringIO('123\n456\n'), as_array=True)
+        self.assertEqual(digits[1, 2], 6)
+        self.assertEqual(digits.count_neighbors(lambda a: a % 2 == 0).tolist(), [[2, 0, 2], [0, 3, 0]])
+
+    def test_tracked_writes(self):
+        index = self.grid.index_values()
+        snapshot = self.grid.snapshot()
+        with self.grid.what_if():
+            self.grid[0, 0] = 'b'
+            self.grid[1, 1] = 'b'
+            self.assertEqual(index.find_all('b'), self.grid.find_all('b'))
+            self.assertEqual(self.grid.count('b'), 4)
+            self.assertEqual(self.grid.count('a'), 0)
+        with self.grid.transaction():
+            self.grid[0, 2] = '#'
+        self.assertEqual(self.grid.format_str(), 'ab#\n.#b')
+        self.assertEqual(snapshot.format_str(), 'ab.\n.#b')
+        self.assertEqual(index.find_all('b'), self.grid.find_all('b'))
+        self.assertEqual(index.find_all('#'), self.grid.find_all('#'))
+        self.assertEqual([self.grid.count(value) for value in 'ab.#'], [1, 2, 1, 2])
@@ -0,0 +1,178 @@
+import argparse
+import dataclasses
+import json
+import math
+import statistics
+import time
+from typing import Any, Callable, Iterable, Sequence
+
+from common.days import available_days, day_directory, import_day_module, in_day_directory, parse_day_range
+
+BenchmarkFunc = Callable[[], Any]
+
+# Day number -> implementation name -> benchmark. The first implementation registered for a day is the
+# reference that speedups are reported against.
+_BENCHMARKS: dict[int, dict[str, BenchmarkFunc]] = {}
+
+
+class BenchmarkRegressionException(Exception):
+    pass
+
+
+def register_benchmark(day_number: int, name: str) -> Callable[[BenchmarkFunc], BenchmarkFunc]:
+    def decorator(func: BenchmarkFunc) -> BenchmarkFunc:
+        _BENCHMARKS.setdefault(day_number, {})[name] = func
+        return func
+
+    return decorator
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkStats:
+    day_number: int
+    name: str
+    samples: Sequence[float]
+
+    @property
+    def key(self) -> str:
+        return f'{self.day_number}/{self.name}'
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> float:
+        ordered = sorted(self.samples)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+    @property
+    def variance(self) -> float:
+        return statistics.variance(self.samples) if len(self.samples) > 1 else 0.0
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            'median': self.median,
+            'p95': self.p95,
+            'variance': self.variance,
+            'samples': list(self.samples),
+        }
+
+    def format_str(self) -> str:
+        return (
+            f'{self.name}: median {self.median:0.4f}s, p95 {self.p95:0.4f}s, '
+            f'stdev {math.sqrt(self.variance):0.4f}s over {len(self.samples)} trials'
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class Regression:
+    key: str
+    baseline_median: float
+    current_median: float
+
+    def format_str(self) -> str:
+        slowdown = self.current_median / self.baseline_median
+        return f'{self.key}: {self.baseline_median:0.4f}s -> {self.current_median:0.4f}s ({slowdown:0.2f}x)'
+
+
+def time_trials(func: BenchmarkFunc, warmup: int = 1, trials: int = 10) -> list[float]:
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(trials):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_day_benchmarks(day_number: int, warmup: int = 1, trials: int = 10) -> list[BenchmarkStats]:
+    import_day_module(day_number, 'benchmark')
+    with in_day_directory(day_number):
+        return [
+            BenchmarkStats(day_number, name, time_trials(func, warmup=warmup, trials=trials))
+            for name, func in _BENCHMARKS.get(day_number, {}).items()
+        ]
+
+
+def days_with_benchmarks() -> list[int]:
+    return [
+        day_number
+        for day_number in available_days()
+        if (day_directory(day_number) / 'benchmark.py').exists()
+    ]
+
+
+def save_results(path: str, results: Iterable[BenchmarkStats]) -> None:
+    with open(path, 'w') as f:
+        json.dump({stats.key: stats.to_json() for stats in results}, f, indent=2)
+
+
+def load_results(path: str) -> dict[str, dict[str, Any]]:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def find_regressions(
+    results: Iterable[BenchmarkStats],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[Regression]:
+    """
+    A benchmark has regressed if its median is more than `threshold` (as a fraction) slower than its
+    median in the baseline. Benchmarks missing from the baseline are ignored.
+    """
+    regressions = []
+    for stats in results:
+        if stats.key not in baseline:
+            continue
+        baseline_median = baseline[stats.key]['median']
+        if stats.median > baseline_median * (1 + threshold):
+            regressions.append(Regression(stats.key, baseline_median, stats.median))
+    return regressions
+
+
+def format_day_report(day_results: Sequence[BenchmarkStats]) -> str:
+    if not day_results:
+        return ''
+    reference = day_results[0]
+    lines = [f'Day {reference.day_number}:']
+    for stats in day_results:
+        lines.append(f'\t{stats.format_str()}. Speedup vs {reference.name}: {reference.median / stats.median:0.2f}x')
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the registered implementations for each day.')
+    parser.add_argument('--days', type=parse_day_range, default=None, help='e.g. "4,6"')
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--trials', type=int, default=10)
+    parser.add_argument('--save', metavar='PATH', help='write results to PATH as JSON')
+    parser.add_argument('--baseline', metavar='PATH', help='compare against results previously saved to PATH')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed fractional slowdown vs baseline')
+    args = parser.parse_args()
+
+    all_results: list[BenchmarkStats] = []
+    for day_number in args.days or days_with_benchmarks():
+        day_results = run_day_benchmarks(day_number, warmup=args.warmup, trials=args.trials)
+        print(format_day_report(day_results))
+        all_results.extend(day_results)
+
+    if args.save:
+        save_results(args.save, all_results)
+
+    if args.baseline:
+        regressions = find_regressions(all_results, load_results(args.baseline), args.threshold)
+        if regressions:
+            raise BenchmarkRegressionException(
+                'Regressed past threshold:\n' + '\n'.join(r.format_str() for r in regressions)
+            )
+
+
+if __name__ == '__main__':
+    # Day benchmark modules register against `common.benchmark`, which is a different module object from
+    # `__main__` when run with `python -m`, so run that module's registry rather than this one's.
+    from common.benchmark import main as registered_main
+    registered_main()
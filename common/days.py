@@ -0,0 +1,103 @@
+import contextlib
+import importlib.util
+import os
+import pathlib
+import sys
+from types import ModuleType
+from typing import Iterator, Protocol, Sequence
+
+BASE_DIR = pathlib.Path(__file__).parent.parent.resolve()
+
+
+class NoSuchDayException(Exception):
+    pass
+
+
+class Solver(Protocol):
+    def solve_all(self) -> dict[str, list[str | int]]:
+        ...
+
+    def solve_file(self, file_name: str) -> list[str | int]:
+        ...
+
+
+def day_directory(day_number: int) -> pathlib.Path:
+    return BASE_DIR / f'day_{day_number}'
+
+
+def available_days() -> list[int]:
+    return sorted(
+        int(path.stem.removeprefix('day_'))
+        for path in BASE_DIR.glob('day_*/day_*.py')
+        if path.stem == path.parent.name
+    )
+
+
+def parse_day_range(spec: str) -> list[int]:
+    """
+    Parses day specs like "1-23" or "1,3,5-7" into a sorted list of day numbers.
+    """
+    days: set[int] = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = map(int, part.split('-'))
+            days.update(range(first, last + 1))
+        else:
+            days.add(int(part))
+    return sorted(days)
+
+
+@contextlib.contextmanager
+def in_day_directory(day_number: int) -> Iterator[pathlib.Path]:
+    """
+    Day solvers refer to their input files relative to the day's directory, so they need to run from it.
+    """
+    directory = day_directory(day_number)
+    if not directory.is_dir():
+        raise NoSuchDayException(f'No directory for day {day_number}')
+
+    prev_dir = os.getcwd()
+    os.chdir(directory)
+    try:
+        yield directory
+    finally:
+        os.chdir(prev_dir)
+
+
+def import_day_module(day_number: int, module_name: str | None = None) -> ModuleType:
+    """
+    Imports one of a day's modules as `day_N.<module_name>`. A day's modules import each other by bare name
+    (`import fast_sol`), as they would when run from the day's directory, so that directory goes on the path too.
+    """
+    module_name = module_name or f'day_{day_number}'
+    qualified_name = f'day_{day_number}.{module_name}'
+    if qualified_name in sys.modules:
+        return sys.modules[qualified_name]
+
+    directory = day_directory(day_number)
+    path = directory / f'{module_name}.py'
+    if not path.exists():
+        raise NoSuchDayException(f'No module {module_name} for day {day_number}')
+    if str(directory) not in sys.path:
+        sys.path.append(str(directory))
+    # Loaded straight from its file, since `day_N` resolves to day_N.py rather than the directory once the
+    # directory is on the path
+    spec = importlib.util.spec_from_file_location(qualified_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[qualified_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[qualified_name]
+        raise
+    return module
+
+
+def get_day_solvers(day_number: int) -> Sequence[Solver]:
+    module = import_day_module(day_number)
+    if not hasattr(module, 'get_solvers'):
+        raise NoSuchDayException(f'Day {day_number} does not define get_solvers()')
+    return module.get_solvers()
@@ -1,8 +1,18 @@
-from typing import Generic, TypeVar, Callable, TextIO, Any
+import inspect
+from typing import Generic, TypeVar, Callable, TextIO, Any, Optional, Sequence, ContextManager, TYPE_CHECKING
+
+from common.instrumentation import Instrumentation, null_measure
+
+if TYPE_CHECKING:
+    from common.loader_cache import LoaderCache
 
 T = TypeVar('T')
 
 
+class InvalidStageException(Exception):
+    pass
+
+
 # TODO: might be nice to support different loaders for different days
 class FileSolver(Generic[T]):
     def __init__(
@@ -10,12 +20,24 @@ class FileSolver(Generic[T]):
         file_names: list[str],
         loader: Callable[[TextIO], T],
         solutions: list[Callable[[T], str | int]],
-        log_func: Callable[[Any], None] = print
+        log_func: Callable[[Any], None] = print,
+        instrumentation: Optional[Instrumentation] = None,
+        loader_cache: Optional['LoaderCache'] = None,
+        stages: Optional[dict[str, Callable[..., Any]]] = None,
     ) -> None:
+        """
+        Stages are named intermediate results shared between solutions. Any parameter of a solution (or of
+        another stage) after the loaded data that has no default names a stage it depends on, e.g.
+        `def solve_pt1(data: T, shortest_paths: dict) -> int`. Each stage runs at most once per file, so
+        solutions must not mutate stage results.
+        """
         self._file_names = file_names
         self._loader = loader
         self._solutions = solutions
         self._log_func = log_func
+        self.instrumentation = instrumentation
+        self.loader_cache = loader_cache
+        self._stages = stages or {}
 
     @classmethod
     def construct_for_day(
@@ -23,26 +45,84 @@ class FileSolver(Generic[T]):
         day_number: int,
         loader: Callable[[TextIO], T],
         solutions: list[Callable[[T], str | int]],
-        log_func: Callable[[Any], None] = print
+        log_func: Callable[[Any], None] = print,
+        instrumentation: Optional[Instrumentation] = None,
+        loader_cache: Optional['LoaderCache'] = None,
+        stages: Optional[dict[str, Callable[..., Any]]] = None,
     ) -> 'FileSolver[T]':
         return cls(
             file_names=[f'sample_{day_number}.txt', f'input_{day_number}.txt'],
             loader=loader,
             solutions=solutions,
-            log_func=log_func
+            log_func=log_func,
+            instrumentation=instrumentation,
+            loader_cache=loader_cache,
+            stages=stages,
         )
 
-    def solve_all(self) -> None:
-        for file_name in self._file_names:
-            self.solve_file(file_name)
+    def solve_all(self) -> dict[str, list[str | int]]:
+        return {
+            file_name: self.solve_file(file_name)
+            for file_name in self._file_names
+        }
+
+    def solve_file(self, file_name: str) -> list[str | int]:
+        measure = self.instrumentation.measure if self.instrumentation else null_measure
 
-    def solve_file(self, file_name: str) -> None:
         self._log_func('=' * 80)
         self._log_func(f'Solving {file_name}:')
-        with open(file_name, 'r') as f:
-            data = self._loader(f)
+        with measure(file_name, 'load'):
+            data = self._load(file_name)
 
+        results = []
+        stage_results: dict[str, Any] = {}
         for i, solution in enumerate(self._solutions):
-            result = solution(data)
+            # Stages run (and are measured) before the part, so a shared stage isn't charged to whichever part
+            # happens to need it first
+            kwargs = self._run_stages(solution, data, stage_results, file_name, measure)
+            with measure(file_name, f'part {i + 1}') as recorder:
+                result = solution(data, **kwargs)
+                recorder.result = result
+            results.append(result)
             self._log_func(f'\tSolution for part {i + 1}: {result}')
         self._log_func('')
+        return results
+
+    def _run_stages(
+        self,
+        func: Callable[..., Any],
+        data: T,
+        stage_results: dict[str, Any],
+        file_name: str,
+        measure: Callable[[str, str], ContextManager[Any]],
+        resolving: Sequence[str] = (),
+    ) -> dict[str, Any]:
+        """
+        Runs any stages `func` depends on that haven't run yet, returning them as keyword arguments for `func`.
+        """
+        if not self._stages:
+            return {}
+
+        # Every parameter after the loaded data without a default is the name of a stage this function depends on
+        parameters = list(inspect.signature(func).parameters.values())[1:]
+        kwargs = {}
+        for stage_name in (p.name for p in parameters if p.default is inspect.Parameter.empty):
+            if stage_name not in self._stages:
+                raise InvalidStageException(f'{func.__qualname__} depends on unknown stage {stage_name}')
+            if stage_name in resolving:
+                raise InvalidStageException(f'Cyclic stage dependency: {" -> ".join([*resolving, stage_name])}')
+            if stage_name not in stage_results:
+                stage = self._stages[stage_name]
+                stage_kwargs = self._run_stages(
+                    stage, data, stage_results, file_name, measure, [*resolving, stage_name]
+                )
+                with measure(file_name, f'stage {stage_name}'):
+                    stage_results[stage_name] = stage(data, **stage_kwargs)
+            kwargs[stage_name] = stage_results[stage_name]
+        return kwargs
+
+    def _load(self, file_name: str) -> T:
+        if self.loader_cache:
+            return self.loader_cache.load(file_name, self._loader)
+        with open(file_name, 'r') as f:
+            return self._loader(f)
@@ -0,0 +1,187 @@
+import argparse
+import contextlib
+import dataclasses
+import io
+import itertools
+import math
+import pathlib
+import random
+from typing import Callable, Iterable, Optional, Sequence, TextIO
+
+from common.days import available_days, day_directory, get_day_solvers, import_day_module, parse_day_range
+from common.instrumentation import Instrumentation, Measurement
+
+# Writes a valid puzzle input to the file. A scale of 1 is roughly the size of a real puzzle input, and the
+# amount of input grows linearly with scale (so grids grow in area, not side length).
+Generator = Callable[[TextIO, int, random.Random], None]
+
+# Day number -> (generator, indices of the day's solvers which can run against generated inputs, or None for all)
+_GENERATORS: dict[int, tuple[Generator, Optional[Sequence[int]]]] = {}
+
+GENERATED_FILE_PREFIX = 'generated_'
+
+
+def register_generator(
+    day_number: int,
+    solver_indices: Optional[Sequence[int]] = None,
+) -> Callable[[Generator], Generator]:
+    def decorator(func: Generator) -> Generator:
+        _GENERATORS[day_number] = (func, solver_indices)
+        return func
+
+    return decorator
+
+
+def scaled_side(base_side: int, scale: int) -> int:
+    return max(1, round(base_side * math.sqrt(scale)))
+
+
+def write_grid(file: TextIO, rows: Iterable[Iterable[str]]) -> None:
+    for row in rows:
+        file.write(''.join(row) + '\n')
+
+
+def generate_maze(height: int, width: int, rng: random.Random, loop_fraction: float = 0.0) -> list[list[str]]:
+    """
+    Carves a maze of '.' corridors surrounded by '#' walls. Corridors run between cells at odd coordinates, so
+    both dimensions are rounded up to be odd. With no loops there is exactly one path between any two corridor
+    cells; `loop_fraction` knocks out that fraction of the remaining inner walls to add alternate routes.
+    """
+    height, width = height | 1, width | 1
+    maze = [['#'] * width for _ in range(height)]
+    maze[1][1] = '.'
+    stack = [(1, 1)]
+    while stack:
+        row, col = stack[-1]
+        unvisited = [
+            (row + d_row, col + d_col)
+            for d_row, d_col in ((-2, 0), (2, 0), (0, -2), (0, 2))
+            if 0 < row + d_row < height - 1 and 0 < col + d_col < width - 1 and maze[row + d_row][col + d_col] == '#'
+        ]
+        if not unvisited:
+            stack.pop()
+            continue
+        next_row, next_col = rng.choice(unvisited)
+        maze[(row + next_row) // 2][(col + next_col) // 2] = '.'
+        maze[next_row][next_col] = '.'
+        stack.append((next_row, next_col))
+
+    inner_walls = [
+        (row, col)
+        for row in range(1, height - 1)
+        for col in range(1, width - 1)
+        if maze[row][col] == '#' and (row % 2) != (col % 2)
+    ]
+    for row, col in rng.sample(inner_walls, int(len(inner_walls) * loop_fraction)):
+        maze[row][col] = '.'
+    return maze
+
+
+def days_with_generators() -> list[int]:
+    return [
+        day_number
+        for day_number in available_days()
+        if (day_directory(day_number) / 'generate.py').exists()
+    ]
+
+
+def generated_input_path(day_number: int, scale: int, seed: int) -> pathlib.Path:
+    return day_directory(day_number) / f'{GENERATED_FILE_PREFIX}{day_number}_x{scale}_seed{seed}.txt'
+
+
+def write_generated_input(day_number: int, scale: int, seed: int = 0) -> pathlib.Path:
+    import_day_module(day_number, 'generate')
+    generator, _ = _GENERATORS[day_number]
+    path = generated_input_path(day_number, scale, seed)
+    with open(path, 'w') as f:
+        generator(f, scale, random.Random(seed))
+    return path
+
+
+@dataclasses.dataclass(frozen=True)
+class ScalingPoint:
+    day_number: int
+    scale: int
+    solver: int
+    # Either 'load' or 'part N'
+    stage: str
+    wall_seconds: float
+
+
+def measure_scaling(day_number: int, scales: Sequence[int], seed: int = 0) -> list[ScalingPoint]:
+    """
+    Generates an input at each scale and times every stage of the day's solvers against it.
+    """
+    import_day_module(day_number, 'generate')
+    _, solver_indices = _GENERATORS[day_number]
+
+    points = []
+    for scale in scales:
+        path = write_generated_input(day_number, scale, seed)
+        solvers = list(enumerate(get_day_solvers(day_number)))
+        if solver_indices is not None:
+            solvers = [solvers[i] for i in solver_indices]
+
+        for solver_idx, solver in solvers:
+            measurements: list[Measurement] = []
+            solver.instrumentation = Instrumentation(measurements.append, trace_memory=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                solver.solve_file(str(path))
+            points.extend(
+                ScalingPoint(day_number, scale, solver_idx, m.stage, m.wall_seconds)
+                for m in measurements
+            )
+    return points
+
+
+def format_scaling_report(points: Sequence[ScalingPoint]) -> str:
+    """
+    Lists each stage's time at every scale. Between consecutive scales, the growth exponent k estimates the
+    stage's complexity as O(n^k) in the size of its input.
+    """
+    if not points:
+        return ''
+    lines = [f'Day {points[0].day_number}:']
+    by_stage = itertools.groupby(
+        sorted(points, key=lambda p: (p.solver, p.stage, p.scale)),
+        key=lambda p: (p.solver, p.stage),
+    )
+    for (solver_idx, stage), stage_points in by_stage:
+        parts = []
+        prev: Optional[ScalingPoint] = None
+        for point in stage_points:
+            part = f'x{point.scale} {point.wall_seconds:0.4f}s'
+            if prev is not None and prev.wall_seconds > 0 and point.wall_seconds > 0:
+                exponent = math.log(point.wall_seconds / prev.wall_seconds) / math.log(point.scale / prev.scale)
+                part += f' (k={exponent:0.2f})'
+            parts.append(part)
+            prev = point
+        lines.append(f'\tsolver {solver_idx} {stage}: {", ".join(parts)}')
+    return '\n'.join(lines)
+
+
+def _parse_scales(spec: str) -> list[int]:
+    return sorted({int(scale) for scale in spec.split(',') if scale.strip()})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate synthetic puzzle inputs and measure how solvers scale.')
+    parser.add_argument('--days', type=parse_day_range, default=None, help='e.g. "16,18,20"')
+    parser.add_argument('--scales', type=_parse_scales, default=[1, 10, 100], help='e.g. "1,10,100"')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--write-only', action='store_true', help='only write the inputs, without solving them')
+    args = parser.parse_args()
+
+    for day_number in args.days or days_with_generators():
+        if args.write_only:
+            for scale in args.scales:
+                print(write_generated_input(day_number, scale, args.seed))
+            continue
+        print(format_scaling_report(measure_scaling(day_number, args.scales, args.seed)))
+
+
+if __name__ == '__main__':
+    # Day generator modules register against `common.generate`, which is a different module object from
+    # `__main__` when run with `python -m`, so run that module's registry rather than this one's.
+    from common.generate import main as registered_main
+    registered_main()
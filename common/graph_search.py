@@ -1,10 +1,13 @@
 import abc
 import collections
 import dataclasses
+import enum
+import functools
 import heapq
 import itertools
+import math
 import typing
-from typing import TypeVar, Generic, Iterable, Optional, Hashable, Sequence, cast, Callable
+from typing import TypeVar, Generic, Iterable, Iterator, Optional, Hashable, Sequence, Callable, ClassVar, overload, Any
 
 NodeType = TypeVar('NodeType', bound=Hashable)
 
@@ -13,42 +16,282 @@ class NoSuchPathException(Exception):
     pass
 
 
-@dataclasses.dataclass(order=True)
-class _QueueNode(Generic[NodeType]):
-    priority: float
-    insertion_count: int
-    cost_to_travel_to_node: float = dataclasses.field(compare=False)
-    node_data: NodeType = dataclasses.field(compare=False)
-    prev_node: Optional[NodeType] = dataclasses.field(compare=False)
+# The entry id of the start of every path
+_NO_PREV_ENTRY = -1
+
+
+class EdgeWeights(enum.Enum):
+    """
+    What a searcher's edge weights can be, which decides the queue its searches use.
+    """
+    # Any non-negative weights: a binary heap
+    ANY = enum.auto()
+    # Every edge weighs 1: a FIFO queue (plain BFS)
+    UNIT = enum.auto()
+    # Every edge weighs 0 or 1: a deque, with zero weight edges pushed to the front (0-1 BFS)
+    ZERO_ONE = enum.auto()
+    # Non-negative integers, with few distinct path costs: a bucket queue with a FIFO bucket per priority
+    INTEGER = enum.auto()
+
+
+# Search queues hold tuples whose first element is the priority, and pop the lowest priority first. Ties pop in
+# insertion order, except that the 0-1 BFS queue pops zero weight edges' entries most recent first.
+
+class _HeapQueue(list):
+    def __init__(self) -> None:
+        super().__init__()
+        # Partials of the C heapq functions avoid a Python level call per push and pop
+        self.push = functools.partial(heapq.heappush, self)
+        self.pop_min = functools.partial(heapq.heappop, self)
+
+
+class _FifoQueue(collections.deque):
+    def __init__(self) -> None:
+        super().__init__()
+        self.push = self.append
+        self.pop_min = self.popleft
+
+
+class _ZeroOneQueue(collections.deque):
+    def __init__(self) -> None:
+        super().__init__()
+        self._front_priority = None
+
+    def push(self, entry: tuple) -> None:
+        if entry[0] == self._front_priority:
+            self.appendleft(entry)
+        else:
+            self.append(entry)
+
+    def pop_min(self) -> tuple:
+        entry = self.popleft()
+        self._front_priority = entry[0]
+        return entry
+
+
+class _BucketQueue:
+    def __init__(self) -> None:
+        self._buckets: dict[int, collections.deque] = {}
+        # A heap of the priorities which have buckets, which only changes when a bucket is created or emptied
+        self._priorities: list[int] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, entry: tuple) -> None:
+        bucket = self._buckets.get(entry[0])
+        if bucket is None:
+            bucket = self._buckets[entry[0]] = collections.deque()
+            heapq.heappush(self._priorities, entry[0])
+        bucket.append(entry)
+        self._size += 1
+
+    def pop_min(self) -> tuple:
+        priority = self._priorities[0]
+        bucket = self._buckets[priority]
+        entry = bucket.popleft()
+        if not bucket:
+            del self._buckets[priority]
+            heapq.heappop(self._priorities)
+        self._size -= 1
+        return entry
+
+
+class LazyPath(Sequence[NodeType]):
+    """
+    A path found by a search, as the id of its last queue entry plus the search's flat predecessor lists. The
+    nodes are only walked and reversed into a list the first time the path is read.
+    """
+
+    def __init__(self, last_entry: int, entry_nodes: Sequence[NodeType], entry_prevs: Sequence[int]) -> None:
+        self._last_entry = last_entry
+        self._entry_nodes = entry_nodes
+        self._entry_prevs = entry_prevs
+        self._nodes: Optional[list[NodeType]] = None
+
+    def _materialise(self) -> list[NodeType]:
+        if self._nodes is None:
+            nodes = []
+            entry = self._last_entry
+            while entry != _NO_PREV_ENTRY:
+                nodes.append(self._entry_nodes[entry])
+                entry = self._entry_prevs[entry]
+            nodes.reverse()
+            self._nodes = nodes
+        return self._nodes
+
+    @overload
+    def __getitem__(self, index: int) -> NodeType:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[NodeType]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> NodeType | list[NodeType]:
+        return self._materialise()[index]
+
+    def __len__(self) -> int:
+        return len(self._materialise())
+
+    def __iter__(self) -> Iterator[NodeType]:
+        return iter(self._materialise())
+
+    def __repr__(self) -> str:
+        return f'LazyPath({self._materialise()!r})'
+
+
+@dataclasses.dataclass(frozen=True)
+class BestPathDag(Generic[NodeType]):
+    """
+    Every best path from a start node to the cheapest terminal nodes, as the DAG of each node's optimal
+    predecessors. Questions about all the best paths are answered in time linear in the DAG's size, however many
+    paths there are.
+    """
+    start: NodeType
+    # The terminal nodes reached at the best cost
+    ends: Sequence[NodeType]
+    cost: float
+    # Every node reached by the search (not only those on best paths) -> its predecessors on its cheapest paths
+    predecessors: dict[NodeType, Sequence[NodeType]]
+
+    def nodes_on_best_paths(self) -> set[NodeType]:
+        nodes = set(self.ends)
+        to_visit = list(self.ends)
+        while to_visit:
+            for prev in self.predecessors[to_visit.pop()]:
+                if prev not in nodes:
+                    nodes.add(prev)
+                    to_visit.append(prev)
+        return nodes
+
+    def count_paths(self) -> int:
+        num_paths = {self.start: 1}
+        for node in self._predecessors_first():
+            if node != self.start:
+                num_paths[node] = sum(num_paths[prev] for prev in self.predecessors[node])
+        return sum(num_paths[end] for end in self.ends)
+
+    def _predecessors_first(self) -> list[NodeType]:
+        # Iterative post-order DFS back from the ends, so deep DAGs don't hit the recursion limit
+        order = []
+        visited = set()
+        for end in self.ends:
+            if end in visited:
+                continue
+            visited.add(end)
+            stack = [(end, iter(self.predecessors[end]))]
+            while stack:
+                node, prevs = stack[-1]
+                prev = next((p for p in prevs if p not in visited), None)
+                if prev is None:
+                    order.append(node)
+                    stack.pop()
+                else:
+                    visited.add(prev)
+                    stack.append((prev, iter(self.predecessors[prev])))
+        return order
 
 
 class _SearchResult(typing.NamedTuple, Generic[NodeType]):
-    found_paths: Sequence[Iterable[NodeType]]
+    found_paths: Sequence[LazyPath[NodeType]]
     best_cost: float
     cost_to_travel_to_node: dict[NodeType, float]
 
 
 class GraphSearcher(abc.ABC, Generic[NodeType]):
-    def __init__(self):
-        self._insertion_counter = itertools.count()
+    # Subclasses whose edge weights are restricted should declare it, for a faster queue than a binary heap. With a
+    # heuristic, UNIT and ZERO_ONE searches use a bucket queue, and the heuristic must also return integers.
+    # A declaration only covers the class' own edge_weight: a subclass overriding edge_weight without declaring its
+    # weights again is treated as ANY.
+    edge_weights: ClassVar[EdgeWeights] = EdgeWeights.ANY
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if 'edge_weight' in vars(cls) and 'edge_weights' not in vars(cls):
+            cls.edge_weights = EdgeWeights.ANY
 
     def get_best_path(
         self,
         start_node: NodeType,
-    ) -> tuple[Iterable[NodeType], float]:
-        paths, score = self._get_best_paths(
+    ) -> tuple[LazyPath[NodeType], float]:
+        paths, score, _ = self._get_best_paths(
             start_node,
             return_at_first_found_terminal_path=True,
-            path_score_pruning_condition=lambda t_score, known_score: t_score > known_score,
+            path_score_pruning_condition=lambda t_score, known_score: t_score >= known_score,
+            expand_nodes_once=True,
         )
         if len(paths) == 0:
             raise NoSuchPathException()
         return paths[0], score
 
+    def get_best_path_bidirectional(
+        self,
+        start_node: NodeType,
+        goal_node: NodeType,
+    ) -> tuple[Sequence[NodeType], float]:
+        """
+        A* outward from both the start and the goal at once, following edges backwards (with `reverse_neighbors`)
+        from the goal, for when the goal is a single known node. Ignores `is_terminal_node`.
+
+        Both sides are guided by the average of `heuristic` (towards the goal) and `reverse_heuristic` (from the
+        start), which stays consistent if both are. The search stops once the best unexpanded nodes on the two
+        sides can't together beat the best meeting point found.
+        """
+        def potential(node: NodeType) -> float:
+            return (self.heuristic(node) - self.reverse_heuristic(node, start_node)) / 2
+
+        # Index 0 is the forward search from the start, 1 the backward search from the goal, which uses the
+        # negated potential
+        costs: tuple[dict[NodeType, float], ...] = ({start_node: 0}, {goal_node: 0})
+        prevs: tuple[dict[NodeType, NodeType], ...] = ({}, {})
+        expanded_nodes: tuple[set[NodeType], ...] = (set(), set())
+        search_queues = ([(potential(start_node), 0, start_node)], [(-potential(goal_node), 0, goal_node)])
+        entry_ids = itertools.count(1)
+        best_path_score, meeting_node = (0, start_node) if start_node == goal_node else (math.inf, None)
+
+        while search_queues[0] and search_queues[1] and (
+            search_queues[0][0][0] + search_queues[1][0][0] < best_path_score
+        ):
+            # Grow whichever side has the smaller frontier
+            side = 0 if len(search_queues[0]) <= len(search_queues[1]) else 1
+            _, _, node = heapq.heappop(search_queues[side])
+            # Any other entries for an expanded node are stale, since the cheapest one pops first
+            if node in expanded_nodes[side]:
+                continue
+            expanded_nodes[side].add(node)
+
+            side_costs, other_side_costs = costs[side], costs[1 - side]
+            cost = side_costs[node]
+            neighbors = self.get_neighbors(node) if side == 0 else self.reverse_neighbors(node)
+            for neighbor in neighbors:
+                edge_weight = self.edge_weight(node, neighbor) if side == 0 else self.edge_weight(neighbor, node)
+                tentative_score = cost + edge_weight
+                if tentative_score >= side_costs.get(neighbor, math.inf):
+                    continue
+                side_costs[neighbor] = tentative_score
+                prevs[side][neighbor] = node
+                priority = tentative_score + (potential(neighbor) if side == 0 else -potential(neighbor))
+                heapq.heappush(search_queues[side], (priority, next(entry_ids), neighbor))
+                if tentative_score + other_side_costs.get(neighbor, math.inf) < best_path_score:
+                    best_path_score = tentative_score + other_side_costs[neighbor]
+                    meeting_node = neighbor
+
+        if meeting_node is None:
+            raise NoSuchPathException()
+        path = [meeting_node]
+        while path[-1] != start_node:
+            path.append(prevs[0][path[-1]])
+        path.reverse()
+        while path[-1] != goal_node:
+            path.append(prevs[1][path[-1]])
+        return path, best_path_score
+
     def get_all_best_paths(
         self,
         start_node: NodeType,
-    ) -> tuple[Sequence[Iterable[NodeType]], float]:
+    ) -> tuple[Sequence[LazyPath[NodeType]], float]:
         paths, cost, _ = self._get_best_paths(
             start_node,
             return_at_first_found_terminal_path=False,
@@ -56,6 +299,52 @@ class GraphSearcher(abc.ABC, Generic[NodeType]):
         )
         return paths, cost
 
+    def get_best_path_dag(
+        self,
+        start_node: NodeType,
+    ) -> BestPathDag[NodeType]:
+        """
+        Finds the DAG of all best paths to terminal nodes, expanding each node once. Unlike `get_all_best_paths`,
+        this never enumerates paths. Needs a consistent heuristic (one which never overestimates an edge's weight).
+        """
+        known_scores_by_node: dict[NodeType, float] = {start_node: 0}
+        predecessors: dict[NodeType, list[NodeType]] = {start_node: []}
+        expanded_nodes: set[NodeType] = set()
+        ends = []
+        best_path_score = math.inf
+        entry_ids = itertools.count(1)
+        search_queue = self._make_search_queue()
+        search_queue.push((self.heuristic(start_node), 0, start_node))
+        while search_queue:
+            priority, _, node = search_queue.pop_min()
+            if priority > best_path_score:
+                break
+            if node in expanded_nodes:
+                continue
+            expanded_nodes.add(node)
+
+            cost = known_scores_by_node[node]
+            if self.is_terminal_node(node):
+                best_path_score = cost
+                ends.append(node)
+                continue
+
+            for neighbor in self.get_neighbors(node):
+                tentative_score = cost + self.edge_weight(node, neighbor)
+                known_score = known_scores_by_node.get(neighbor, math.inf)
+                if tentative_score < known_score:
+                    known_scores_by_node[neighbor] = tentative_score
+                    predecessors[neighbor] = [node]
+                    search_queue.push((tentative_score + self.heuristic(neighbor), next(entry_ids), neighbor))
+                elif tentative_score == known_score:
+                    # Another best way in. The neighbour may already have been expanded, which is fine since only
+                    # its predecessors change, not its cost.
+                    predecessors[neighbor].append(node)
+
+        if not ends:
+            raise NoSuchPathException()
+        return BestPathDag(start_node, ends, best_path_score, predecessors)
+
     def get_all_travel_costs_starting_at_node(
         self,
         start_node: NodeType,
@@ -65,6 +354,7 @@ class GraphSearcher(abc.ABC, Generic[NodeType]):
             return_at_first_found_terminal_path=False,
             path_score_pruning_condition=lambda t_score, known_score: t_score >= known_score,
             is_terminal_node=lambda t_node: False,
+            expand_nodes_once=True,
         )
         return costs
 
@@ -74,64 +364,79 @@ class GraphSearcher(abc.ABC, Generic[NodeType]):
         return_at_first_found_terminal_path: bool,
         path_score_pruning_condition: Callable[[float, float], bool],
         is_terminal_node: Optional[Callable[[NodeType], bool]] = None,
+        expand_nodes_once: bool = False,
     ) -> _SearchResult[NodeType]:
-        search_queue = [self._format_q_node(start_node)]
-        known_scores_by_node = collections.defaultdict(lambda: float('inf'))
+        """
+        Nodes are never expanded from a queue entry which a cheaper path to the same node has superseded. With
+        `expand_nodes_once`, each node is also expanded at most once, which is only correct if the heuristic is
+        consistent (never overestimates an edge's weight). Otherwise every equally cheap path to a node is expanded,
+        so that all best paths can be found.
+        """
+        # Heap entries are (priority, entry id) tuples, so comparisons stay in C and ties go to the earliest entry.
+        # Everything else about an entry lives in these lists, indexed by its id.
+        entry_costs: list[float] = [0]
+        entry_nodes: list[NodeType] = [start_node]
+        entry_prevs: list[int] = [_NO_PREV_ENTRY]
+        search_queue = self._make_search_queue()
+        search_queue.push((self.heuristic(start_node), 0))
+        known_scores_by_node = collections.defaultdict(lambda: math.inf)
         known_scores_by_node[start_node] = 0
-        best_path_score = float('inf')
+        expanded_nodes: set[NodeType] = set()
+        best_path_score = math.inf
         is_terminal_node = is_terminal_node or self.is_terminal_node
 
         all_best_paths = collections.deque()
         while search_queue:
-            current = heapq.heappop(search_queue)
-            if is_terminal_node(current.node_data):
-                best_path_score = min(current.cost_to_travel_to_node, best_path_score)
-                all_best_paths.append(self._format_path(current))
+            _, entry = search_queue.pop_min()
+            node, cost = entry_nodes[entry], entry_costs[entry]
+            # Entries are left in the queue when a cheaper path to their node is found, rather than removed
+            if cost > known_scores_by_node[node]:
+                continue
+            if expand_nodes_once:
+                if node in expanded_nodes:
+                    continue
+                expanded_nodes.add(node)
+
+            if is_terminal_node(node):
+                best_path_score = min(cost, best_path_score)
+                all_best_paths.append(LazyPath(entry, entry_nodes, entry_prevs))
                 if return_at_first_found_terminal_path:
                     return _SearchResult(all_best_paths, best_path_score, known_scores_by_node)
 
-            for neighbor in self.get_neighbors(current.node_data):
-                tentative_score = (
-                    known_scores_by_node[current.node_data]
-                    + self.edge_weight(current.node_data, neighbor)
-                )
-                if path_score_pruning_condition(tentative_score,
-                                                known_scores_by_node[neighbor]) or tentative_score > best_path_score:
+            for neighbor in self.get_neighbors(node):
+                tentative_score = cost + self.edge_weight(node, neighbor)
+                if (
+                    path_score_pruning_condition(tentative_score, known_scores_by_node.get(neighbor, math.inf))
+                    or tentative_score > best_path_score
+                ):
                     continue
                 known_scores_by_node[neighbor] = tentative_score
-                heapq.heappush(search_queue, self._format_q_node(
-                    node=neighbor,
-                    cost_to_travel_to_node=tentative_score,
-                    prev_node=cast(Optional[_QueueNode[[NodeType]]], current)
-                ))
+                search_queue.push((tentative_score + self.heuristic(neighbor), len(entry_nodes)))
+                entry_costs.append(tentative_score)
+                entry_nodes.append(neighbor)
+                entry_prevs.append(entry)
 
         return _SearchResult(all_best_paths, best_path_score, known_scores_by_node)
 
-    def _format_path(self, node: _QueueNode[NodeType]) -> Iterable[NodeType]:
-        path = collections.deque()
-        while node is not None:
-            path.appendleft(node.node_data)
-            node = node.prev_node
-        return path
-
-    def _format_q_node(
-        self,
-        node: NodeType,
-        cost_to_travel_to_node: float = 0.0,
-        prev_node: Optional[_QueueNode[[NodeType]]] = None,
-    ) -> _QueueNode[NodeType]:
-        return _QueueNode(
-            priority=cost_to_travel_to_node + self.heuristic(node),
-            insertion_count=next(self._insertion_counter),
-            cost_to_travel_to_node=cost_to_travel_to_node,
-            node_data=node,
-            prev_node=prev_node,
-        )
+    def _make_search_queue(self) -> _HeapQueue | _FifoQueue | _ZeroOneQueue | _BucketQueue:
+        if self.edge_weights is EdgeWeights.ANY:
+            return _HeapQueue()
+        # Without a heuristic, priorities are path costs, which BFS and 0-1 BFS already pop in order
+        if type(self).heuristic is GraphSearcher.heuristic:
+            if self.edge_weights is EdgeWeights.UNIT:
+                return _FifoQueue()
+            if self.edge_weights is EdgeWeights.ZERO_ONE:
+                return _ZeroOneQueue()
+        return _BucketQueue()
 
     @abc.abstractmethod
     def get_neighbors(self, node: NodeType) -> Iterable[NodeType]:
         ...
 
+    # Override this for directed graphs, to give the nodes with an edge to `node`. Used by bidirectional searches.
+    def reverse_neighbors(self, node: NodeType) -> Iterable[NodeType]:
+        return self.get_neighbors(node)
+
     @abc.abstractmethod
     def edge_weight(self, orig: NodeType, neighbor: NodeType) -> float:
         return 1
@@ -143,3 +448,8 @@ class GraphSearcher(abc.ABC, Generic[NodeType]):
     # Override this to use A* instead of dijkstra's
     def heuristic(self, orig: NodeType) -> float:
         return 0.0
+
+    # Override this to guide the backward half of bidirectional searches: like `heuristic`, but a lower bound on
+    # the cost from `start_node` to `node`
+    def reverse_heuristic(self, node: NodeType, start_node: NodeType) -> float:
+        return 0.0
@@ -0,0 +1,109 @@
+import collections
+import unittest
+from typing import Iterable
+
+from common.graph_search import EdgeWeights, GraphSearcher, NoSuchPathException
+
+PointType = tuple[int, int]
+
+
+class _OpenGridSearcher(GraphSearcher[PointType]):
+    """
+    An open size x size grid with unit edges, where there are exponentially many equally short paths between
+    opposite corners.
+    """
+
+    def __init__(self, size: int) -> None:
+        super().__init__()
+        self._size = size
+        self.expansions = collections.Counter()
+
+    def get_neighbors(self, node: PointType) -> Iterable[PointType]:
+        self.expansions[node] += 1
+        row, col = node
+        return [
+            (row + d_row, col + d_col)
+            for d_row, d_col in ((0, 1), (1, 0), (0, -1), (-1, 0))
+            if 0 <= row + d_row < self._size and 0 <= col + d_col < self._size
+        ]
+
+    def edge_weight(self, orig: PointType, neighbor: PointType) -> float:
+        return 1
+
+    def is_terminal_node(self, node: PointType) -> bool:
+        return node == (self._size - 1, self._size - 1)
+
+
+class _SlopedGridSearcher(_OpenGridSearcher):
+    # Moving down or right is free, moving up or left costs 1
+    def edge_weight(self, orig: PointType, neighbor: PointType) -> float:
+        return int(neighbor < orig)
+
+    def is_terminal_node(self, node: PointType) -> bool:
+        return node == (0, 0)
+
+
+class TestGraphSearcher(unittest.TestCase):
+    def test_best_path_expands_each_node_once(self):
+        searcher = _OpenGridSearcher(30)
+        path, cost = searcher.get_best_path((0, 0))
+        self.assertEqual(cost, 58)
+        self.assertEqual(len(path), 59)
+        self.assertEqual((path[0], path[-1]), ((0, 0), (29, 29)))
+        self.assertEqual(max(searcher.expansions.values()), 1)
+
+    def test_travel_costs_expand_each_node_once(self):
+        searcher = _OpenGridSearcher(10)
+        costs = searcher.get_all_travel_costs_starting_at_node((0, 0))
+        self.assertEqual(costs[9, 9], 18)
+        self.assertEqual(len(searcher.expansions), 100)
+        self.assertEqual(max(searcher.expansions.values()), 1)
+
+    def test_all_best_paths(self):
+        paths, cost = _OpenGridSearcher(3).get_all_best_paths((0, 0))
+        self.assertEqual(cost, 4)
+        self.assertEqual(len(paths), 6)
+
+    def test_best_path_dag(self):
+        searcher = _OpenGridSearcher(12)
+        dag = searcher.get_best_path_dag((0, 0))
+        self.assertEqual((dag.cost, dag.ends), (22, [(11, 11)]))
+        # Choosing which 11 of the 22 steps go down
+        self.assertEqual(dag.count_paths(), 705432)
+        self.assertEqual(len(dag.nodes_on_best_paths()), 144)
+        self.assertEqual(max(searcher.expansions.values()), 1)
+
+    def test_queue_engines_agree(self):
+        expected = _SlopedGridSearcher(8).get_all_travel_costs_starting_at_node((5, 3))
+        self.assertEqual(expected[0, 0], 8)
+        for edge_weights in (EdgeWeights.ZERO_ONE, EdgeWeights.INTEGER):
+            with self.subTest(edge_weights=edge_weights):
+                searcher = _SlopedGridSearcher(8)
+                searcher.edge_weights = edge_weights
+                self.assertEqual(searcher.get_all_travel_costs_starting_at_node((5, 3)), expected)
+                self.assertEqual(searcher.get_best_path_dag((5, 3)).count_paths(), 56)
+
+    def test_overriding_edge_weight_undeclares_weights(self):
+        class UnitSearcher(_OpenGridSearcher):
+            edge_weights = EdgeWeights.UNIT
+
+        class DownhillSearcher(UnitSearcher):
+            def edge_weight(self, orig: PointType, neighbor: PointType) -> float:
+                return 6 if neighbor[0] > orig[0] else 1
+
+        self.assertIs(UnitSearcher.edge_weights, EdgeWeights.UNIT)
+        self.assertIs(DownhillSearcher.edge_weights, EdgeWeights.ANY)
+        self.assertEqual(DownhillSearcher(3).get_best_path((0, 0))[1], 14)
+
+    def test_bidirectional(self):
+        searcher = _SlopedGridSearcher(8)
+        path, cost = searcher.get_best_path_bidirectional((5, 3), (0, 0))
+        self.assertEqual(cost, 8)
+        self.assertEqual((path[0], path[-1], len(path)), ((5, 3), (0, 0), 9))
+        self.assertEqual(searcher.get_best_path_bidirectional((2, 2), (2, 2)), ([(2, 2)], 0))
+
+    def test_no_path(self):
+        with self.assertRaises(NoSuchPathException):
+            _OpenGridSearcher(3).get_best_path((5, 5))
+        with self.assertRaises(NoSuchPathException):
+            _OpenGridSearcher(3).get_best_path_bidirectional((0, 0), (5, 5))
@@ -1,9 +1,14 @@
 import collections
+import contextlib
+import dataclasses
 import enum
+import functools
 import itertools
-from typing import Generic, TypeVar, Sequence, TextIO, cast, Optional, Iterable, Callable, Self, Hashable, Protocol
+import operator
+import weakref
+from typing import Generic, TypeVar, Sequence, TextIO, Optional, Iterable, Iterator, Callable, Self, Hashable, Protocol
 
-from common.graph_search import GraphSearcher
+from common.graph_search import EdgeWeights, GraphSearcher
 
 T = TypeVar('T')
 
@@ -16,8 +21,15 @@ class InvalidMazeException(Exception):
     pass
 
 
+class NoTransactionException(Exception):
+    pass
+
+
 PositionType = tuple[int, int]
 
+# Called with the point, its old value and its new value before each write to a grid
+WriteObserver = Callable[[PositionType, T, T], None]
+
 
 class Direction(enum.Enum):
     # Sensitive to order -- must
@@ -37,10 +49,18 @@ POSITIVE_DIRS = [d for d in Direction if all(val >= 0 for val in d.value)]
 
 
 def add_point(left: PositionType, right: PositionType) -> PositionType:
-    return cast(PositionType, tuple(l + r for l, r in zip(left, right)))
+    return left[0] + right[0], left[1] + right[1]
 
 
 class Grid(Generic[T]):
+    # Writes are only tracked while a transaction is open, a snapshot is alive or something observes writes. Every
+    # __setitem__ must call `_before_write` when this is set, before changing the cell.
+    _tracks_writes: bool = False
+    _journals: Sequence[list[tuple[PositionType, T]]] = ()
+    _snapshots: Iterable['GridSnapshot[T]'] = ()
+    _write_observers: Sequence[WriteObserver] = ()
+    _value_index: Optional['ValueIndex[T]'] = None
+
     def __init__(self, grid: Sequence[Sequence[T]]) -> None:
         self._grid = [
             list(row)
@@ -71,9 +91,149 @@ class Grid(Generic[T]):
         if not self.is_valid_point(point):
             raise InvalidPointException(f'Invalid point {point}')
 
+        if self._tracks_writes:
+            self._before_write(point, value)
         row, col = point
         self._grid[row][col] = value
 
+    def begin(self) -> None:
+        """
+        Starts a transaction, which may be nested inside another. Until the matching commit or rollback, every write
+        is journaled along with the value it replaced, so both cost time proportional to the cells written.
+        """
+        if not self._journals:
+            self._journals = []
+        self._journals.append([])
+        self._tracks_writes = True
+
+    def commit(self) -> None:
+        journal = self._pop_journal()
+        if self._journals:
+            # The enclosing transaction may still be rolled back, which should undo these writes too
+            self._journals[-1].extend(journal)
+
+    def rollback(self) -> None:
+        journal = self._pop_journal()
+        # Undoing writes mustn't journal them into an enclosing transaction, which never saw the writes being undone
+        enclosing_journals, self._journals = self._journals, ()
+        self._update_write_tracking()
+        try:
+            for point, value in reversed(journal):
+                self[point] = value
+        finally:
+            self._journals = enclosing_journals
+            self._update_write_tracking()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Self]:
+        """
+        Commits the writes made in the block, or rolls them back if it raises.
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    @contextlib.contextmanager
+    def what_if(self) -> Iterator[Self]:
+        """
+        Always rolls back the writes made in the block, for trying out changes.
+        """
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.rollback()
+
+    def snapshot(self) -> 'GridSnapshot[T]':
+        """
+        A read-only view of the grid as it is now. Taking one is O(1); afterwards each write to the grid first copies
+        the value it replaces into every live snapshot.
+        """
+        snapshot = GridSnapshot(self)
+        if not self._snapshots:
+            self._snapshots = weakref.WeakSet()
+        self._snapshots.add(snapshot)
+        self._tracks_writes = True
+        return snapshot
+
+    def add_write_observer(self, observer: WriteObserver) -> None:
+        """
+        Calls `observer(point, old_value, new_value)` before each write made through this grid.
+        """
+        self._write_observers = [*self._write_observers, observer]
+        self._tracks_writes = True
+
+    def remove_write_observer(self, observer: WriteObserver) -> None:
+        self._write_observers = [o for o in self._write_observers if o is not observer]
+        self._update_write_tracking()
+
+    def index_values(self) -> 'ValueIndex[T]':
+        """
+        Builds (once) an index of where each value is, kept up to date as the grid is written to, which `find_all`,
+        `count` and `first` then use instead of scanning the grid.
+        """
+        if self._value_index is None:
+            self._value_index = ValueIndex(self)
+            self.add_write_observer(self._value_index.update)
+        return self._value_index
+
+    def ray_cast_index(
+        self,
+        predicate: Callable[[T], bool],
+        directions: Sequence['Direction'] = tuple(ALL_DIRECTIONS),
+    ) -> 'RayCastIndex[T]':
+        """
+        Builds an index of which cells match `predicate`, kept up to date as the grid is written to, for finding the
+        next matching cell in any of the given directions from any point.
+        """
+        index = RayCastIndex(self, predicate, directions)
+        self.add_write_observer(index.update)
+        return index
+
+    def find_all(self, value: T) -> list[PositionType]:
+        """
+        Every point holding `value`, in row-major order.
+        """
+        if self._value_index is not None:
+            return self._value_index.find_all(value)
+        return [point for point, cell in self.iter_points_and_values() if cell == value]
+
+    def count(self, value: T) -> int:
+        if self._value_index is not None:
+            return self._value_index.count(value)
+        return sum(1 for _, cell in self.iter_points_and_values() if cell == value)
+
+    def first(self, value: T) -> Optional[PositionType]:
+        """
+        The first point holding `value` in row-major order, if any.
+        """
+        if self._value_index is not None:
+            return self._value_index.first(value)
+        return next((point for point, cell in self.iter_points_and_values() if cell == value), None)
+
+    def _before_write(self, point: PositionType, value: T) -> None:
+        old_value = self[point]
+        if self._journals:
+            self._journals[-1].append((point, old_value))
+        for snapshot in self._snapshots:
+            snapshot.preserve(point, old_value)
+        for observer in self._write_observers:
+            observer(point, old_value, value)
+
+    def _pop_journal(self) -> list[tuple[PositionType, T]]:
+        if not self._journals:
+            raise NoTransactionException('No transaction in progress')
+        journal = self._journals.pop()
+        self._update_write_tracking()
+        return journal
+
+    def _update_write_tracking(self) -> None:
+        self._tracks_writes = bool(self._journals or self._snapshots or self._write_observers)
+
     def iter_points(
         self,
         row_order_asc: bool = True,
@@ -122,12 +282,589 @@ class Grid(Generic[T]):
     def dimensions(self) -> tuple[int, int]:
         return self.height, self.width
 
+    def flat_index(self) -> 'FlatGridIndex':
+        return FlatGridIndex.for_dimensions(self.height, self.width)
+
+    def flat_values(self) -> list[T]:
+        """
+        Every value in the grid, in flat index order.
+        """
+        return [value for _, value in self.iter_points_and_values()]
+
     def format_str(self, format_val: Callable[[T], str] = str) -> str:
         return '\n'.join(
             ''.join(format_val(self[row_idx, col_idx]) for col_idx in range(self.width))
             for row_idx in range(self.height)
         )
 
+    def line(
+        self,
+        start: PositionType,
+        direction: 'Direction | PositionType',
+        length: Optional[int] = None,
+    ) -> 'LineView[T]':
+        """
+        A view of the cells from `start` stepping in `direction`, by default until it leaves the grid.
+        """
+        step = direction.value if isinstance(direction, Direction) else direction
+        if length is None:
+            if step == (0, 0):
+                raise ValueError('A line with no step needs an explicit length')
+            length = min(
+                _steps_within(position, axis_step, size)
+                for position, axis_step, size in zip(start, step, self.dimensions())
+                if axis_step != 0
+            )
+        return LineView(self, start, step, length)
+
+    def row(self, row: int) -> 'LineView[T]':
+        return self.line((row, 0), Direction.EAST, self.width)
+
+    def col(self, col: int) -> 'LineView[T]':
+        return self.line((0, col), Direction.SOUTH, self.height)
+
+    def diagonal(self, offset: int) -> 'LineView[T]':
+        """
+        The cells with `col - row == offset`, from top left to bottom right.
+        """
+        return self.line((max(0, -offset), max(0, offset)), Direction.SOUTH_EAST)
+
+    def anti_diagonal(self, offset: int) -> 'LineView[T]':
+        """
+        The cells with `row + col == offset`, from top right to bottom left.
+        """
+        return self.line((max(0, offset - self.width + 1), min(offset, self.width - 1)), Direction.SOUTH_WEST)
+
+    def rows(self) -> list['LineView[T]']:
+        return [self.row(row) for row in range(self.height)]
+
+    def cols(self) -> list['LineView[T]']:
+        return [self.col(col) for col in range(self.width)]
+
+    def diagonals(self) -> list['LineView[T]']:
+        return [self.diagonal(offset) for offset in range(1 - self.height, self.width)]
+
+    def anti_diagonals(self) -> list['LineView[T]']:
+        return [self.anti_diagonal(offset) for offset in range(self.height + self.width - 1)]
+
+    def sub_grid(self, top_left: PositionType, height: int, width: int) -> 'GridView[T]':
+        top, left = top_left
+        if height < 0 or width < 0 or not (0 <= top <= top + height <= self.height
+                                           and 0 <= left <= left + width <= self.width):
+            raise InvalidPointException(f'Invalid sub-grid {height}x{width} at {top_left}')
+        return GridView(self, top_left, (1, 0), (0, 1), height, width)
+
+    def transpose(self) -> 'GridView[T]':
+        return GridView(self, (0, 0), (0, 1), (1, 0), self.width, self.height)
+
+    def rotate(self, turns: int = 1) -> 'GridView[T]':
+        """
+        Rotates clockwise by `turns` quarter turns.
+        """
+        view = GridView(self, (0, 0), (1, 0), (0, 1), self.height, self.width)
+        for _ in range(turns % 4):
+            view = GridView(view, (view.height - 1, 0), (0, 1), (-1, 0), view.width, view.height)
+        return view
+
+    def flip_vertical(self) -> 'GridView[T]':
+        return GridView(self, (self.height - 1, 0), (-1, 0), (0, 1), self.height, self.width)
+
+    def flip_horizontal(self) -> 'GridView[T]':
+        return GridView(self, (0, self.width - 1), (1, 0), (0, -1), self.height, self.width)
+
+    def _line_values(self, start: PositionType, step: PositionType, length: int) -> list[T]:
+        # Subclasses which don't keep their values in `_grid` must override this
+        (row, col), (d_row, d_col) = start, step
+        if d_row == 0 and d_col != 0:
+            stop = col + d_col * length
+            return self._grid[row][col:stop if stop >= 0 else None:d_col]
+        return [self._grid[row + i * d_row][col + i * d_col] for i in range(length)]
+
+    def label_regions(self, same_region: Callable[[T, T], bool] = operator.eq) -> 'LabelledRegions':
+        """
+        Splits the grid into regions of cardinally connected cells, where neighbouring cells are in the same region
+        if `same_region` (which should be an equivalence) holds for their values. Regions are labelled 0, 1, ... in
+        the order their first cell appears in row-major order.
+
+        Uses a union-find over flat indices rather than a flood fill, so it needs no recursion and only a few ints of
+        memory per cell.
+        """
+        values = self.flat_values()
+        height, width = self.height, self.width
+        parents = list(range(len(values)))
+
+        def find(idx: int) -> int:
+            while parents[idx] != idx:
+                parents[idx] = parents[parents[idx]]
+                idx = parents[idx]
+            return idx
+
+        def union(a: int, b: int) -> None:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                # Keep the earliest cell as the root so that labels come out in row-major order
+                parents[max(root_a, root_b)] = min(root_a, root_b)
+
+        for row in range(height):
+            for idx in range(row * width, (row + 1) * width):
+                if idx % width and same_region(values[idx - 1], values[idx]):
+                    union(idx - 1, idx)
+                if row and same_region(values[idx - width], values[idx]):
+                    union(idx - width, idx)
+
+        root_to_label: dict[int, int] = {}
+        labels = [root_to_label.setdefault(find(idx), len(root_to_label)) for idx in range(len(values))]
+
+        areas = [0] * len(root_to_label)
+        perimeters = [0] * len(root_to_label)
+        corners = [0] * len(root_to_label)
+        for row in range(height):
+            for col in range(width):
+                idx = row * width + col
+                label = labels[idx]
+                has_n, has_s = row > 0, row < height - 1
+                has_w, has_e = col > 0, col < width - 1
+                n = has_n and labels[idx - width] == label
+                s = has_s and labels[idx + width] == label
+                w = has_w and labels[idx - 1] == label
+                e = has_e and labels[idx + 1] == label
+                areas[label] += 1
+                perimeters[label] += 4 - (n + s + w + e)
+                # Convex corners have neither neighbour. Concave corners have both but not the diagonal between them.
+                corners[label] += (
+                    (not n and not e) + (not e and not s) + (not s and not w) + (not w and not n)
+                    + (n and e and labels[idx - width + 1] != label)
+                    + (e and s and labels[idx + width + 1] != label)
+                    + (s and w and labels[idx + width - 1] != label)
+                    + (w and n and labels[idx - width - 1] != label)
+                )
+
+        return LabelledRegions(
+            labels=Grid([labels[row * width:(row + 1) * width] for row in range(height)]),
+            areas=areas,
+            perimeters=perimeters,
+            sides=corners,
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class LabelledRegions:
+    # The label of the region each cell belongs to
+    labels: Grid[int]
+    # Per region statistics, indexed by label
+    areas: Sequence[int]
+    perimeters: Sequence[int]
+    # Equal to the number of corners the region has
+    sides: Sequence[int]
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+
+def _steps_within(start: int, step: int, size: int) -> int:
+    # How many positions start, start + step, ... lie within [0, size), for a non-zero step
+    if not 0 <= start < size:
+        return 0
+    if step > 0:
+        return (size - 1 - start) // step + 1
+    return start // -step + 1
+
+
+def _lookup_line_values(grid: Grid[T], start: PositionType, step: PositionType, length: int) -> list[T]:
+    (row, col), (d_row, d_col) = start, step
+    return [grid[row + i * d_row, col + i * d_col] for i in range(length)]
+
+
+class LineView(Sequence[T]):
+    """
+    A read-only view of a straight line of cells in a grid, which can be sliced (giving another view) without
+    copying anything. `to_list` and `to_str` extract the values in one go, which is much faster than indexing
+    the view cell by cell.
+    """
+
+    def __init__(self, grid: Grid[T], start: PositionType, step: PositionType, length: int) -> None:
+        if isinstance(grid, GridView):
+            grid, start, step = grid.source, grid.to_source(start), grid.map_step(step)
+        self._grid = grid
+        self._start = start
+        self._step = step
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int | slice) -> 'T | LineView[T]':
+        if isinstance(index, slice):
+            start, _, stride = index.indices(self._length)
+            return LineView(self._grid, self.point(start), scale_relative_point(self._step, stride),
+                            len(range(*index.indices(self._length))))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f'Index {index} out of range for line of length {self._length}')
+        return self._grid[self.point(index)]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.to_list())
+
+    def point(self, index: int) -> PositionType:
+        """
+        The position in the underlying grid of the value at `index`.
+        """
+        return self._start[0] + index * self._step[0], self._start[1] + index * self._step[1]
+
+    def points(self) -> list[PositionType]:
+        return [self.point(i) for i in range(self._length)]
+
+    def to_list(self) -> list[T]:
+        return self._grid._line_values(self._start, self._step, self._length)
+
+    def to_str(self, format_val: Callable[[T], str] = str) -> str:
+        values = self.to_list()
+        if values and isinstance(values[0], str) and format_val is str:
+            return ''.join(values)
+        return ''.join(map(format_val, values))
+
+
+class GridView(Grid[T]):
+    """
+    A zero-copy view of another grid through an affine map of positions, used for sub-grids, transposes,
+    rotations and flips. Writes go through to the underlying grid. Views of views map straight to the underlying
+    grid rather than stacking lookups.
+    """
+
+    def __init__(
+        self,
+        source: Grid[T],
+        origin: PositionType,
+        row_step: PositionType,
+        col_step: PositionType,
+        height: int,
+        width: int,
+    ) -> None:
+        # Position (row, col) in the view is `origin + row * row_step + col * col_step` in the source
+        if isinstance(source, GridView):
+            origin, row_step, col_step = source.to_source(origin), source.map_step(row_step), source.map_step(col_step)
+            source = source.source
+        self.source = source
+        self._origin = origin
+        self._row_step = row_step
+        self._col_step = col_step
+        self.height = height
+        self.width = width
+
+    def to_source(self, point: PositionType) -> PositionType:
+        row, col = point
+        return (
+            self._origin[0] + row * self._row_step[0] + col * self._col_step[0],
+            self._origin[1] + row * self._row_step[1] + col * self._col_step[1],
+        )
+
+    def map_step(self, step: PositionType) -> PositionType:
+        d_row, d_col = step
+        return (
+            d_row * self._row_step[0] + d_col * self._col_step[0],
+            d_row * self._row_step[1] + d_col * self._col_step[1],
+        )
+
+    def __getitem__(self, point: PositionType) -> T:
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}. Width: {self.width}, Height: {self.height}')
+        return self.source[self.to_source(point)]
+
+    def __setitem__(self, point: PositionType, value: T) -> None:
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}')
+        if self._tracks_writes:
+            self._before_write(point, value)
+        self.source[self.to_source(point)] = value
+
+    def _line_values(self, start: PositionType, step: PositionType, length: int) -> list[T]:
+        return self.source._line_values(self.to_source(start), self.map_step(step), length)
+
+    def format_str(self, format_val: Callable[[T], str] = str) -> str:
+        return '\n'.join(line.to_str(format_val) for line in self.rows())
+
+
+def _check_indexable(grid: Grid) -> None:
+    # Indexes are built by iterating the grid, which skips a TiledGrid's unallocated cells, and never see the cells a
+    # growable grid gains without them being written
+    if isinstance(grid, TiledGrid):
+        raise ValueError('TiledGrids can\'t be indexed, since iterating them skips unallocated cells')
+
+
+def _check_index_column(col: int) -> None:
+    # Columns are bit positions, and a negative shift would raise a bare ValueError mid-update
+    if col < 0:
+        raise InvalidPointException(f'Can\'t index negative column {col}')
+
+
+class ValueIndex(Generic[T]):
+    """
+    Where each (hashable) value is in a grid, as one int bitset per row per value plus a count per value. This is a
+    bit per cell per distinct value, rather than a tuple and set slot per cell, and a write only touches one row.
+    Kept up to date by observing writes to the grid, so writes that bypass `__setitem__` aren't seen. TiledGrids,
+    including growable ones, can't be indexed.
+    """
+
+    def __init__(self, grid: Grid[T]) -> None:
+        _check_indexable(grid)
+        self._height = grid.height
+        self._rows_by_value: dict[T, list[int]] = {}
+        self._counts: collections.Counter[T] = collections.Counter()
+        for (row, col), value in grid.iter_points_and_values():
+            _check_index_column(col)
+            self._rows_for(value)[row] |= 1 << col
+            self._counts[value] += 1
+
+    def update(self, point: PositionType, old_value: T, new_value: T) -> None:
+        if old_value == new_value:
+            return
+        row, col = point
+        _check_index_column(col)
+        if old_value in self._rows_by_value:
+            self._rows_for(old_value)[row] &= ~(1 << col)
+            self._counts[old_value] -= 1
+        self._rows_for(new_value)[row] |= 1 << col
+        self._counts[new_value] += 1
+
+    def count(self, value: T) -> int:
+        return self._counts[value]
+
+    def find_all(self, value: T) -> list[PositionType]:
+        points = []
+        for row, row_bits in enumerate(self._rows_by_value.get(value, ())):
+            while row_bits:
+                lowest_bit = row_bits & -row_bits
+                points.append((row, lowest_bit.bit_length() - 1))
+                row_bits ^= lowest_bit
+        return points
+
+    def first(self, value: T) -> Optional[PositionType]:
+        if not self._counts[value]:
+            return None
+        for row, row_bits in enumerate(self._rows_by_value[value]):
+            if row_bits:
+                return row, (row_bits & -row_bits).bit_length() - 1
+        return None
+
+    def _rows_for(self, value: T) -> list[int]:
+        rows = self._rows_by_value.get(value)
+        if rows is None:
+            rows = self._rows_by_value[value] = [0] * self._height
+        return rows
+
+
+class RayCastIndex(Generic[T]):
+    """
+    Which cells of a fixed size grid match a predicate, as a bytearray per row, column, diagonal and anti-diagonal
+    (only for the axes of the directions asked for). Finding the next match along a line is a single C level
+    find/rfind, and updating a cell sets one byte per axis.
+    """
+
+    def __init__(
+        self,
+        grid: Grid[T],
+        predicate: Callable[[T], bool],
+        directions: Sequence[Direction] = tuple(ALL_DIRECTIONS),
+    ) -> None:
+        _check_indexable(grid)
+        self._height, self._width = grid.dimensions()
+        self._predicate = predicate
+        # Axis (a direction and its opposite share one) -> one line per row, column or diagonal
+        self._lines: dict[Direction, list[bytearray]] = {}
+        for direction in directions:
+            axis = _RAY_AXES[direction]
+            if axis not in self._lines:
+                self._lines[axis] = [bytearray(self._line_length(axis, key)) for key in range(self._num_lines(axis))]
+
+        for point, value in grid.iter_points_and_values():
+            if predicate(value):
+                self._set(point, 1)
+
+    def update(self, point: PositionType, old_value: T, new_value: T) -> None:
+        is_match = self._predicate(new_value)
+        if is_match != self._predicate(old_value):
+            self._set(point, int(is_match))
+
+    def next_match(self, point: PositionType, direction: Direction) -> Optional[PositionType]:
+        """
+        The nearest matching cell strictly beyond `point` in `direction`, if there is one before the grid's edge.
+        """
+        axis = _RAY_AXES[direction]
+        key, position = self._locate(axis, point)
+        line = self._lines[axis][key]
+        if direction is axis:
+            found = line.find(1, position + 1)
+        else:
+            found = line.rfind(1, 0, position)
+        if found == -1:
+            return None
+        steps = found - position if direction is axis else position - found
+        return point[0] + steps * direction.value[0], point[1] + steps * direction.value[1]
+
+    def _set(self, point: PositionType, value: int) -> None:
+        for axis, lines in self._lines.items():
+            key, position = self._locate(axis, point)
+            lines[key][position] = value
+
+    def _locate(self, axis: Direction, point: PositionType) -> tuple[int, int]:
+        # The line through `point` along `axis`, and how far along that line (in the axis' direction) it is
+        row, col = point
+        if axis is Direction.EAST:
+            return row, col
+        if axis is Direction.SOUTH:
+            return col, row
+        if axis is Direction.SOUTH_EAST:
+            return col - row + self._height - 1, row - max(0, row - col)
+        return row + col, row - max(0, row + col - self._width + 1)
+
+    def _num_lines(self, axis: Direction) -> int:
+        if axis is Direction.EAST:
+            return self._height
+        if axis is Direction.SOUTH:
+            return self._width
+        return self._height + self._width - 1
+
+    def _line_length(self, axis: Direction, key: int) -> int:
+        if axis is Direction.EAST:
+            return self._width
+        if axis is Direction.SOUTH:
+            return self._height
+        if axis is Direction.SOUTH_EAST:
+            # Cells with col - row == offset, starting from the top or left edge
+            offset = key - self._height + 1
+            return min(self._height - max(0, -offset), self._width - max(0, offset))
+        # Cells with row + col == key, starting from the top or right edge
+        return min(self._height - 1, key) - max(0, key - self._width + 1) + 1
+
+
+# Each direction's axis, which is the direction in which positions along its lines increase
+_RAY_AXES = {
+    Direction.EAST: Direction.EAST,
+    Direction.WEST: Direction.EAST,
+    Direction.SOUTH: Direction.SOUTH,
+    Direction.NORTH: Direction.SOUTH,
+    Direction.SOUTH_EAST: Direction.SOUTH_EAST,
+    Direction.NORTH_WEST: Direction.SOUTH_EAST,
+    Direction.SOUTH_WEST: Direction.SOUTH_WEST,
+    Direction.NORTH_EAST: Direction.SOUTH_WEST,
+}
+
+
+# Marks cells a snapshot hasn't needed to save, since None may be a real value
+_UNSAVED = object()
+
+
+class GridSnapshot(Grid[T]):
+    """
+    A read-only, copy-on-write view of a grid at the point the snapshot was taken. Only cells written since then
+    are stored; everything else is read from the live grid.
+    """
+
+    def __init__(self, grid: Grid[T]) -> None:
+        self._live_grid = grid
+        self.height, self.width = grid.dimensions()
+        self._saved: dict[PositionType, T] = {}
+
+    def __getitem__(self, point: PositionType) -> T:
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}. Width: {self.width}, Height: {self.height}')
+        value = self._saved.get(point, _UNSAVED)
+        return self._live_grid[point] if value is _UNSAVED else value
+
+    def __setitem__(self, point: PositionType, value: T) -> None:
+        raise TypeError('Grid snapshots are read-only')
+
+    def preserve(self, point: PositionType, old_value: T) -> None:
+        # Only the first write since the snapshot holds the value it should see
+        self._saved.setdefault(point, old_value)
+
+    def release(self) -> None:
+        """
+        Stops tracking writes for this snapshot, which also happens once it is garbage collected.
+        """
+        self._live_grid._snapshots.discard(self)
+        self._live_grid._update_write_tracking()
+
+    def _line_values(self, start: PositionType, step: PositionType, length: int) -> list[T]:
+        return _lookup_line_values(self, start, step, length)
+
+
+class FlatGridIndex:
+    """
+    Addresses the cells of a height x width grid by a single int, `row * width + col`, rather than by a tuple.
+    Stepping in a direction is adding that direction's offset, and a per-direction border mask says whether the
+    neighbour in that direction exists, so neighbour lookups need no tuple building or bounds arithmetic.
+
+    Use to_index and to_point to convert at the boundary of code which has been moved over to flat indices.
+    """
+
+    def __init__(self, height: int, width: int) -> None:
+        self.height = height
+        self.width = width
+        self.size = height * width
+        self._offsets = {d: d.value[0] * width + d.value[1] for d in Direction}
+        self._border_masks = {d: self._build_border_mask(d) for d in Direction}
+        self._neighbor_tables: dict[tuple[Direction, ...], list[tuple[int, ...]]] = {}
+
+    @classmethod
+    @functools.lru_cache(maxsize=16)
+    def for_dimensions(cls, height: int, width: int) -> 'FlatGridIndex':
+        """
+        Shares one index, and so one set of tables, between every grid with the same dimensions. Only the most
+        recently used dimensions are kept, since the tables hold a tuple per cell.
+        """
+        return cls(height, width)
+
+    def to_index(self, point: PositionType) -> int:
+        row, col = point
+        return row * self.width + col
+
+    def to_point(self, index: int) -> PositionType:
+        return divmod(index, self.width)
+
+    def is_valid_index(self, index: int) -> bool:
+        return 0 <= index < self.size
+
+    def offset(self, direction: Direction) -> int:
+        return self._offsets[direction]
+
+    def has_neighbor(self, index: int, direction: Direction) -> bool:
+        return bool(self._border_masks[direction][index])
+
+    def neighbor(self, index: int, direction: Direction) -> Optional[int]:
+        if not self._border_masks[direction][index]:
+            return None
+        return index + self._offsets[direction]
+
+    def neighbors(self, index: int, directions: Sequence[Direction] = tuple(CARDINAL_DIRS)) -> tuple[int, ...]:
+        return self.neighbor_table(directions)[index]
+
+    def neighbor_table(self, directions: Sequence[Direction] = tuple(CARDINAL_DIRS)) -> Sequence[tuple[int, ...]]:
+        """
+        For every index, the indices of its in-bounds neighbours in the given directions. Built on first use.
+        """
+        directions = tuple(directions)
+        if directions not in self._neighbor_tables:
+            masks_and_offsets = [(self._border_masks[d], self._offsets[d]) for d in directions]
+            self._neighbor_tables[directions] = [
+                tuple(index + offset for mask, offset in masks_and_offsets if mask[index])
+                for index in range(self.size)
+            ]
+        return self._neighbor_tables[directions]
+
+    def _build_border_mask(self, direction: Direction) -> bytearray:
+        d_row, d_col = direction.value
+        mask = bytearray(self.size)
+        first_col, last_col = max(0, -d_col), min(self.width, self.width - d_col)
+        if first_col >= last_col:
+            return mask
+        for row in range(max(0, -d_row), min(self.height, self.height - d_row)):
+            start = row * self.width
+            mask[start + first_col:start + last_col] = b'\x01' * (last_col - first_col)
+        return mask
+
 
 class SparseGrid(Grid[T]):
     def __init__(
@@ -149,8 +886,236 @@ class SparseGrid(Grid[T]):
     def __setitem__(self, point: PositionType, value: Optional[T]) -> None:
         if not self.is_valid_point(point):
             raise InvalidPointException(f'Invalid point {point}')
+        if self._tracks_writes:
+            self._before_write(point, value)
         self._sparse_grid[point] = value
 
+    def _line_values(self, start: PositionType, step: PositionType, length: int) -> list[T]:
+        return _lookup_line_values(self, start, step, length)
+
+
+class TiledGrid(Grid[T]):
+    """
+    A sparse grid stored as square dense tiles (flat lists), allocated the first time a non-default value is written
+    inside them. Memory scales with the occupied area rather than the grid's bounds. Iterating the grid only visits
+    the cells of allocated tiles (every other cell holds the default value), and `iter_populated` only their
+    non-default cells, so methods built on iteration such as `find_all` and `count` never see unallocated cells.
+
+    A growable grid starts with the given dimensions and grows to cover any point written to it. Its top left stays
+    at (0, 0), so it only grows down and to the right; negative points are invalid as in any other grid.
+    """
+
+    def __init__(
+        self,
+        dimensions: tuple[int, int] = (0, 0),
+        default_value: T = None,
+        values: Optional[dict[PositionType, T]] = None,
+        tile_size: int = 64,
+        growable: bool = False,
+    ) -> None:
+        if tile_size <= 0 or tile_size & (tile_size - 1):
+            raise ValueError(f'Tile size must be a power of two, got {tile_size}')
+        self.height, self.width = dimensions
+        self.growable = growable
+        self._default_value = default_value
+        self._tile_size = tile_size
+        self._tile_shift = tile_size.bit_length() - 1
+        self._tiles: dict[PositionType, list[T]] = {}
+        for point, value in (values or {}).items():
+            self[point] = value
+
+    def __getitem__(self, point: PositionType) -> T:
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}. Width: {self.width}, Height: {self.height}')
+        row, col = point
+        tile = self._tiles.get((row >> self._tile_shift, col >> self._tile_shift))
+        if tile is None:
+            return self._default_value
+        mask = self._tile_size - 1
+        return tile[((row & mask) << self._tile_shift) + (col & mask)]
+
+    def __setitem__(self, point: PositionType, value: T) -> None:
+        row, col = point
+        if self.growable and row >= 0 and col >= 0:
+            self.height = max(self.height, row + 1)
+            self.width = max(self.width, col + 1)
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}')
+        if self._tracks_writes:
+            self._before_write(point, value)
+
+        tile_key = row >> self._tile_shift, col >> self._tile_shift
+        tile = self._tiles.get(tile_key)
+        if tile is None:
+            if value == self._default_value:
+                return
+            tile = self._tiles[tile_key] = [self._default_value] * (self._tile_size * self._tile_size)
+        mask = self._tile_size - 1
+        tile[((row & mask) << self._tile_shift) + (col & mask)] = value
+
+    @property
+    def num_tiles(self) -> int:
+        return len(self._tiles)
+
+    def iter_points(
+        self,
+        row_order_asc: bool = True,
+        col_order_asc: bool = True,
+    ) -> Iterable[PositionType]:
+        return (point for point, _ in self.iter_points_and_values(row_order_asc, col_order_asc))
+
+    def iter_points_and_values(
+        self,
+        row_order_asc: bool = True,
+        col_order_asc: bool = True,
+    ) -> Iterable[tuple[PositionType, T]]:
+        """
+        Every point in an allocated tile and its value, in the same row and column order as any other grid.
+        """
+        tile_cols_by_row: dict[int, list[int]] = collections.defaultdict(list)
+        for tile_row, tile_col in self._tiles:
+            tile_cols_by_row[tile_row].append(tile_col)
+
+        for tile_row in sorted(tile_cols_by_row, reverse=not row_order_asc):
+            tile_cols = sorted(tile_cols_by_row[tile_row], reverse=not col_order_asc)
+            top = tile_row << self._tile_shift
+            rows = range(top, min(top + self._tile_size, self.height))
+            for row in rows if row_order_asc else reversed(rows):
+                row_offset = (row - top) << self._tile_shift
+                for tile_col in tile_cols:
+                    tile = self._tiles[tile_row, tile_col]
+                    left = tile_col << self._tile_shift
+                    cols = range(left, min(left + self._tile_size, self.width))
+                    for col in cols if col_order_asc else reversed(cols):
+                        yield (row, col), tile[row_offset + col - left]
+
+    def iter_populated(self) -> Iterable[tuple[PositionType, T]]:
+        """
+        Every point with a non-default value and its value, tile by tile.
+        """
+        for tile_row, tile_col in sorted(self._tiles):
+            tile = self._tiles[tile_row, tile_col]
+            top, left = tile_row << self._tile_shift, tile_col << self._tile_shift
+            for idx, value in enumerate(tile):
+                if value != self._default_value:
+                    yield (top + (idx >> self._tile_shift), left + (idx & (self._tile_size - 1))), value
+
+    def copy(self) -> 'TiledGrid[T]':
+        grid = TiledGrid(self.dimensions(), self._default_value, tile_size=self._tile_size, growable=self.growable)
+        grid._tiles = {key: list(tile) for key, tile in self._tiles.items()}
+        return grid
+
+    def _line_values(self, start: PositionType, step: PositionType, length: int) -> list[T]:
+        return _lookup_line_values(self, start, step, length)
+
+
+class BitGrid(Grid[bool]):
+    """
+    A boolean grid stored as one Python int bitset per row (bit `col` set if the cell is set), plus one per column
+    so that scans along either axis are single bit operations. Uses a bit or two per cell rather than a reference.
+    """
+
+    def __init__(self, grid: Sequence[Sequence[bool]]) -> None:
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height else 0
+        self._rows = [0] * self.height
+        self._cols = [0] * self.width
+        for row, row_values in enumerate(grid):
+            assert len(row_values) == self.width
+            for col, value in enumerate(row_values):
+                if value:
+                    self._set(row, col)
+
+    @classmethod
+    def from_points(cls, dimensions: tuple[int, int], points: Iterable[PositionType]) -> 'BitGrid':
+        height, width = dimensions
+        grid = cls([])
+        grid.height, grid.width = height, width
+        grid._rows, grid._cols = [0] * height, [0] * width
+        for point in points:
+            grid[point] = True
+        return grid
+
+    def __getitem__(self, point: PositionType) -> bool:
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}. Width: {self.width}, Height: {self.height}')
+        row, col = point
+        return bool(self._rows[row] >> col & 1)
+
+    def __setitem__(self, point: PositionType, value: bool) -> None:
+        if not self.is_valid_point(point):
+            raise InvalidPointException(f'Invalid point {point}')
+        if self._tracks_writes:
+            self._before_write(point, value)
+        row, col = point
+        if value:
+            self._set(row, col)
+        else:
+            self._rows[row] &= ~(1 << col)
+            self._cols[col] &= ~(1 << row)
+
+    def _line_values(self, start: PositionType, step: PositionType, length: int) -> list[bool]:
+        return _lookup_line_values(self, start, step, length)
+
+    def _set(self, row: int, col: int) -> None:
+        self._rows[row] |= 1 << col
+        self._cols[col] |= 1 << row
+
+    def next_set_in_row(self, row: int, col: int, reverse: bool = False) -> Optional[int]:
+        """
+        The column of the nearest set cell in `row` after `col` (or before it, if reversed), excluding `col` itself.
+        """
+        return _next_set_bit(self._rows[row], col, reverse)
+
+    def next_set_in_col(self, col: int, row: int, reverse: bool = False) -> Optional[int]:
+        """
+        The row of the nearest set cell in `col` after `row` (or before it, if reversed), excluding `row` itself.
+        """
+        return _next_set_bit(self._cols[col], row, reverse)
+
+    def count(self, value: bool = True) -> int:
+        num_set = sum(row_bits.bit_count() for row_bits in self._rows)
+        return num_set if value else self.height * self.width - num_set
+
+    def iter_set_points(self) -> Iterable[PositionType]:
+        for row, row_bits in enumerate(self._rows):
+            while row_bits:
+                lowest_bit = row_bits & -row_bits
+                yield row, lowest_bit.bit_length() - 1
+                row_bits ^= lowest_bit
+
+    def copy(self) -> 'BitGrid':
+        grid = BitGrid([])
+        grid.height, grid.width = self.height, self.width
+        grid._rows, grid._cols = list(self._rows), list(self._cols)
+        return grid
+
+    def union(self, other: 'BitGrid') -> 'BitGrid':
+        return self._combine(other, lambda a, b: a | b)
+
+    def intersection(self, other: 'BitGrid') -> 'BitGrid':
+        return self._combine(other, lambda a, b: a & b)
+
+    __or__ = union
+    __and__ = intersection
+
+    def _combine(self, other: 'BitGrid', op: Callable[[int, int], int]) -> 'BitGrid':
+        if self.dimensions() != other.dimensions():
+            raise ValueError(f'Mismatched dimensions {self.dimensions()} and {other.dimensions()}')
+        grid = BitGrid([])
+        grid.height, grid.width = self.height, self.width
+        grid._rows = [op(a, b) for a, b in zip(self._rows, other._rows)]
+        grid._cols = [op(a, b) for a, b in zip(self._cols, other._cols)]
+        return grid
+
+
+def _next_set_bit(bits: int, position: int, reverse: bool) -> Optional[int]:
+    if reverse:
+        bits &= (1 << position) - 1
+        return bits.bit_length() - 1 if bits else None
+    bits >>= position + 1
+    return position + (bits & -bits).bit_length() if bits else None
+
 
 class MazeCellProtocol(Protocol):
     def is_terminal(self) -> bool:
@@ -177,24 +1142,25 @@ class MazeCell(enum.Enum):
 
 
 class MazeGrid(Grid[CellType], GraphSearcher[PositionType]):
+    edge_weights = EdgeWeights.UNIT
+
     def __init__(
         self,
         grid_data: Sequence[Sequence[T]],
     ) -> None:
         super().__init__(grid_data)
         super(Grid, self).__init__()
-        self._grid_cell_type_to_positions = collections.defaultdict(set)
-        for location, cell in self.iter_points_and_values():
-            self._grid_cell_type_to_positions[cell].add(location)
 
+    # The value index is only built once a location is first asked for, so mazes that never ask don't pay for
+    # keeping it up to date on every write
     def get_locations_by_cell_value(self, cell_type: CellType) -> set[PositionType]:
-        return self._grid_cell_type_to_positions[cell_type]
+        return set(self.index_values().find_all(cell_type))
 
     def get_location_by_cell_type(self, cell_type: CellType) -> PositionType:
-        locations = self._grid_cell_type_to_positions[cell_type]
-        if len(locations) != 1:
+        index = self.index_values()
+        if index.count(cell_type) != 1:
             raise InvalidMazeException(f'Invalid cell type {cell_type}')
-        return next(iter(locations))
+        return index.first(cell_type)
 
     @classmethod
     def parse_grid_from_file(
@@ -223,28 +1189,50 @@ class MazeGrid(Grid[CellType], GraphSearcher[PositionType]):
         return self[node].is_terminal()
 
 
-def load_char_grid(file: TextIO) -> Grid[str]:
-    return Grid([l.strip() for l in file.readlines() if l])
+def load_char_grid(file: TextIO, as_array: bool = False) -> Grid[str]:
+    """
+    With `as_array`, returns a NumPy backed ArrayGrid instead. NumPy is only needed if `as_array` is set.
+    """
+    rows = [l.strip() for l in file.readlines() if l.strip()]
+    if as_array:
+        from common.array_grid import ArrayGrid
+        return ArrayGrid(rows)
+    return Grid(rows)
 
 
-def load_digit_grid(file: TextIO) -> Grid[int]:
-    return Grid([
+def load_digit_grid(file: TextIO, as_array: bool = False) -> Grid[int]:
+    """
+    With `as_array`, returns a NumPy backed ArrayGrid instead. NumPy is only needed if `as_array` is set.
+    """
+    rows = [
         list(map(int, line.strip()))
         for line in file.readlines()
         if line.strip()
-    ])
+    ]
+    if as_array:
+        from common.array_grid import ArrayGrid
+        return ArrayGrid(rows, dtype=int)
+    return Grid(rows)
 
 
-def scale_relative_point(point: (int, int), scale: int) -> (int, int):
+# These are on the hot path of most grid searches, so 2-D points skip generic tuple building. Points of any other
+# dimension are combined coordinate by coordinate.
+def scale_relative_point(point: tuple[int, ...], scale: int) -> tuple[int, ...]:
+    if len(point) == 2:
+        return point[0] * scale, point[1] * scale
     return tuple(scale * cord for cord in point)
 
 
-def add_relative_point(point: tuple[int, int], other_point: tuple[int, int]) -> tuple[int, int]:
-    return cast(tuple[int, int], tuple(x + y for x, y in zip(point, other_point)))
+def add_relative_point(point: tuple[int, ...], other_point: tuple[int, ...]) -> tuple[int, ...]:
+    if len(point) == 2 == len(other_point):
+        return point[0] + other_point[0], point[1] + other_point[1]
+    return tuple(x + y for x, y in zip(point, other_point))
 
 
-def subtract_relative_point(point: tuple[int, int], other_point: tuple[int, int]):
-    return cast(tuple[int, int], tuple(x - y for x, y in zip(point, other_point)))
+def subtract_relative_point(point: tuple[int, ...], other_point: tuple[int, ...]) -> tuple[int, ...]:
+    if len(point) == 2 == len(other_point):
+        return point[0] - other_point[0], point[1] - other_point[1]
+    return tuple(x - y for x, y in zip(point, other_point))
 
 
 def rotate_90(d: Direction, turns: int = 1) -> 'Direction':
@@ -255,4 +1243,4 @@ def rotate_90(d: Direction, turns: int = 1) -> 'Direction':
 
 
 def manhattan_distance(a: PositionType, b: PositionType) -> int:
-    return sum(abs(a_i - b_i) for a_i, b_i in zip(a, b))
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -0,0 +1,173 @@
+import io
+import unittest
+
+from common.grid import (
+    BitGrid, Direction, InvalidPointException, MazeCell, MazeGrid, NoTransactionException, TiledGrid,
+    add_relative_point, load_char_grid, load_digit_grid, scale_relative_point, subtract_relative_point,
+)
+
+LARGER_EXAMPLE = """RRRRIICCFF
+RRRRIICCCF
+VVRRRCCFFF
+VVRCCCJFFF
+VVVVCJJCFE
+VVIVCCJJEE
+VVIIICJJEE
+MIIIIIJJEE
+MIIISIJEEE
+MMMISSJEEE
+"""
+
+
+class TestLabelRegions(unittest.TestCase):
+    def test_statistics(self):
+        regions = load_char_grid(io.StringIO('AAAA\nBBCD\nBBCC\nEEEC\n')).label_regions()
+        self.assertEqual(regions.labels.format_str(), '0000\n1123\n1122\n4442')
+        self.assertEqual(list(regions.areas), [4, 4, 4, 1, 3])
+        self.assertEqual(list(regions.perimeters), [10, 8, 10, 4, 8])
+        self.assertEqual(list(regions.sides), [4, 4, 8, 4, 4])
+
+    def test_enclosed_regions(self):
+        regions = load_char_grid(io.StringIO(LARGER_EXAMPLE)).label_regions()
+        self.assertEqual(len(regions), 11)
+        self.assertEqual(sum(a * p for a, p in zip(regions.areas, regions.perimeters)), 1930)
+        self.assertEqual(sum(a * s for a, s in zip(regions.areas, regions.sides)), 1206)
+
+    def test_custom_equivalence(self):
+        regions = load_digit_grid(io.StringIO('135\n246\n')).label_regions(lambda a, b: a % 2 == b % 2)
+        self.assertEqual(regions.labels.format_str(), '000\n111')
+
+
+class TestGridViews(unittest.TestCase):
+    def setUp(self) -> None:
+        self.grid = load_char_grid(io.StringIO('abc\ndef\n'))
+
+    def test_lines(self):
+        self.assertEqual([line.to_str() for line in self.grid.cols()], ['ad', 'be', 'cf'])
+        self.assertEqual([line.to_str() for line in self.grid.diagonals()], ['d', 'ae', 'bf', 'c'])
+        self.assertEqual([line.to_str() for line in self.grid.anti_diagonals()], ['a', 'bd', 'ce', 'f'])
+        self.assertEqual(self.grid.line((1, 2), Direction.WEST).to_str(), 'fed')
+        row = self.grid.row(0)
+        self.assertEqual(row[::-1].to_str(), 'cba')
+        self.assertEqual(row[1:][1], 'c')
+        self.assertEqual(row[1:].points(), [(0, 1), (0, 2)])
+
+    def test_transforms_write_through(self):
+        self.assertEqual(self.grid.transpose().format_str(), 'ad\nbe\ncf')
+        self.assertEqual(self.grid.rotate().format_str(), 'da\neb\nfc')
+        self.assertEqual(self.grid.rotate(2).format_str(), self.grid.flip_vertical().flip_horizontal().format_str())
+        sub_grid = self.grid.rotate().sub_grid((1, 0), 2, 2)
+        self.assertEqual(sub_grid.format_str(), 'eb\nfc')
+        self.assertEqual(sub_grid.col(1).to_str(), 'bc')
+        sub_grid[0, 0] = 'X'
+        self.assertEqual(self.grid[1, 1], 'X')
+
+
+class TestTransactions(unittest.TestCase):
+    def test_nested_rollback(self):
+        grid = load_char_grid(io.StringIO('ab\ncd\n'))
+        grid.begin()
+        grid[0, 0] = 'X'
+        with grid.transaction():
+            grid[0, 0] = 'Y'
+            grid[1, 1] = 'Z'
+        with grid.what_if():
+            grid[0, 1] = 'W'
+        self.assertEqual(grid.format_str(), 'Yb\ncZ')
+        grid.rollback()
+        self.assertEqual(grid.format_str(), 'ab\ncd')
+        with self.assertRaises(NoTransactionException):
+            grid.rollback()
+
+    def test_snapshot(self):
+        grid = BitGrid.from_points((2, 2), [(0, 0)])
+        snapshot = grid.snapshot()
+        grid[0, 0] = False
+        grid[1, 1] = True
+        grid[1, 1] = False
+        grid[0, 1] = True
+        self.assertEqual(snapshot.format_str(lambda v: '#' if v else '.'), '#.\n..')
+        self.assertEqual(list(grid.iter_set_points()), [(0, 1)])
+        snapshot.release()
+        self.assertFalse(grid._tracks_writes)
+
+
+class TestTiledGrid(unittest.TestCase):
+    def test_allocates_tiles_on_demand(self):
+        grid = TiledGrid((100, 100), default_value='.', values={(3, 4): '#'}, tile_size=16)
+        grid[99, 0] = '#'
+        grid[50, 50] = '.'
+        self.assertEqual(grid.num_tiles, 2)
+        self.assertEqual(list(grid.iter_populated()), [((3, 4), '#'), ((99, 0), '#')])
+        self.assertEqual(grid.col(0).to_str().count('#'), 1)
+        with self.assertRaises(InvalidPointException):
+            grid[100, 0] = '#'
+
+    def test_growable(self):
+        grid = TiledGrid(default_value=0, tile_size=4, growable=True)
+        grid[2, 9] = 1
+        self.assertEqual(grid.dimensions(), (3, 10))
+        self.assertEqual(grid.format_str(), '0000000000\n0000000000\n0000000001')
+
+    def test_iterates_allocated_tiles(self):
+        grid = TiledGrid((10, 10), default_value=0, values={(1, 9): 1, (0, 2): 2, (9, 0): 3}, tile_size=4)
+        points = list(grid.iter_points())
+        # Three tiles, two of them clipped to 4x2 by the grid's edge
+        self.assertEqual(len(points), 16 + 8 + 8)
+        self.assertEqual(points, sorted(points))
+        self.assertEqual(points[:6], [(0, 0), (0, 1), (0, 2), (0, 3), (0, 8), (0, 9)])
+        self.assertEqual(grid.find_all(1), [(1, 9)])
+        self.assertEqual(next(iter(grid.iter_points_and_values(False, False))), ((9, 3), 0))
+        with self.assertRaises(ValueError):
+            grid.index_values()
+
+
+class TestValueIndex(unittest.TestCase):
+    def test_index_follows_writes(self):
+        grid = load_char_grid(io.StringIO('#.#\n..#\n'))
+        self.assertEqual(grid.find_all('#'), [(0, 0), (0, 2), (1, 2)])
+        grid.index_values()
+        grid[0, 0] = '.'
+        grid[1, 0] = 'S'
+        self.assertEqual(grid.find_all('#'), [(0, 2), (1, 2)])
+        self.assertEqual((grid.count('.'), grid.count('S'), grid.count('x')), (3, 1, 0))
+        self.assertEqual((grid.first('S'), grid.first('x')), ((1, 0), None))
+        with grid.what_if():
+            grid[1, 2] = 'S'
+            self.assertEqual(grid.find_all('S'), [(1, 0), (1, 2)])
+        self.assertEqual(grid.find_all('S'), [(1, 0)])
+        with self.assertRaises(InvalidPointException):
+            grid.index_values().update((0, -1), '.', 'S')
+
+    def test_maze_indexes_on_first_lookup(self):
+        maze = MazeGrid.parse_grid_from_file(io.StringIO('S.#\n..E\n'), MazeCell)
+        maze[0, 1] = MazeCell.WALL
+        self.assertIsNone(maze._value_index)
+        self.assertEqual(maze.get_location_by_cell_type(MazeCell.END), (1, 2))
+        maze[0, 1] = MazeCell.EMPTY
+        self.assertEqual(maze.get_locations_by_cell_value(MazeCell.WALL), {(0, 2)})
+
+
+class TestRayCastIndex(unittest.TestCase):
+    def test_next_match_follows_writes(self):
+        grid = load_char_grid(io.StringIO('#...\n.#..\n...#\n'))
+        walls = grid.ray_cast_index(lambda cell: cell == '#')
+        self.assertEqual(walls.next_match((1, 3), Direction.WEST), (1, 1))
+        self.assertEqual(walls.next_match((2, 2), Direction.NORTH_WEST), (1, 1))
+        self.assertEqual(walls.next_match((1, 1), Direction.NORTH_WEST), (0, 0))
+        self.assertEqual(walls.next_match((0, 3), Direction.SOUTH_WEST), None)
+        self.assertEqual(walls.next_match((0, 0), Direction.EAST), None)
+        grid[0, 2] = '#'
+        grid[1, 1] = '.'
+        self.assertEqual(walls.next_match((0, 0), Direction.EAST), (0, 2))
+        self.assertEqual(walls.next_match((0, 3), Direction.SOUTH_WEST), None)
+        self.assertEqual(walls.next_match((2, 2), Direction.NORTH_WEST), (0, 0))
+        self.assertEqual(walls.next_match((2, 0), Direction.NORTH_EAST), (0, 2))
+
+
+class TestRelativePoints(unittest.TestCase):
+    def test_any_dimension(self):
+        self.assertEqual(add_relative_point((1, 2), (3, -4)), (4, -2))
+        self.assertEqual(add_relative_point((1, 2, 3), (1, 1, 1)), (2, 3, 4))
+        self.assertEqual(subtract_relative_point((1, 2, 3), (1, 1, 1)), (0, 1, 2))
+        self.assertEqual(scale_relative_point((1, -2, 3), 2), (2, -4, 6))
@@ -0,0 +1,267 @@
+import argparse
+import contextlib
+import dataclasses
+import hashlib
+import pathlib
+import sqlite3
+import statistics
+import subprocess
+import time
+from typing import Iterable, Iterator, Optional, Sequence
+
+from common.days import BASE_DIR, parse_day_range
+from common.instrumentation import Measurement
+
+DEFAULT_HISTORY_PATH = BASE_DIR / '.run_history.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    git_revision TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    solver INTEGER NOT NULL,
+    file_name TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    -- Either 'load' or 'part N'
+    stage TEXT NOT NULL,
+    wall_seconds REAL NOT NULL,
+    cpu_seconds REAL NOT NULL,
+    peak_memory_bytes INTEGER,
+    answer TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_stage ON runs (day, solver, stage, input_hash, recorded_at);
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class RunRecord:
+    recorded_at: float
+    git_revision: str
+    day: int
+    solver: int
+    file_name: str
+    input_hash: str
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_memory_bytes: Optional[int]
+    answer: Optional[str]
+
+
+@dataclasses.dataclass(frozen=True)
+class RevisionSummary:
+    git_revision: str
+    median_wall_seconds: float
+    max_peak_memory_bytes: Optional[int]
+    answers: frozenset[Optional[str]]
+    num_runs: int
+
+
+@dataclasses.dataclass(frozen=True)
+class StageTrend:
+    day: int
+    solver: int
+    stage: str
+    file_name: str
+    input_hash: str
+    # Oldest first
+    revisions: Sequence[RevisionSummary]
+
+    def slowdown(self) -> Optional[float]:
+        """
+        How many times slower the latest revision is than the one before it, if there is one.
+        """
+        if len(self.revisions) < 2 or self.revisions[-2].median_wall_seconds <= 0:
+            return None
+        return self.revisions[-1].median_wall_seconds / self.revisions[-2].median_wall_seconds
+
+    def answer_changed(self) -> bool:
+        """
+        Whether the latest revision's answers differ from the revision before it, or disagree among themselves.
+        """
+        if len(self.revisions[-1].answers) > 1:
+            return True
+        return len(self.revisions) >= 2 and self.revisions[-1].answers != self.revisions[-2].answers
+
+    def format_str(self) -> str:
+        header = f'Day {self.day} solver {self.solver} {self.stage} on {self.file_name} ({self.input_hash[:8]}):'
+        lines = [header]
+        for revision in self.revisions:
+            parts = [f'{revision.git_revision}: median {revision.median_wall_seconds:0.4f}s']
+            if revision.max_peak_memory_bytes is not None:
+                parts.append(f'peak {revision.max_peak_memory_bytes / 1024:0.1f}KiB')
+            parts.append(f'answer {", ".join(sorted(map(str, revision.answers)))}')
+            parts.append(f'{revision.num_runs} runs')
+            lines.append('\t' + ', '.join(parts))
+        return '\n'.join(lines)
+
+
+class RunHistory:
+    """
+    Stores per-stage timings and answers from every recorded run in SQLite, so that performance and answers can
+    be compared across git revisions. Safe to write to from several processes at once.
+    """
+
+    def __init__(self, path: pathlib.Path = DEFAULT_HISTORY_PATH) -> None:
+        self._path = pathlib.Path(path)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def record(self, record: RunRecord) -> None:
+        fields = dataclasses.fields(RunRecord)
+        with self._connect() as connection:
+            connection.execute(
+                f'INSERT INTO runs ({", ".join(f.name for f in fields)}) VALUES ({", ".join("?" for _ in fields)})',
+                dataclasses.astuple(record),
+            )
+
+    def records(self, days: Optional[Iterable[int]] = None) -> list[RunRecord]:
+        query = f'SELECT {", ".join(f.name for f in dataclasses.fields(RunRecord))} FROM runs'
+        params: list[int] = []
+        if days is not None:
+            params = list(days)
+            query += f' WHERE day IN ({", ".join("?" for _ in params)})'
+        query += ' ORDER BY recorded_at'
+        with self._connect() as connection:
+            return [RunRecord(*row) for row in connection.execute(query, params)]
+
+    def trends(self, days: Optional[Iterable[int]] = None) -> list[StageTrend]:
+        """
+        Groups recorded runs of the same stage against the same input, summarising each git revision in the order
+        it was first recorded.
+        """
+        runs_by_stage: dict[tuple, dict[str, list[RunRecord]]] = {}
+        for record in self.records(days):
+            key = (record.day, record.solver, record.stage, record.input_hash)
+            runs_by_stage.setdefault(key, {}).setdefault(record.git_revision, []).append(record)
+
+        trends = []
+        for (day, solver, stage, input_hash), runs_by_revision in sorted(runs_by_stage.items()):
+            revisions = [
+                RevisionSummary(
+                    git_revision=revision,
+                    median_wall_seconds=statistics.median(r.wall_seconds for r in runs),
+                    max_peak_memory_bytes=max(
+                        (r.peak_memory_bytes for r in runs if r.peak_memory_bytes is not None),
+                        default=None,
+                    ),
+                    answers=frozenset(r.answer for r in runs),
+                    num_runs=len(runs),
+                )
+                for revision, runs in runs_by_revision.items()
+            ]
+            file_name = next(iter(runs_by_revision.values()))[-1].file_name
+            trends.append(StageTrend(day, solver, stage, file_name, input_hash, revisions))
+        return trends
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Parallel runs each write from their own process, so wait on the lock rather than failing
+        connection = sqlite3.connect(self._path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+class HistorySink:
+    """
+    An instrumentation sink which records each measurement to a RunHistory.
+    """
+
+    def __init__(self, history: RunHistory, day_number: int, solver: int, git_revision: Optional[str] = None) -> None:
+        self._history = history
+        self._day_number = day_number
+        self._solver = solver
+        self._git_revision = git_revision or current_git_revision()
+        self._input_hashes: dict[str, str] = {}
+
+    def __call__(self, measurement: Measurement) -> None:
+        if measurement.file_name not in self._input_hashes:
+            self._input_hashes[measurement.file_name] = hash_file(measurement.file_name)
+        self._history.record(RunRecord(
+            recorded_at=time.time(),
+            git_revision=self._git_revision,
+            day=self._day_number,
+            solver=self._solver,
+            file_name=measurement.file_name,
+            input_hash=self._input_hashes[measurement.file_name],
+            stage=measurement.stage,
+            wall_seconds=measurement.wall_seconds,
+            cpu_seconds=measurement.cpu_seconds,
+            peak_memory_bytes=measurement.peak_memory_bytes,
+            answer=None if measurement.result is None else str(measurement.result),
+        ))
+
+
+def hash_file(file_name: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def current_git_revision() -> str:
+    """
+    The short hash of HEAD, suffixed with '+dirty' if there are uncommitted changes to tracked files.
+    """
+    def git(*args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(['git', *args], cwd=BASE_DIR, capture_output=True, text=True)
+
+    try:
+        head = git('rev-parse', '--short', 'HEAD')
+        if head.returncode != 0:
+            return 'unknown'
+        is_dirty = git('diff-index', '--quiet', 'HEAD', '--').returncode != 0
+    except OSError:
+        return 'unknown'
+    return head.stdout.strip() + ('+dirty' if is_dirty else '')
+
+
+def format_flags(trends: Iterable[StageTrend], threshold: float) -> list[str]:
+    """
+    Flags stages whose latest revision is more than `threshold` (as a fraction) slower than the revision before
+    it, and stages whose answer has differed between runs.
+    """
+    flags = []
+    for trend in trends:
+        name = f'Day {trend.day} solver {trend.solver} {trend.stage} on {trend.file_name}'
+        slowdown = trend.slowdown()
+        if slowdown is not None and slowdown > 1 + threshold:
+            prev, latest = trend.revisions[-2:]
+            flags.append(
+                f'{name}: slowed down {slowdown:0.2f}x from {prev.git_revision} to {latest.git_revision}'
+            )
+        if trend.answer_changed():
+            answers = ', '.join(
+                f'{r.git_revision}: {"/".join(sorted(map(str, r.answers)))}' for r in trend.revisions[-2:]
+            )
+            flags.append(f'{name}: answer changed ({answers})')
+    return flags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Report timing trends and changed answers across recorded runs.')
+    parser.add_argument('--days', type=parse_day_range, default=None, help='e.g. "1-23" or "1,3,5-7"')
+    parser.add_argument('--db', type=pathlib.Path, default=DEFAULT_HISTORY_PATH, help='history database path')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed fractional slowdown between revisions')
+    parser.add_argument('--flags-only', action='store_true', help="only print slowdowns and changed answers")
+    args = parser.parse_args()
+
+    trends = RunHistory(args.db).trends(args.days)
+    if not args.flags_only:
+        for trend in trends:
+            print(trend.format_str())
+
+    flags = format_flags(trends, args.threshold)
+    print('=' * 80)
+    print('\n'.join(flags) if flags else 'No slowdowns or changed answers.')
+    if flags:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
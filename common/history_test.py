@@ -0,0 +1,59 @@
+import pathlib
+import tempfile
+import unittest
+
+from common.history import RunHistory, RunRecord, format_flags
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._history = RunHistory(pathlib.Path(self._tmp_dir.name) / 'history.sqlite')
+        self._clock = 0
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def _record(self, git_revision: str, wall_seconds: float, answer: str) -> None:
+        self._clock += 1
+        self._history.record(RunRecord(
+            recorded_at=self._clock,
+            git_revision=git_revision,
+            day=1,
+            solver=0,
+            file_name='input_1.txt',
+            input_hash='abc',
+            stage='part 1',
+            wall_seconds=wall_seconds,
+            cpu_seconds=wall_seconds,
+            peak_memory_bytes=None,
+            answer=answer,
+        ))
+
+    def test_summarises_revisions_in_order(self):
+        self._record('aaa', 1.0, '11')
+        self._record('aaa', 3.0, '11')
+        self._record('bbb', 1.0, '11')
+        [trend] = self._history.trends()
+        self.assertEqual([r.git_revision for r in trend.revisions], ['aaa', 'bbb'])
+        self.assertEqual(trend.revisions[0].median_wall_seconds, 2.0)
+        self.assertEqual(format_flags([trend], threshold=0.1), [])
+
+    def test_flags_slowdowns_and_changed_answers(self):
+        self._record('aaa', 1.0, '11')
+        self._record('bbb', 2.0, '12')
+        flags = format_flags(self._history.trends(), threshold=0.1)
+        self.assertEqual(len(flags), 2)
+        self.assertIn('slowed down 2.00x from aaa to bbb', flags[0])
+        self.assertIn('answer changed', flags[1])
+
+    def test_only_flags_latest_answer_change(self):
+        self._record('aaa', 1.0, '11')
+        self._record('bbb', 1.0, '12')
+        self._record('ccc', 1.0, '12')
+        self.assertEqual(format_flags(self._history.trends(), threshold=0.1), [])
+        self._record('ddd', 1.0, '11')
+        [flag] = format_flags(self._history.trends(), threshold=0.1)
+        self.assertIn('answer changed (ccc: 12, ddd: 11)', flag)
+        self._record('eee', 1.0, '11')
+        self.assertEqual(format_flags(self._history.trends(), threshold=0.1), [])
@@ -0,0 +1,124 @@
+import dataclasses
+import importlib.machinery
+import importlib.util
+import sys
+import time
+import types
+from typing import Any, Optional, Sequence
+
+
+class _MissingModule(types.ModuleType):
+    """
+    Stands in for an optional dependency which isn't installed, so that only code which actually uses it fails.
+    """
+
+    def __getattr__(self, attr: str) -> Any:
+        raise ModuleNotFoundError(f'No module named {self.__name__!r}', name=self.__name__)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Returns a module which isn't executed until one of its attributes is first accessed. Use this for heavy or
+    optional dependencies which only some parts of a day need, so that runs which don't need them start faster.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        return _MissingModule(name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+@dataclasses.dataclass
+class ImportTime:
+    module_name: str
+    # Time spent executing the module itself, excluding any modules it imported
+    self_seconds: float = 0.0
+    # Time spent executing the module including everything it imported
+    cumulative_seconds: float = 0.0
+
+    def format_str(self) -> str:
+        return (
+            f'{self.cumulative_seconds * 1000:8.2f}ms cumulative '
+            f'{self.self_seconds * 1000:8.2f}ms self  {self.module_name}'
+        )
+
+
+class ImportTimer:
+    """
+    Records how long every module imported while the timer is active takes to execute, like `python -X importtime`
+    but available in-process. Use as a context manager.
+    """
+
+    def __init__(self) -> None:
+        self.import_times: dict[str, ImportTime] = {}
+        self._active: list[ImportTime] = []
+
+    def __enter__(self) -> 'ImportTimer':
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        sys.meta_path.remove(self)
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[types.ModuleType] = None,
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimedLoader(spec.loader, self)
+            return spec
+        return None
+
+    def time_exec(self, loader: Any, module: types.ModuleType) -> None:
+        record = self.import_times.setdefault(module.__name__, ImportTime(module.__name__))
+        self._active.append(record)
+        start = time.perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._active.pop()
+            record.cumulative_seconds += elapsed
+            record.self_seconds += elapsed
+            if self._active:
+                self._active[-1].self_seconds -= elapsed
+
+    def format_report(self, limit: Optional[int] = None) -> str:
+        slowest = sorted(self.import_times.values(), key=lambda t: t.cumulative_seconds, reverse=True)
+        return '\n'.join(t.format_str() for t in slowest[:limit])
+
+
+class _TimedLoader:
+    # Not an importlib.abc.Loader subclass, since importlib.abc is slow to import
+    def __init__(self, loader: Any, timer: ImportTimer) -> None:
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> Optional[types.ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        # Leave the module pointing at its real loader, which things like importlib.resources rely on
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._timer.time_exec(self._loader, module)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._loader, attr)
@@ -0,0 +1,165 @@
+import contextlib
+import dataclasses
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+
+@dataclasses.dataclass(frozen=True)
+class Measurement:
+    file_name: str
+    # 'load', 'stage <name>' for a shared stage, 'part N', or 'all parts' when parts run interleaved
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    # The most memory allocated during the stage on top of what was already allocated when it started
+    peak_memory_bytes: Optional[int] = None
+    # Source lines responsible for the most net allocated memory over the stage, largest first
+    top_allocations: Sequence[str] = ()
+    result: Optional[str | int] = None
+
+    def format_str(self) -> str:
+        parts = [f'{self.file_name} {self.stage}: wall {self.wall_seconds:0.4f}s, cpu {self.cpu_seconds:0.4f}s']
+        if self.peak_memory_bytes is not None:
+            parts.append(f'peak {self.peak_memory_bytes / 1024:0.1f}KiB')
+        lines = [', '.join(parts)]
+        lines.extend(f'\t{allocation}' for allocation in self.top_allocations)
+        return '\n'.join(lines)
+
+
+MeasurementSink = Callable[[Measurement], None]
+
+
+class LogSink:
+    def __init__(self, log_func: Callable[[Any], None] = print) -> None:
+        self._log_func = log_func
+
+    def __call__(self, measurement: Measurement) -> None:
+        self._log_func(measurement.format_str())
+
+
+class JsonLinesSink:
+    def __init__(self, path: str, **extra_fields: Any) -> None:
+        self._path = path
+        self._extra_fields = extra_fields
+
+    def __call__(self, measurement: Measurement) -> None:
+        record = {**self._extra_fields, **dataclasses.asdict(measurement)}
+        with open(self._path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+class FanOutSink:
+    def __init__(self, sinks: Sequence[MeasurementSink]) -> None:
+        self._sinks = sinks
+
+    def __call__(self, measurement: Measurement) -> None:
+        for sink in self._sinks:
+            sink(measurement)
+
+
+class _StageRecorder:
+    """
+    Handed to the code being measured so it can attach the stage's answer to the measurement.
+    """
+
+    def __init__(self) -> None:
+        self.result: Optional[str | int] = None
+
+
+class LapTimer:
+    """
+    Splits wall and CPU time between stages that take turns running, e.g. parsing and each part of a streamed file,
+    charging the time since the previous lap to the stage passed to `lap`.
+    """
+
+    def __init__(self, num_stages: int) -> None:
+        self.wall_seconds = [0.0] * num_stages
+        self.cpu_seconds = [0.0] * num_stages
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+
+    def lap(self, stage: int) -> None:
+        wall, cpu = time.perf_counter(), time.process_time()
+        self.wall_seconds[stage] += wall - self._wall
+        self.cpu_seconds[stage] += cpu - self._cpu
+        self._wall, self._cpu = wall, cpu
+
+
+class Instrumentation:
+    def __init__(
+        self,
+        sink: MeasurementSink,
+        trace_memory: bool = True,
+        num_top_allocations: int = 5,
+    ) -> None:
+        self._sink = sink
+        self._trace_memory = trace_memory
+        self._num_top_allocations = num_top_allocations
+
+    @contextlib.contextmanager
+    def measure(self, file_name: str, stage: str) -> Iterator[_StageRecorder]:
+        recorder = _StageRecorder()
+        started_tracing = False
+        start_snapshot = None
+        start_memory_bytes = 0
+        if self._trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            start_snapshot = _take_snapshot()
+            # The traced peak is process wide, so only what's allocated beyond this point belongs to the stage
+            tracemalloc.reset_peak()
+            start_memory_bytes, _ = tracemalloc.get_traced_memory()
+
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield recorder
+        finally:
+            wall_seconds = time.perf_counter() - start_wall
+            cpu_seconds = time.process_time() - start_cpu
+
+            peak_memory_bytes = None
+            top_allocations: Sequence[str] = ()
+            if start_snapshot is not None:
+                _, peak_memory_bytes = tracemalloc.get_traced_memory()
+                peak_memory_bytes -= start_memory_bytes
+                top_allocations = self._top_allocations(start_snapshot)
+                if started_tracing:
+                    tracemalloc.stop()
+
+            self.record(Measurement(
+                file_name=file_name,
+                stage=stage,
+                wall_seconds=wall_seconds,
+                cpu_seconds=cpu_seconds,
+                peak_memory_bytes=peak_memory_bytes,
+                top_allocations=top_allocations,
+                result=recorder.result,
+            ))
+
+    def record(self, measurement: Measurement) -> None:
+        """
+        Reports a measurement taken some other way, e.g. for stages whose work is interleaved with other stages.
+        """
+        self._sink(measurement)
+
+    def _top_allocations(self, start_snapshot: 'tracemalloc.Snapshot') -> Sequence[str]:
+        stats = _take_snapshot().compare_to(start_snapshot, 'lineno')
+        return [
+            str(stat)
+            for stat in stats
+            if stat.size_diff > 0
+        ][:self._num_top_allocations]
+
+
+def _take_snapshot() -> 'tracemalloc.Snapshot':
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+
+@contextlib.contextmanager
+def null_measure(file_name: str, stage: str) -> Iterator[_StageRecorder]:
+    yield _StageRecorder()
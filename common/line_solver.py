@@ -1,6 +1,16 @@
 import abc
+import contextlib
+import io
+import itertools
+import locale
+import mmap
+import operator
+import os
+import sys
 from numbers import Number
-from typing import Generic, TypeVar, Callable, Type, Any, TextIO, Optional
+from typing import Generic, TypeVar, Callable, Type, Any, TextIO, Optional, Iterable, BinaryIO
+
+from common.instrumentation import Instrumentation, LapTimer, Measurement
 
 FileConfigType = TypeVar("FileConfigType")
 LineDataType = TypeVar('LineDataType')
@@ -25,6 +35,29 @@ class AbstractLineByLineSolution(abc.ABC, Generic[LineDataType, FileConfigType])
         ...
 
 
+
+class MergeableLineByLineSolution(AbstractLineByLineSolution[LineDataType, FileConfigType]):
+    """
+    A solution that can be run over consecutive chunks of a file separately, so LineSolver can shard it across
+    processes. Each chunk's solution sends back only its `partial_state()`, which a solution for the lines before it
+    then `merge`s.
+    """
+
+    @abc.abstractmethod
+    def partial_state(self) -> Any:
+        """
+        The (picklable) state `merge` needs, leaving out anything read-only such as the loaded config.
+        """
+        ...
+
+    @abc.abstractmethod
+    def merge(self, partial_state: Any) -> None:
+        """
+        Folds in the partial state of a solution that processed the lines immediately following this one's.
+        """
+        ...
+
+
 def create_summing_solution(
     line_processor: Callable[[LineDataType], Number]
 ) -> Type[AbstractLineByLineSolution[LineDataType, None]]:
@@ -32,6 +65,7 @@ def create_summing_solution(
         line_processor=line_processor,
         reducer_func=lambda result, line_result: result + line_result,
         initial_result=0,
+        combine_func=operator.add,
     )
 
 
@@ -42,6 +76,7 @@ def create_product_solution(
         line_processor=line_processor,
         reducer_func=lambda result, line_result: result * line_result,
         initial_result=1,
+        combine_func=operator.mul,
     )
 
 
@@ -49,6 +84,7 @@ def create_line_by_line_aggregating_solution(
     line_processor: Callable[[LineDataType], LineOutputType],
     reducer_func: Callable[[ResultType, LineOutputType], ResultType],
     initial_result: ResultType,
+    combine_func: Optional[Callable[[ResultType, ResultType], ResultType]] = None,
 ) -> Type[AbstractLineByLineSolution[LineDataType, None]]:
     class LineByLineSolution(AbstractLineByLineSolution[LineDataType, None]):
         def __init__(self) -> None:
@@ -60,7 +96,17 @@ def create_line_by_line_aggregating_solution(
         def result(self) -> int:
             return self._result
 
-    return LineByLineSolution
+    if combine_func is None:
+        return LineByLineSolution
+
+    class MergeableLineByLineSolutionImpl(LineByLineSolution, MergeableLineByLineSolution[LineDataType, None]):
+        def partial_state(self) -> ResultType:
+            return self._result
+
+        def merge(self, partial_state: ResultType) -> None:
+            self._result = combine_func(self._result, partial_state)
+
+    return MergeableLineByLineSolutionImpl
 
 
 class LineSolver(Generic[LineDataType, FileConfigType]):
@@ -70,13 +116,20 @@ class LineSolver(Generic[LineDataType, FileConfigType]):
         line_parser: Callable[[str], LineDataType],
         solutions: list[Type[AbstractLineByLineSolution[LineDataType, FileConfigType]]],
         file_config_parser: Optional[Callable[[TextIO], FileConfigType]] = None,
-        log_func: Callable[[Any], None] = print
+        log_func: Callable[[Any], None] = print,
+        instrumentation: Optional[Instrumentation] = None,
+        jobs: int = 1,
+        bytes_line_parser: Optional[Callable[[bytes], LineDataType]] = None,
     ) -> None:
         self._file_names = file_names
         self._line_parser = line_parser
         self.solution_classes = solutions
         self._file_config_parser = file_config_parser
         self._log_func = log_func
+        self.instrumentation = instrumentation
+        self.jobs = jobs
+        # When set, lines are read straight out of a memory mapped file and parsed without ever being decoded
+        self._bytes_line_parser = bytes_line_parser
 
     @classmethod
     def construct_for_day(
@@ -85,7 +138,10 @@ class LineSolver(Generic[LineDataType, FileConfigType]):
         line_parser: Callable[[str], LineDataType],
         solutions: list[Type[AbstractLineByLineSolution[LineDataType, FileConfigType]]],
         file_config_parser: Optional[Callable[[TextIO], FileConfigType]] = None,
-        log_func: Callable[[Any], None] = print
+        log_func: Callable[[Any], None] = print,
+        instrumentation: Optional[Instrumentation] = None,
+        jobs: int = 1,
+        bytes_line_parser: Optional[Callable[[bytes], LineDataType]] = None,
     ) -> 'LineSolver[LineDataType, FileConfigType]':
         return cls(
             file_names=[f'sample_{day_number}.txt', f'input_{day_number}.txt'],
@@ -93,33 +149,231 @@ class LineSolver(Generic[LineDataType, FileConfigType]):
             solutions=solutions,
             file_config_parser=file_config_parser,
             log_func=log_func,
+            instrumentation=instrumentation,
+            jobs=jobs,
+            bytes_line_parser=bytes_line_parser,
         )
 
-    def solve_all(self) -> None:
-        for file_name in self._file_names:
-            self.solve_file(file_name)
+    def solve_all(self) -> dict[str, list[str | int]]:
+        return {
+            file_name: self.solve_file(file_name)
+            for file_name in self._file_names
+        }
 
-    def solve_file(self, file_name: str) -> None:
+    def solve_file(self, file_name: str) -> list[str | int]:
         self._log_func(f'Solving {file_name}:')
-        solutions = [s() for s in self.solution_classes]
-
-        with open(file_name, 'r') as f:
-            if self._file_config_parser:
-                file_config = self._file_config_parser(f)
-                for solution in solutions:
-                    solution.load_config(file_config)
-
-            for line in f:
-                self._process_line(line, solutions)
+        if self.instrumentation:
+            if self.jobs > 1:
+                self._log_func(f'\tInstrumented runs are never sharded, so solving in one process')
+            results = self._solve_file_instrumented(file_name, self.instrumentation)
+        elif self._can_shard():
+            results = self._solve_file_sharded(file_name)
+        else:
+            results = self._solve_file_streaming(file_name)
 
-        for i, solution in enumerate(solutions):
-            result = solution.result()
+        for i, result in enumerate(results):
             self._log_func(f'\tSolution for part {i + 1}: {result}')
         self._log_func(f'Done.\n')
+        return results
+
+    def _can_shard(self) -> bool:
+        if self.jobs <= 1 or not all(issubclass(s, MergeableLineByLineSolution) for s in self.solution_classes):
+            return False
+        if not _can_fork():
+            self._log_func(f'\tCan\'t fork worker processes on {sys.platform}, so solving in one process')
+            return False
+        return True
+
+    def _solve_file_streaming(self, file_name: str) -> list[str | int]:
+        if self._bytes_line_parser is None:
+            with open(file_name, 'r') as f:
+                file_config = self._file_config_parser(f) if self._file_config_parser else None
+                solutions = self._create_solutions(file_config)
+                for line in f:
+                    self._process_line(line, solutions)
+            return [solution.result() for solution in solutions]
+
+        file_config, data_start = self._read_file_config(file_name)
+        solutions = self._create_solutions(file_config)
+        for line in _iter_lines_starting_in_range(file_name, (data_start, os.path.getsize(file_name)), data_start):
+            self._process_line_data(self._bytes_line_parser(line), solutions)
+        return [solution.result() for solution in solutions]
+
+    def _solve_file_instrumented(self, file_name: str, instrumentation: Instrumentation) -> list[str | int]:
+        """
+        Streams the file just like the uninstrumented path. Since parsing and the parts take turns line by line, each
+        one's time is summed across lines and memory is only measured over the whole file, as the 'all parts' stage.
+        """
+        with instrumentation.measure(file_name, 'all parts'):
+            # Stage 0 is reading and parsing the file, then one stage per part
+            timer = LapTimer(len(self.solution_classes) + 1)
+            with contextlib.ExitStack() as stack:
+                if self._bytes_line_parser is None:
+                    f = stack.enter_context(open(file_name, 'r'))
+                    file_config = self._file_config_parser(f) if self._file_config_parser else None
+                    raw_lines, parse = f, self._line_parser
+                else:
+                    file_config, data_start = self._read_file_config(file_name)
+                    raw_lines = _iter_lines_starting_in_range(
+                        file_name, (data_start, os.path.getsize(file_name)), data_start
+                    )
+                    parse = self._bytes_line_parser
+                solutions = self._create_solutions(file_config)
+                timer.lap(0)
+
+                for raw_line in raw_lines:
+                    line = parse(raw_line)
+                    timer.lap(0)
+                    for i, solution in enumerate(solutions, 1):
+                        solution.process_line(line)
+                        timer.lap(i)
+
+            results = [solution.result() for solution in solutions]
+            for stage, name in enumerate(['load', *(f'part {i + 1}' for i in range(len(solutions)))]):
+                instrumentation.record(Measurement(
+                    file_name=file_name,
+                    stage=name,
+                    wall_seconds=timer.wall_seconds[stage],
+                    cpu_seconds=timer.cpu_seconds[stage],
+                    result=results[stage - 1] if stage else None,
+                ))
+        return results
+
+    def _solve_file_sharded(self, file_name: str) -> list[str | int]:
+        """
+        Splits the lines after the file config into roughly equal byte ranges, solves each range in its own
+        process and merges the partial states back together in file order.
+
+        Worker processes are forked so that they inherit the parser and solution classes, which are often
+        closures that can't be pickled. Only each solution's `partial_state()` is sent back.
+        """
+        # Imported here since they're slow to import and most runs never shard
+        import concurrent.futures
+        import multiprocessing
+
+        file_config, data_start = self._read_file_config(file_name)
+        data_end = os.path.getsize(file_name)
+
+        boundaries = [
+            data_start + (data_end - data_start) * i // self.jobs
+            for i in range(self.jobs + 1)
+        ]
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.jobs,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_shard_worker,
+            initargs=(self, file_name, data_start, file_config),
+        ) as executor:
+            chunk_states = list(executor.map(_solve_shard, itertools.pairwise(boundaries)))
+
+        solutions = self._create_solutions(file_config)
+        for states in chunk_states:
+            for solution, state in zip(solutions, states):
+                solution.merge(state)
+        return [solution.result() for solution in solutions]
+
+    def _read_file_config(self, file_name: str) -> tuple[Optional[FileConfigType], int]:
+        """
+        Parses the file config, if any, returning it along with the byte offset of the first line after it.
+        """
+        if not self._file_config_parser:
+            return None, 0
+        with open(file_name, 'rb') as f:
+            file_config = self._file_config_parser(_LineByLineTextReader(f))
+            return file_config, f.tell()
+
+    def _create_solutions(
+        self,
+        file_config: Optional[FileConfigType],
+    ) -> list[AbstractLineByLineSolution[LineDataType, FileConfigType]]:
+        solutions = [s() for s in self.solution_classes]
+        if self._file_config_parser:
+            for solution in solutions:
+                solution.load_config(file_config)
+        return solutions
 
     def _process_line(self, line: str,
                       solutions: list[AbstractLineByLineSolution[LineDataType, FileConfigType]]) -> None:
-        line_data = self._line_parser(line)
+        self._process_line_data(self._line_parser(line), solutions)
 
+    @staticmethod
+    def _process_line_data(line_data: LineDataType,
+                           solutions: list[AbstractLineByLineSolution[LineDataType, FileConfigType]]) -> None:
         for i, solution in enumerate(solutions):
             solution.process_line(line_data)
+
+
+class _LineByLineTextReader(io.TextIOBase):
+    """
+    Reads a binary file as text one line at a time, so the binary file's position is always the byte offset just
+    past what's been read. A text file's position is an opaque cookie instead, and it reads ahead in chunks.
+    """
+
+    def __init__(self, binary_file: BinaryIO) -> None:
+        self._file = binary_file
+        self._encoding = locale.getpreferredencoding(False)
+
+    def readable(self) -> bool:
+        return True
+
+    def readline(self, size: Optional[int] = -1) -> str:
+        return self._file.readline(-1 if size is None else size).decode(self._encoding)
+
+    def read(self, size: Optional[int] = -1) -> str:
+        return self._file.read(-1 if size is None else size).decode(self._encoding)
+
+
+def _can_fork() -> bool:
+    import multiprocessing
+
+    # macOS has fork, but forking a process that may have started threads in system frameworks isn't safe there
+    return 'fork' in multiprocessing.get_all_start_methods() and sys.platform != 'darwin'
+
+
+# Set in each forked worker by _init_shard_worker: (solver, file name, data start, file config)
+_shard_context: Optional[tuple[LineSolver, str, int, Any]] = None
+
+
+def _init_shard_worker(solver: LineSolver, file_name: str, data_start: int, file_config: Any) -> None:
+    global _shard_context
+    _shard_context = (solver, file_name, data_start, file_config)
+
+
+def _solve_shard(byte_range: tuple[int, int]) -> list[Any]:
+    solver, file_name, data_start, file_config = _shard_context
+    solutions = solver._create_solutions(file_config)
+    encoding = locale.getpreferredencoding(False)
+    for line in _iter_lines_starting_in_range(file_name, byte_range, data_start):
+        if solver._bytes_line_parser is None:
+            solver._process_line(line.decode(encoding), solutions)
+        else:
+            solver._process_line_data(solver._bytes_line_parser(line), solutions)
+    return [solution.partial_state() for solution in solutions]
+
+
+def _iter_lines_starting_in_range(file_name: str, byte_range: tuple[int, int], data_start: int) -> Iterable[bytes]:
+    """
+    Yields every line (including its newline) which starts within [start, end), so adjacent ranges never split
+    or share a line. Lines are sliced straight out of a memory mapped file, skipping text decoding entirely.
+    """
+    start, end = byte_range
+    if start >= end:
+        return
+
+    with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        find = mm.find
+        if start > data_start:
+            # Skip the rest of any line that began before our range. Searching from one byte back means a line
+            # that starts exactly at `start` isn't skipped.
+            newline = find(b'\n', start - 1, end)
+            if newline == -1:
+                return
+            pos = newline + 1
+        else:
+            pos = start
+
+        while pos < end:
+            newline = find(b'\n', pos)
+            line_end = len(mm) if newline == -1 else newline + 1
+            yield mm[pos:line_end]
+            pos = line_end
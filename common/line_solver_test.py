@@ -0,0 +1,102 @@
+import operator
+import pathlib
+import tempfile
+import unittest
+
+from common.line_solver import (
+    LineSolver, MergeableLineByLineSolution, create_line_by_line_aggregating_solution, create_product_solution,
+    create_summing_solution,
+)
+from day_19.day_19 import OnsenTowelEveryOptionSolver, OnsenTowelSolver, pare_file_config, parse_line
+from day_22.day_22 import MonkeyMarketSolver
+
+
+def _solve_in_chunks(solution_class, lines, chunk_size, config=None):
+    merged = None
+    for start in range(0, len(lines), chunk_size):
+        partial = solution_class()
+        if config is not None:
+            partial.load_config(config)
+        for line in lines[start:start + chunk_size]:
+            partial.process_line(line)
+        if merged is None:
+            merged = partial
+        else:
+            merged.merge(partial.partial_state())
+    return merged.result()
+
+
+def _solve_whole(solution_class, lines, config=None):
+    return _solve_in_chunks(solution_class, lines, len(lines), config)
+
+
+class TestMerge(unittest.TestCase):
+    def test_summing_and_product_solutions(self):
+        for solution_class in (create_summing_solution(int), create_product_solution(int)):
+            with self.subTest(solution_class=solution_class):
+                lines = ['3', '1', '4', '1', '5', '9', '2']
+                self.assertTrue(issubclass(solution_class, MergeableLineByLineSolution))
+                self.assertEqual(_solve_in_chunks(solution_class, lines, 3), _solve_whole(solution_class, lines))
+
+    def test_onsen_towel_solver(self):
+        config = ['r', 'wr', 'b', 'g', 'bwu', 'rb', 'gb', 'br']
+        lines = ['brwrr', 'bggr', 'gbbr', 'rrbgbr', 'ubwu', 'bwurrg', 'brgr', 'bbrgwb']
+        for solution_class in (OnsenTowelSolver, OnsenTowelEveryOptionSolver):
+            with self.subTest(solution_class=solution_class):
+                self.assertEqual(_solve_in_chunks(solution_class, lines, 3, config),
+                                 _solve_whole(solution_class, lines, config))
+
+    def test_monkey_market_solver(self):
+        lines = [1, 2, 3, 2024]
+        self.assertEqual(_solve_whole(MonkeyMarketSolver, lines), 23)
+        self.assertEqual(_solve_in_chunks(MonkeyMarketSolver, lines, 1), 23)
+
+    def test_not_mergeable_without_combine_func(self):
+        solution_class = create_line_by_line_aggregating_solution(int, operator.add, 0)
+        self.assertFalse(issubclass(solution_class, MergeableLineByLineSolution))
+        self.assertFalse(hasattr(solution_class, 'merge'))
+
+
+class TestShardedSolve(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._input = pathlib.Path(self._tmp_dir.name) / 'input.txt'
+        # A config header, and no newline after the last line
+        self._input.write_text(
+            'r, wr, b, g, bwu, rb, gb, br\n\nbrwrr\nbggr\ngbbr\nrrbgbr\nubwu\nbwurrg\nbrgr\nbbrgwb'
+        )
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def _solve(self, jobs: int) -> list[str | int]:
+        solver = LineSolver(
+            file_names=[str(self._input)],
+            line_parser=parse_line,
+            file_config_parser=pare_file_config,
+            solutions=[OnsenTowelSolver, OnsenTowelEveryOptionSolver],
+            log_func=lambda _: None,
+            jobs=jobs,
+        )
+        return solver.solve_file(str(self._input))
+
+    def test_matches_single_job(self):
+        self.assertEqual(self._solve(1), [6, 16])
+        for jobs in (2, 3, 20):
+            with self.subTest(jobs=jobs):
+                self.assertEqual(self._solve(jobs), [6, 16])
+
+    def test_bytes_parser_after_config(self):
+        self._input.write_text('ignored header\n\n1\n22\n333')
+        for jobs in (1, 2, 3):
+            with self.subTest(jobs=jobs):
+                solver = LineSolver(
+                    file_names=[str(self._input)],
+                    line_parser=int,
+                    bytes_line_parser=int,
+                    file_config_parser=lambda f: (f.readline(), f.readline()),
+                    solutions=[create_summing_solution(lambda x: x)],
+                    log_func=lambda _: None,
+                    jobs=jobs,
+                )
+                self.assertEqual(solver.solve_file(str(self._input)), [356])
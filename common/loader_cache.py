@@ -0,0 +1,150 @@
+import functools
+import hashlib
+import os
+import pathlib
+import pickle
+import sys
+import tempfile
+import types
+from typing import Callable, TextIO, TypeVar, Any
+
+from common.days import BASE_DIR
+
+T = TypeVar('T')
+
+DEFAULT_CACHE_DIR = BASE_DIR / '.loader_cache'
+DEFAULT_MAX_SIZE_BYTES = 512 * 1024 * 1024
+
+_CACHE_FILE_SUFFIX = '.pickle'
+
+# Cached grids are instances of these modules' classes, so a change to their attributes must invalidate them
+_GRID_MODULE_PATHS = (BASE_DIR / 'common' / 'grid.py', BASE_DIR / 'common' / 'array_grid.py')
+
+
+class LoaderCache:
+    """
+    Caches the result of a FileSolver loader on disk, keyed by the input file's contents and the loader's
+    identity, so that later runs can unpickle the parsed data rather than re-parsing the input.
+
+    The loader's identity covers its name, its bytecode and the globals it refers to, plus the source of its module
+    and of the grid modules whose classes loaders commonly build. Bump `version`, or `clear()` the cache, when a
+    change anywhere else should invalidate previously cached results. Once the cache grows past `max_size_bytes`,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path = DEFAULT_CACHE_DIR,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+        version: str = '',
+    ) -> None:
+        self._directory = pathlib.Path(directory)
+        self._max_size_bytes = max_size_bytes
+        self._version = version
+
+    def load(self, file_name: str, loader: Callable[[TextIO], T]) -> T:
+        path = self._directory / (self._key(file_name, loader) + _CACHE_FILE_SUFFIX)
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            # Bump the modification time so eviction treats this entry as recently used
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Written by an incompatible version of the code. Drop it and re-parse.
+            path.unlink(missing_ok=True)
+
+        with open(file_name, 'r') as f:
+            data = loader(f)
+        self._store(path, data)
+        return data
+
+    def clear(self) -> None:
+        for path in self._iter_entries():
+            path.unlink(missing_ok=True)
+
+    def _key(self, file_name: str, loader: Callable[[TextIO], Any]) -> str:
+        digest = hashlib.sha256()
+        with open(file_name, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(_loader_fingerprint(loader).encode())
+        digest.update(self._version.encode())
+        return digest.hexdigest()
+
+    def _store(self, path: pathlib.Path, data: Any) -> None:
+        try:
+            serialized = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Not everything a loader returns can be pickled. Those loaders simply aren't cached.
+            return
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        # Write then rename so that concurrent runs never observe a partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(serialized)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._iter_entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self._max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+    def _iter_entries(self) -> list[pathlib.Path]:
+        if not self._directory.is_dir():
+            return []
+        return list(self._directory.glob(f'*{_CACHE_FILE_SUFFIX}'))
+
+
+def _loader_fingerprint(loader: Callable[[TextIO], Any]) -> str:
+    # Bound methods (e.g. classmethod loaders) keep their code on the underlying function
+    func = getattr(loader, '__func__', loader)
+    name = f'{getattr(func, "__module__", "")}.{getattr(func, "__qualname__", repr(func))}'
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return name
+
+    digest = hashlib.sha256(name.encode())
+    _hash_code(code, digest)
+    module_path = getattr(sys.modules.get(func.__module__), '__file__', None)
+    for path in (module_path, *_GRID_MODULE_PATHS):
+        if path is not None:
+            digest.update(_source_digest(pathlib.Path(path)))
+    return digest.hexdigest()
+
+
+@functools.cache
+def _source_digest(path: pathlib.Path) -> bytes:
+    try:
+        return hashlib.sha256(path.read_bytes()).digest()
+    except OSError:
+        return b''
+
+
+def _hash_code(code: types.CodeType, digest: 'hashlib._Hash') -> None:
+    digest.update(code.co_code)
+    # Globals and attributes are referred to by index into co_names, so `int(f)` and `str(f)` share bytecode
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            # The repr of a code object includes its memory address, so hash nested code by content
+            _hash_code(const, digest)
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
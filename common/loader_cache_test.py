@@ -0,0 +1,50 @@
+import pathlib
+import tempfile
+import unittest
+from typing import TextIO
+
+from common.loader_cache import LoaderCache
+
+
+class TestLoaderCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._dir = pathlib.Path(self._tmp_dir.name)
+        self._input = self._dir / 'input.txt'
+        self._input.write_text('1\n2\n3\n')
+        self._load_count = 0
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def _loader(self, file: TextIO) -> list[int]:
+        self._load_count += 1
+        return [int(line) for line in file]
+
+    def test_reuses_cached_result(self):
+        cache = LoaderCache(self._dir / 'cache')
+        self.assertEqual(cache.load(str(self._input), self._loader), [1, 2, 3])
+        self.assertEqual(cache.load(str(self._input), self._loader), [1, 2, 3])
+        self.assertEqual(self._load_count, 1)
+
+    def test_reloads_when_input_changes(self):
+        cache = LoaderCache(self._dir / 'cache')
+        cache.load(str(self._input), self._loader)
+        self._input.write_text('4\n')
+        self.assertEqual(cache.load(str(self._input), self._loader), [4])
+        self.assertEqual(self._load_count, 2)
+
+    def test_reloads_when_version_changes(self):
+        LoaderCache(self._dir / 'cache').load(str(self._input), self._loader)
+        LoaderCache(self._dir / 'cache', version='2').load(str(self._input), self._loader)
+        self.assertEqual(self._load_count, 2)
+
+    def test_loaders_calling_different_globals_differ(self):
+        cache = LoaderCache(self._dir / 'cache')
+        self.assertEqual(cache.load(str(self._input), lambda f: int(f.readline())), 1)
+        self.assertEqual(cache.load(str(self._input), lambda f: str(f.readline())), '1\n')
+
+    def test_evicts_down_to_max_size(self):
+        cache = LoaderCache(self._dir / 'cache', max_size_bytes=0)
+        cache.load(str(self._input), self._loader)
+        self.assertEqual(list((self._dir / 'cache').glob('*.pickle')), [])
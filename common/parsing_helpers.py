@@ -16,3 +16,11 @@ def load_numeric_grid(file: TextIO) -> list[list[int]]:
 
 def split_nums(line: str) -> list[int]:
     return [int(value) for value in re.split(r'\s+', line.strip())]
+
+
+def split_nums_bytes(line: bytes) -> list[int]:
+    values = line.split()
+    if not values:
+        # Fail on blank lines just like split_nums does, so a file gets the same answer with or without mmap
+        raise ValueError(f'No numbers in {line!r}')
+    return [int(value) for value in values]
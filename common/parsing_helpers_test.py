@@ -0,0 +1,16 @@
+import unittest
+
+from common.parsing_helpers import split_nums, split_nums_bytes
+
+
+class TestSplitNums(unittest.TestCase):
+    def test_bytes_matches_text(self):
+        for line in ['7 6 4 2 1\n', '  1 2\t7 8 9  \n', '42', '\n', '', '   \n', '1 x 3\n']:
+            with self.subTest(line=line):
+                try:
+                    expected = split_nums(line)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        split_nums_bytes(line.encode())
+                else:
+                    self.assertEqual(split_nums_bytes(line.encode()), expected)
@@ -0,0 +1,149 @@
+import argparse
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import io
+import os
+import time
+import traceback
+from typing import Optional, Sequence, Iterable
+
+from common.days import available_days, get_day_solvers, in_day_directory, parse_day_range
+from common.history import DEFAULT_HISTORY_PATH, HistorySink, RunHistory, current_git_revision
+from common.instrumentation import FanOutSink, Instrumentation, JsonLinesSink, MeasurementSink
+from common.loader_cache import LoaderCache
+
+
+@dataclasses.dataclass(frozen=True)
+class DayResult:
+    day_number: int
+    # One entry per solver returned by the day's get_solvers(), mapping file name to per-part answers
+    results: Sequence[dict[str, list[str | int]]]
+    elapsed_seconds: float
+    output: str
+    error: Optional[str] = None
+
+    def format_str(self) -> str:
+        lines = [f'Day {self.day_number} ({self.elapsed_seconds:0.3f}s):']
+        for solver_results in self.results:
+            for file_name, answers in solver_results.items():
+                lines.append(f'\t{file_name}: {", ".join(map(str, answers))}')
+        if self.error is not None:
+            lines.append(f'\tFailed: {self.error.strip().splitlines()[-1]}')
+        return '\n'.join(lines)
+
+
+def run_day(
+    day_number: int,
+    instrumentation_path: Optional[str] = None,
+    use_loader_cache: bool = False,
+    history_path: Optional[str] = None,
+    git_revision: Optional[str] = None,
+    shard_jobs: int = 1,
+) -> DayResult:
+    """
+    Runs every solver for a single day, capturing anything the solvers log rather than letting output from
+    concurrently running days interleave. If an instrumentation path is given, per-stage measurements are
+    appended to it as JSON lines. If a history path is given, they're also recorded to that run history.
+    Line solvers whose solutions can be merged split each file across `shard_jobs` processes.
+    """
+    output = io.StringIO()
+    results = []
+    error = None
+    start = time.perf_counter()
+    try:
+        solvers = get_day_solvers(day_number)
+        with in_day_directory(day_number), contextlib.redirect_stdout(output):
+            for solver_idx, solver in enumerate(solvers):
+                sinks: list[MeasurementSink] = []
+                if instrumentation_path is not None:
+                    sinks.append(JsonLinesSink(instrumentation_path, day_number=day_number, solver=solver_idx))
+                if history_path is not None:
+                    sinks.append(HistorySink(RunHistory(history_path), day_number, solver_idx, git_revision))
+                if sinks:
+                    solver.instrumentation = Instrumentation(FanOutSink(sinks))
+                if use_loader_cache and hasattr(solver, 'loader_cache'):
+                    solver.loader_cache = LoaderCache()
+                if hasattr(solver, 'jobs'):
+                    solver.jobs = shard_jobs
+                results.append(solver.solve_all())
+    except Exception:
+        error = traceback.format_exc()
+
+    return DayResult(
+        day_number=day_number,
+        results=results,
+        elapsed_seconds=time.perf_counter() - start,
+        output=output.getvalue(),
+        error=error,
+    )
+
+
+def run_days(
+    day_numbers: Iterable[int],
+    jobs: Optional[int] = None,
+    instrumentation_path: Optional[str] = None,
+    use_loader_cache: bool = False,
+    history_path: Optional[str] = None,
+    shard_jobs: int = 1,
+) -> list[DayResult]:
+    day_numbers = list(day_numbers)
+    run = functools.partial(
+        run_day,
+        instrumentation_path=instrumentation_path,
+        use_loader_cache=use_loader_cache,
+        history_path=history_path,
+        git_revision=current_git_revision() if history_path is not None else None,
+        shard_jobs=shard_jobs,
+    )
+    if jobs == 1:
+        return [run(day_number) for day_number in day_numbers]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(run, day_numbers))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run the solvers for many days in parallel.')
+    parser.add_argument('--days', type=parse_day_range, default=None, help='e.g. "1-23" or "1,3,5-7"')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='number of worker processes')
+    parser.add_argument('--verbose', action='store_true', help='print the captured solver output')
+    parser.add_argument('--instrument', metavar='PATH', help='append per-stage timings and memory as JSON lines')
+    parser.add_argument('--loader-cache', action='store_true', help='reuse parsed inputs cached on disk')
+    parser.add_argument('--clear-loader-cache', action='store_true',
+                        help='discard every parsed input cached on disk before running')
+    parser.add_argument('--history', nargs='?', const=str(DEFAULT_HISTORY_PATH), metavar='PATH',
+                        help='record per-stage timings and answers to a run history (see common.history)')
+    parser.add_argument('--shard-jobs', type=int, default=1, metavar='N',
+                        help='split each line solver input across N processes where its solutions can be merged')
+    args = parser.parse_args()
+
+    if args.clear_loader_cache:
+        LoaderCache().clear()
+
+    start = time.perf_counter()
+    day_results = run_days(
+        args.days or available_days(),
+        jobs=args.jobs,
+        instrumentation_path=args.instrument,
+        use_loader_cache=args.loader_cache,
+        history_path=args.history,
+        shard_jobs=args.shard_jobs,
+    )
+    elapsed = time.perf_counter() - start
+
+    for day_result in day_results:
+        print(day_result.format_str())
+        if args.verbose:
+            print(day_result.output)
+    failures = [r.day_number for r in day_results if r.error is not None]
+    print('=' * 80)
+    print(f'Ran {len(day_results)} days in {elapsed:0.3f}s. Failed days: {failures or "none"}')
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
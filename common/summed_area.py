@@ -0,0 +1,115 @@
+from typing import Callable, Iterable, Optional
+
+from common.grid import Grid, InvalidPointException, PositionType
+
+
+class SummedAreaTable:
+    """
+    Prefix sums over a grid of numbers (or of point counts), so that the sum over any rectangle is four lookups
+    after one linear build. Also keeps prefix sums of squares, for the variance of values within a rectangle.
+
+    Rectangles are given as a top left point plus a height and width, like `Grid.sub_grid`.
+    """
+
+    def __init__(self, rows: Iterable[Iterable[int | float]], height: int, width: int) -> None:
+        self.height = height
+        self.width = width
+        # Entry (row + 1, col + 1) is the sum over everything above and left of (row, col), inclusive. The extra
+        # leading row and column of zeros saves bounds checks on every query.
+        stride = width + 1
+        self._sums = [0] * ((height + 1) * stride)
+        self._square_sums = [0] * ((height + 1) * stride)
+        for row, values in enumerate(rows):
+            above, idx = row * stride + 1, (row + 1) * stride + 1
+            row_sum = row_square_sum = 0
+            for col, value in enumerate(values):
+                row_sum += value
+                row_square_sum += value * value
+                self._sums[idx + col] = self._sums[above + col] + row_sum
+                self._square_sums[idx + col] = self._square_sums[above + col] + row_square_sum
+
+    @classmethod
+    def from_grid(
+        cls,
+        grid: Grid,
+        value: Optional[Callable[[object], int | float]] = None,
+    ) -> 'SummedAreaTable':
+        """
+        Sums the grid's values, or `value(cell)` for each cell if given, e.g. `lambda c: c == '#'` to count cells.
+        """
+        rows = (
+            row.to_list() if value is None else map(value, row.to_list())
+            for row in grid.rows()
+        )
+        return cls(rows, grid.height, grid.width)
+
+    @classmethod
+    def from_points(cls, dimensions: tuple[int, int], points: Iterable[PositionType]) -> 'SummedAreaTable':
+        """
+        Counts how many of the points (which may repeat) lie in each cell.
+        """
+        height, width = dimensions
+        counts = [[0] * width for _ in range(height)]
+        for row, col in points:
+            if not (0 <= row < height and 0 <= col < width):
+                raise InvalidPointException(f'Invalid point {(row, col)}. Width: {width}, Height: {height}')
+            counts[row][col] += 1
+        return cls(counts, height, width)
+
+    def rect_sum(self, top_left: PositionType, height: int, width: int) -> int | float:
+        return self._rect_total(self._sums, top_left, height, width)
+
+    def total(self) -> int | float:
+        return self._sums[-1]
+
+    def mean(self, top_left: PositionType, height: int, width: int) -> float:
+        return self.rect_sum(top_left, height, width) / (height * width)
+
+    def variance(self, top_left: PositionType, height: int, width: int) -> float:
+        """
+        The population variance of the values in the rectangle.
+        """
+        mean = self.mean(top_left, height, width)
+        return self._rect_total(self._square_sums, top_left, height, width) / (height * width) - mean * mean
+
+    def quadrant_sums(self, exclude_middle: bool = True) -> tuple[int | float, int | float, int | float, int | float]:
+        """
+        The sums over the top left, top right, bottom left and bottom right quadrants. With `exclude_middle`, the
+        middle row and column of an odd sized grid belong to no quadrant; otherwise they go to the bottom and right.
+        """
+        top_height, left_width = self.height // 2, self.width // 2
+        bottom, right = self.height - top_height, self.width - left_width
+        if exclude_middle:
+            bottom, right = top_height, left_width
+        bottom_top, right_left = self.height - bottom, self.width - right
+        return (
+            self.rect_sum((0, 0), top_height, left_width),
+            self.rect_sum((0, right_left), top_height, right),
+            self.rect_sum((bottom_top, 0), bottom, left_width),
+            self.rect_sum((bottom_top, right_left), bottom, right),
+        )
+
+    def window_sums(self, height: int, width: int) -> Grid[int | float]:
+        """
+        The sum over every height x width window, indexed by the window's top left point.
+        """
+        return Grid([
+            [self.rect_sum((row, col), height, width) for col in range(self.width - width + 1)]
+            for row in range(self.height - height + 1)
+        ])
+
+    def densest_window(self, height: int, width: int) -> tuple[PositionType, int | float]:
+        """
+        The top left point of the height x width window with the largest sum, and that sum.
+        """
+        return max(self.window_sums(height, width).iter_points_and_values(), key=lambda item: item[1])
+
+    def _rect_total(self, sums: list[int | float], top_left: PositionType, height: int, width: int) -> int | float:
+        top, left = top_left
+        if height < 0 or width < 0 or not (0 <= top <= top + height <= self.height
+                                           and 0 <= left <= left + width <= self.width):
+            raise InvalidPointException(f'Invalid rectangle {height}x{width} at {top_left}')
+        stride = self.width + 1
+        bottom, right = (top + height) * stride, left + width
+        top *= stride
+        return sums[bottom + right] - sums[top + right] - sums[bottom + left] + sums[top + left]
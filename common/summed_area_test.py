@@ -0,0 +1,31 @@
+import io
+import unittest
+
+from common.grid import InvalidPointException, load_digit_grid
+from common.summed_area import SummedAreaTable
+
+
+class TestSummedAreaTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.grid = load_digit_grid(io.StringIO('123\n456\n789\n'))
+        self.table = SummedAreaTable.from_grid(self.grid)
+
+    def test_rect_sums(self):
+        self.assertEqual(self.table.total(), 45)
+        self.assertEqual(self.table.rect_sum((1, 1), 2, 2), 28)
+        self.assertEqual(self.table.rect_sum((0, 2), 3, 1), 18)
+        self.assertEqual(self.table.rect_sum((2, 2), 0, 0), 0)
+        self.assertAlmostEqual(self.table.variance((0, 0), 1, 3), 2 / 3)
+        with self.assertRaises(InvalidPointException):
+            self.table.rect_sum((2, 2), 2, 1)
+
+    def test_quadrants_and_windows(self):
+        self.assertEqual(self.table.quadrant_sums(), (1, 3, 7, 9))
+        self.assertEqual(self.table.quadrant_sums(exclude_middle=False), (1, 5, 11, 28))
+        self.assertEqual(self.table.window_sums(2, 2).format_str(lambda s: f'{s} '), '12 16 \n24 28 ')
+        self.assertEqual(self.table.densest_window(2, 2), ((1, 1), 28))
+
+    def test_from_points(self):
+        table = SummedAreaTable.from_points((2, 3), [(0, 0), (0, 0), (1, 2)])
+        self.assertEqual(table.quadrant_sums(), (2, 0, 0, 1))
+        self.assertEqual(SummedAreaTable.from_grid(self.grid, lambda v: v % 2).total(), 5)
@@ -29,9 +29,16 @@ def compute_similarity(data: LoadedDataType) -> int:
     return result
 
 
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType].construct_for_day(
+            day_number=1,
+            loader=load_lists,
+            solutions=[compute_list_diff, compute_similarity]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[LoadedDataType].construct_for_day(
-        day_number=1,
-        loader=load_lists,
-        solutions=[compute_list_diff, compute_similarity]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
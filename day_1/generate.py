@@ -0,0 +1,14 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+@register_generator(day_number=1)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    num_lines = 1000 * scale
+    left = [rng.randrange(10_000, 100_000) for _ in range(num_lines)]
+    # Draw some of the right list from the left list so that similarity scores aren't all zero
+    right = [rng.choice(left) if rng.random() < 0.3 else rng.randrange(10_000, 100_000) for _ in range(num_lines)]
+    for left_num, right_num in zip(left, right):
+        file.write(f'{left_num}   {right_num}\n')
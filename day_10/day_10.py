@@ -1,7 +1,8 @@
-from typing import Callable
+import itertools
+from typing import Callable, Iterable, Optional, TypeVar
 
 from common.file_solver import FileSolver
-from common.grid import *
+from common.grid import Grid, PositionType, load_digit_grid
 
 LoadedDataType = Grid[int]
 
@@ -35,8 +36,7 @@ def _score_terrain(
 
     return sum(
         score_function(get_scorable_value_for_point(point))
-        for point, terrain_at_point in terrain
-        if terrain_at_point == 0
+        for point in terrain.find_all(0)
     )
 
 
@@ -58,9 +58,16 @@ def solve_pt2(data: LoadedDataType) -> int:
     )
 
 
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType].construct_for_day(
+            day_number=10,
+            loader=load_digit_grid,
+            solutions=[solve_pt1, solve_pt2]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[LoadedDataType].construct_for_day(
-        day_number=10,
-        loader=load_digit_grid,
-        solutions=[solve_pt1, solve_pt2]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
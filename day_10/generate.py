@@ -0,0 +1,18 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator, scaled_side, write_grid
+
+
+@register_generator(day_number=10)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(50, scale)
+    grid = [[str(rng.randint(0, 9)) for _ in range(side)] for _ in range(side)]
+    # Random digits rarely form trails, so walk uphill from random trailheads to lay some down
+    for _ in range(side * side // 20):
+        row, col = rng.randrange(side), rng.randrange(side)
+        for height in range(10):
+            grid[row][col] = str(height)
+            d_row, d_col = rng.choice(((-1, 0), (1, 0), (0, -1), (0, 1)))
+            row, col = min(max(row + d_row, 0), side - 1), min(max(col + d_col, 0), side - 1)
+    write_grid(file, grid)
@@ -53,9 +53,16 @@ def solve_pt2(data: LoadedDataType) -> int:
     return count_rock_expansion(data, 75)
 
 
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType].construct_for_day(
+            day_number=11,
+            loader=load,
+            solutions=[count_rock_expansion, solve_pt2]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[LoadedDataType].construct_for_day(
-        day_number=11,
-        loader=load,
-        solutions=[count_rock_expansion, solve_pt2]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,10 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+@register_generator(day_number=11)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    stones = [rng.randint(0, 10 ** rng.randint(1, 7)) for _ in range(8 * scale)]
+    file.write(' '.join(map(str, stones)) + '\n')
@@ -0,0 +1,27 @@
+import random
+import string
+from typing import TextIO
+
+from common.generate import register_generator, scaled_side, write_grid
+
+
+@register_generator(day_number=12)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(140, scale)
+    grid: list[list[str | None]] = [[None] * side for _ in range(side)]
+    # Grow regions outwards from random seeds in a random order so that they end up with ragged borders
+    frontier = []
+    for _ in range(side * side // 100):
+        row, col = rng.randrange(side), rng.randrange(side)
+        grid[row][col] = rng.choice(string.ascii_uppercase)
+        frontier.append((row, col))
+
+    while frontier:
+        idx = rng.randrange(len(frontier))
+        frontier[idx], frontier[-1] = frontier[-1], frontier[idx]
+        row, col = frontier.pop()
+        for next_row, next_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= next_row < side and 0 <= next_col < side and grid[next_row][next_col] is None:
+                grid[next_row][next_col] = grid[row][col]
+                frontier.append((next_row, next_col))
+    write_grid(file, grid)
@@ -68,9 +68,16 @@ def min_score_scaled_prizes(data: Iterable[ClawMachineInfo]) -> int:
     )
 
 
+def get_solvers() -> list[FileSolver[Sequence[ClawMachineInfo]]]:
+    return [
+        FileSolver[Sequence[ClawMachineInfo]].construct_for_day(
+            day_number=13,
+            loader=load,
+            solutions=[min_score_all_prizes, min_score_scaled_prizes]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[Sequence[ClawMachineInfo]].construct_for_day(
-        day_number=13,
-        loader=load,
-        solutions=[min_score_all_prizes, min_score_scaled_prizes]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
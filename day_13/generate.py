@@ -0,0 +1,23 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+@register_generator(day_number=13)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    machines = []
+    for _ in range(320 * scale):
+        a_x, a_y, b_x, b_y = (rng.randint(10, 99) for _ in range(4))
+        if rng.random() < 0.5:
+            # Reachable by some number of presses of each button
+            a_presses, b_presses = rng.randint(1, 100), rng.randint(1, 100)
+            prize_x, prize_y = a_x * a_presses + b_x * b_presses, a_y * a_presses + b_y * b_presses
+        else:
+            prize_x, prize_y = rng.randint(1000, 20_000), rng.randint(1000, 20_000)
+        machines.append(
+            f'Button A: X+{a_x}, Y+{a_y}\n'
+            f'Button B: X+{b_x}, Y+{b_y}\n'
+            f'Prize: X={prize_x}, Y={prize_y}\n'
+        )
+    file.write('\n'.join(machines))
@@ -5,11 +5,13 @@ import statistics
 from collections import defaultdict
 from typing import TextIO, cast
 
-import png
-
 from common.file_solver import FileSolver
 from common.grid import add_relative_point, scale_relative_point
-from common.line_solver import LineSolver, AbstractLineByLineSolution
+from common.imports import lazy_import
+from common.line_solver import LineSolver, MergeableLineByLineSolution
+
+# Only needed to find and draw the tree in part 2
+png = lazy_import('png')
 
 _ROBOT_DATA_MATCHER = re.compile(r'p=(\d+),(\d+) v=(-?\d+),(-?\d+)')
 
@@ -68,7 +70,7 @@ def load_file(file: TextIO) -> tuple[FileConfigType, list[RobotData]]:
     return grid_size, robots
 
 
-class Part1Solution(AbstractLineByLineSolution[RobotData, FileConfigType]):
+class Part1Solution(MergeableLineByLineSolution[RobotData, FileConfigType]):
     def __init__(self) -> None:
         self._quadrant_counts = defaultdict(int)
         self._size = (1, 1)
@@ -85,6 +87,13 @@ class Part1Solution(AbstractLineByLineSolution[RobotData, FileConfigType]):
     def result(self) -> int:
         return math.prod(self._quadrant_counts.values())
 
+    def partial_state(self) -> dict[int, int]:
+        return self._quadrant_counts
+
+    def merge(self, partial_state: dict[int, int]) -> None:
+        for quadrant, count in partial_state.items():
+            self._quadrant_counts[quadrant] += count
+
 
 def construct_step_images(data: tuple[FileConfigType, list[RobotData]]) -> str:
     grid_size, robots = data
@@ -108,16 +117,22 @@ def construct_step_images(data: tuple[FileConfigType, list[RobotData]]) -> str:
     return f'open robot_images/step_*.png'
 
 
+def get_solvers() -> list[LineSolver[RobotData, FileConfigType] | FileSolver]:
+    return [
+        LineSolver[RobotData, FileConfigType].construct_for_day(
+            day_number=14,
+            line_parser=parse_line,
+            file_config_parser=parse_file_config,
+            solutions=[Part1Solution]
+        ),
+        FileSolver[tuple[FileConfigType, list[RobotData]]](
+            file_names=['input_14.txt'],
+            loader=load_file,
+            solutions=[construct_step_images]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    LineSolver[RobotData, FileConfigType].construct_for_day(
-        day_number=14,
-        line_parser=parse_line,
-        file_config_parser=parse_file_config,
-        solutions=[Part1Solution]
-    ).solve_all()
-
-    FileSolver[tuple[FileConfigType, list[RobotData]]].construct_for_day(
-        day_number=14,
-        loader=load_file,
-        solutions=[construct_step_images]
-    ).solve_file('input_14.txt')
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,17 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+_WIDTH, _HEIGHT = 101, 103
+
+
+# The second solver writes an image for every step it considers, so only time the first
+@register_generator(day_number=14, solver_indices=(0,))
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    file.write(f'{_WIDTH},{_HEIGHT}\n')
+    for _ in range(500 * scale):
+        file.write(
+            f'p={rng.randrange(_WIDTH)},{rng.randrange(_HEIGHT)} '
+            f'v={rng.randint(-100, 100)},{rng.randint(-100, 100)}\n'
+        )
@@ -71,8 +71,7 @@ class WHGrid(Grid[GridSpace]):
     def score(self) -> int:
         return sum(
             row_idx * 100 + col_idx
-            for (row_idx, col_idx), cell in self.iter_points_and_values()
-            if cell == self._SCORABLE_CELL_TYPE
+            for row_idx, col_idx in self.find_all(self._SCORABLE_CELL_TYPE)
         )
 
 
@@ -166,19 +165,23 @@ def solve(data: tuple[WHGrid, Sequence[Direction]]) -> int:
     return wh_grid.score()
 
 
+def get_solvers() -> list[FileSolver[tuple[WHGrid, Sequence[Direction]]]]:
+    return [
+        FileSolver[tuple[WHGrid, Sequence[Direction]]].construct_for_day(
+            day_number=15,
+            loader=load_wh,
+            solutions=[solve]
+        ),
+        FileSolver[tuple[WHGrid, Sequence[Direction]]].construct_for_day(
+            day_number=15,
+            loader=load_wide_wh,
+            solutions=[solve]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    print('=' * 80)
-    print('PT1:\n')
-    FileSolver[tuple[WHGrid, Sequence[Direction]]].construct_for_day(
-        day_number=15,
-        loader=load_wh,
-        solutions=[solve]
-    ).solve_all()
-
-    print('=' * 80)
-    print('PT2:\n')
-    FileSolver[tuple[WHGrid, Sequence[Direction]]].construct_for_day(
-        day_number=15,
-        loader=load_wide_wh,
-        solutions=[solve]
-    ).solve_all()
+    for part, solver in enumerate(get_solvers(), start=1):
+        print('=' * 80)
+        print(f'PT{part}:\n')
+        solver.solve_all()
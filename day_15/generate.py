@@ -0,0 +1,22 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator, scaled_side, write_grid
+
+
+@register_generator(day_number=15)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(50, scale)
+    grid = [
+        [
+            '#' if row in (0, side - 1) or col in (0, side - 1) else rng.choices('#O.', (1, 5, 14))[0]
+            for col in range(side)
+        ]
+        for row in range(side)
+    ]
+    grid[rng.randrange(1, side - 1)][rng.randrange(1, side - 1)] = '@'
+    write_grid(file, grid)
+    file.write('\n')
+
+    for _ in range(20 * scale):
+        file.write(''.join(rng.choices('^v<>', k=1000)) + '\n')
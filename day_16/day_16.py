@@ -1,5 +1,4 @@
 import enum
-import itertools
 from collections import deque
 from typing import TextIO, Sequence, NamedTuple, Iterable
 
@@ -69,6 +68,8 @@ class ReindeerMaze(Grid[str]):
 
 
 class ReindeerSolver(graph_search.GraphSearcher[ReindeerPosition]):
+    edge_weights = graph_search.EdgeWeights.INTEGER
+
     def __init__(self, maze: ReindeerMaze) -> None:
         super().__init__()
         self._maze = maze
@@ -82,10 +83,25 @@ class ReindeerSolver(graph_search.GraphSearcher[ReindeerPosition]):
         return self._maze.neighbors(node)
 
     def heuristic(self, current: ReindeerPosition) -> float:
-        row_dist = abs(current.row - self._maze.end_loc.row)
-        col_dist = abs(current.col - self._maze.end_loc.row)
-        has_turns = 1000 if row_dist or col_dist else 0
-        return row_dist + col_dist + has_turns
+        # The exact cost with no walls in the way, which keeps the heuristic consistent: one step per square, plus
+        # a turn for each direction still to travel in that the reindeer isn't facing (two to turn around)
+        row_dist = self._maze.end_loc.row - current.row
+        col_dist = self._maze.end_loc.col - current.col
+        needed_directions = [
+            direction
+            for direction, dist in (
+                (Direction.SOUTH if row_dist > 0 else Direction.NORTH, row_dist),
+                (Direction.EAST if col_dist > 0 else Direction.WEST, col_dist),
+            )
+            if dist
+        ]
+        if current.direction in needed_directions:
+            turns = len(needed_directions) - 1
+        elif needed_directions == [rotate_90(current.direction, turns=2)]:
+            turns = 2
+        else:
+            turns = len(needed_directions)
+        return abs(row_dist) + abs(col_dist) + 1000 * turns
 
     def is_terminal_node(self, current: ReindeerPosition) -> bool:
         return current.raw_position() == self._maze.end_loc.raw_position()
@@ -96,19 +112,25 @@ def load(file: TextIO) -> ReindeerMaze:
 
 
 def solve(maze: ReindeerMaze) -> str:
-    solver = ReindeerSolver(maze)
-    paths, score = solver.get_all_best_paths(maze.start_loc)
+    best_paths = ReindeerSolver(maze).get_best_path_dag(maze.start_loc)
 
     uniq_nodes = {
         reindeer_pos.raw_position()
-        for reindeer_pos in itertools.chain.from_iterable(paths)
+        for reindeer_pos in best_paths.nodes_on_best_paths()
     }
-    return f'Best path score: {int(score)}, num_nodes: {len(uniq_nodes)}'
+    return f'Best path score: {int(best_paths.cost)}, num_nodes: {len(uniq_nodes)}'
+
+
+def get_solvers() -> list[FileSolver[ReindeerMaze]]:
+    return [
+        FileSolver[ReindeerMaze].construct_for_day(
+            day_number=16,
+            loader=load,
+            solutions=[solve]
+        ),
+    ]
 
 
 if __name__ == "__main__":
-    FileSolver[ReindeerMaze].construct_for_day(
-        day_number=16,
-        loader=load,
-        solutions=[solve]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,14 @@
+import random
+from typing import TextIO
+
+from common.generate import generate_maze, register_generator, scaled_side, write_grid
+
+
+@register_generator(day_number=16)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(141, scale)
+    # Some loops give the search more than one route (and so more than one best path) to consider
+    maze = generate_maze(side, side, rng, loop_fraction=0.1)
+    maze[-2][1] = 'S'
+    maze[1][-2] = 'E'
+    write_grid(file, maze)
@@ -98,16 +98,22 @@ def solve_pt2(data: LoadedDataType) -> int:
     return min(valid_a_states)
 
 
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType].construct_for_day(
+            day_number=17,
+            loader=load,
+            solutions=[solve_pt1]
+        ),
+        # Can't run pt 2 against sample input since my solution is hardcoded to my input
+        FileSolver[LoadedDataType](
+            file_names=['input_17.txt'],
+            loader=load,
+            solutions=[solve_pt2]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[LoadedDataType].construct_for_day(
-        day_number=17,
-        loader=load,
-        solutions=[solve_pt1]
-    ).solve_all()
-
-    # Can't run pt 2 against sample input since my solution is hardcoded to my input
-    FileSolver[LoadedDataType].construct_for_day(
-        day_number=17,
-        loader=load,
-        solutions=[solve_pt2]
-    ).solve_file('input_17.txt')
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,20 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+# Part 2 is hardcoded to this program, so only the initial value of register A varies
+_PROGRAM = (2, 4, 1, 1, 7, 5, 1, 5, 4, 1, 5, 5, 0, 3, 3, 0)
+
+
+@register_generator(day_number=17)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    # The program outputs once per 3 bits of register A
+    register_a = rng.getrandbits(48 * scale) | (1 << (48 * scale - 1))
+    file.write(
+        f'Register A: {register_a}\n'
+        f'Register B: 0\n'
+        f'Register C: 0\n'
+        f'\n'
+        f'Program: {",".join(map(str, _PROGRAM))}\n'
+    )
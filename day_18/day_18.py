@@ -3,8 +3,8 @@ import itertools
 from typing import TextIO, Tuple, cast, Iterable, Sequence
 
 from common.file_solver import FileSolver
-from common.graph_search import GraphSearcher, NodeType
-from common.grid import Grid, PositionType, SparseGrid, ALL_DIRECTIONS, manhattan_distance
+from common.graph_search import EdgeWeights, GraphSearcher, NodeType
+from common.grid import BitGrid, Grid, PositionType, ALL_DIRECTIONS, manhattan_distance
 
 LoadedDataType = tuple[PositionType, Sequence[PositionType], int]
 
@@ -26,6 +26,8 @@ def load(file: TextIO) -> LoadedDataType:
 
 
 class MemorySearcher(GraphSearcher[PositionType]):
+    edge_weights = EdgeWeights.UNIT
+
     def __init__(self, grid: Grid[bool]) -> None:
         super().__init__()
         self._grid = grid
@@ -49,21 +51,21 @@ class MemorySearcher(GraphSearcher[PositionType]):
         # Manhattan distance
         return manhattan_distance(node, self._goal())
 
+    def reverse_heuristic(self, node: NodeType, start_node: NodeType) -> float:
+        return manhattan_distance(node, start_node)
+
 
 def solve_pt1(data: LoadedDataType) -> int:
     dimensions, corrupted_locs, cutoff = data
-    first_kb = {
-        loc: True
-        for loc in corrupted_locs[:cutoff]
-    }
-    grid = SparseGrid[bool](dimensions, first_kb, default_value=False)
-    _, cost = MemorySearcher(grid).get_best_path((0, 0))
+    grid = BitGrid.from_points(dimensions, corrupted_locs[:cutoff])
+    height, width = dimensions
+    _, cost = MemorySearcher(grid).get_best_path_bidirectional((0, 0), (height - 1, width - 1))
     return int(cost)
 
 
 class CorruptedMemoryManager:
     def __init__(self, dimensions: tuple[int, int]) -> None:
-        self._grid = SparseGrid[bool](dimensions, {}, default_value=False)
+        self._grid = BitGrid.from_points(dimensions, ())
 
         self._cluster_id_generator = itertools.count()
         self._top_right_cluster = next(self._cluster_id_generator)
@@ -149,9 +151,16 @@ def solve_pt2(data: LoadedDataType) -> str:
     return 'No sol'
 
 
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType].construct_for_day(
+            day_number=18,
+            loader=load,
+            solutions=[solve_pt1, solve_pt2]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[LoadedDataType].construct_for_day(
-        day_number=18,
-        loader=load,
-        solutions=[solve_pt1, solve_pt2]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,20 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator, scaled_side
+
+
+@register_generator(day_number=18)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(71, scale)
+    cells = [
+        (x, y)
+        for x in range(side)
+        for y in range(side)
+        if (x, y) not in ((0, 0), (side - 1, side - 1))
+    ]
+    # Half the cells is always enough to cut off the exit, while the first fifth almost never is
+    falling_bytes = rng.sample(cells, len(cells) // 2)
+    file.write(f'{side},{side},{len(cells) // 5}\n')
+    for x, y in falling_bytes:
+        file.write(f'{x},{y}\n')
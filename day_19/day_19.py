@@ -1,6 +1,6 @@
 from typing import TextIO, Sequence, Iterable
 
-from common.line_solver import LineSolver, AbstractLineByLineSolution
+from common.line_solver import LineSolver, MergeableLineByLineSolution
 from common.trie import Trie
 
 FileConfigType = Sequence[str]
@@ -17,7 +17,7 @@ def parse_line(line: str) -> LineDataType:
     return line.strip()
 
 
-class OnsenTowelSolver(AbstractLineByLineSolution[LineDataType, FileConfigType]):
+class OnsenTowelSolver(MergeableLineByLineSolution[LineDataType, FileConfigType]):
     def __init__(self) -> None:
         self._towel_trie = Trie()
         self._num_possible_towels = 0
@@ -49,16 +49,29 @@ class OnsenTowelSolver(AbstractLineByLineSolution[LineDataType, FileConfigType])
     def result(self) -> int:
         return self._num_possible_towels
 
+    def partial_state(self) -> int:
+        return self._num_possible_towels
+
+    def merge(self, partial_state: int) -> None:
+        self._num_possible_towels += partial_state
+
 
 class OnsenTowelEveryOptionSolver(OnsenTowelSolver):
     def _aggregate_towels(self, towel_vals: Iterable[int]) -> int:
         return sum(towel_vals)
 
 
+def get_solvers() -> list[LineSolver[LineDataType, FileConfigType]]:
+    return [
+        LineSolver[LineDataType, FileConfigType].construct_for_day(
+            day_number=19,
+            line_parser=parse_line,
+            file_config_parser=pare_file_config,
+            solutions=[OnsenTowelSolver, OnsenTowelEveryOptionSolver]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    LineSolver[LineDataType, FileConfigType].construct_for_day(
-        day_number=19,
-        line_parser=parse_line,
-        file_config_parser=pare_file_config,
-        solutions=[OnsenTowelSolver, OnsenTowelEveryOptionSolver]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
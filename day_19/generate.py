@@ -0,0 +1,21 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+_COLORS = 'wubrg'
+
+
+@register_generator(day_number=19)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    towels = sorted({''.join(rng.choices(_COLORS, k=rng.randint(1, 8))) for _ in range(450)})
+    file.write(', '.join(towels) + '\n\n')
+
+    for _ in range(400 * scale):
+        if rng.random() < 0.5:
+            design = ''
+            while len(design) < 40:
+                design += rng.choice(towels)
+        else:
+            design = ''.join(rng.choices(_COLORS, k=rng.randint(40, 60)))
+        file.write(design + '\n')
@@ -1,6 +1,6 @@
 import itertools
 from common.line_solver import LineSolver, create_summing_solution
-from common.parsing_helpers import split_nums
+from common.parsing_helpers import split_nums, split_nums_bytes
 from itertools import pairwise
 
 
@@ -80,14 +80,21 @@ def is_dumb_dampened_seq_safe(seq: list[int]) -> bool:
     )
 
 
-if __name__ == "__main__":
-    LineSolver[LineDataType].construct_for_day(
-        day_number=2,
-        line_parser=split_nums,
-        solutions=[
-            create_summing_solution(is_basic_seq_safe),
-            create_summing_solution(is_dumb_dampened_seq_safe),
-            create_summing_solution(is_dampened_seq_safe),
-        ]
-    ).solve_all()
+def get_solvers() -> list[LineSolver[LineDataType, None]]:
+    return [
+        LineSolver[LineDataType, None].construct_for_day(
+            day_number=2,
+            line_parser=split_nums,
+            bytes_line_parser=split_nums_bytes,
+            solutions=[
+                create_summing_solution(is_basic_seq_safe),
+                create_summing_solution(is_dumb_dampened_seq_safe),
+                create_summing_solution(is_dampened_seq_safe),
+            ]
+        ),
+    ]
+
 
+if __name__ == "__main__":
+    for solver in get_solvers():
+        solver.solve_all()
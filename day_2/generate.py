@@ -0,0 +1,17 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+@register_generator(day_number=2)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    for _ in range(1000 * scale):
+        sign = rng.choice((-1, 1))
+        levels = [rng.randint(10, 90)]
+        for _ in range(rng.randint(4, 7)):
+            levels.append(levels[-1] + sign * rng.randint(1, 3))
+        # Break roughly half the reports, some badly enough that removing a level won't fix them
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            levels[rng.randrange(len(levels))] += rng.randint(-4, 4)
+        file.write(' '.join(map(str, levels)) + '\n')
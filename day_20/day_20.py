@@ -1,11 +1,11 @@
 import collections
-import itertools
+import math
 import typing
-from timeit import timeit
 from typing import TextIO
 
 from common.file_solver import FileSolver
-from common.grid import MazeGrid, MazeCell, PositionType, add_relative_point, manhattan_distance
+from common.instrumentation import Instrumentation, LogSink
+from common.grid import MazeGrid, MazeCell, PositionType
 
 
 class MazeConfig(typing.NamedTuple):
@@ -21,20 +21,23 @@ def load(file: TextIO) -> LoadedDataType:
     return MazeGrid[MazeCell].parse_grid_from_file(file, MazeCell), thresholds
 
 
-def solve_pt1(data: LoadedDataType) -> int:
-    maze_grid, maze_config = data
-    solver = MazeCheatSolver(maze_grid)
-    total_count, counts_by_savings = solver.count_cheats_by_savings_threshold(
+def build_cheat_solver(data: LoadedDataType) -> 'MazeCheatSolver':
+    maze_grid, _ = data
+    return MazeCheatSolver(maze_grid)
+
+
+def solve_pt1(data: LoadedDataType, cheat_solver: 'MazeCheatSolver') -> int:
+    _, maze_config = data
+    total_count, counts_by_savings = cheat_solver.count_cheats_by_savings_threshold(
         max_cheat_duration=2,
         cheat_savings_threshold=maze_config.long_cheat_threshold,
     )
     return total_count
 
 
-def solve_pt2(data: LoadedDataType) -> int:
-    maze_grid, maze_config = data
-    solver = MazeCheatSolver(maze_grid)
-    total_count, counts_by_savings = solver.count_cheats_by_savings_threshold(
+def solve_pt2(data: LoadedDataType, cheat_solver: 'MazeCheatSolver') -> int:
+    _, maze_config = data
+    total_count, counts_by_savings = cheat_solver.count_cheats_by_savings_threshold(
         max_cheat_duration=20,
         cheat_savings_threshold=maze_config.long_cheat_threshold,
     )
@@ -42,18 +45,22 @@ def solve_pt2(data: LoadedDataType) -> int:
 
 
 class MazeCheatSolver:
-    class _Cheat(typing.NamedTuple):
-        start: PositionType
-        end: PositionType
-        savings: int
-
     def __init__(self, maze: MazeGrid[MazeCell]) -> None:
         self._maze = maze
+        self._index = maze.flat_index()
         self._start_node = maze.get_location_by_cell_type(MazeCell.START)
         self._end_node = maze.get_location_by_cell_type(MazeCell.END)
-        self._node_to_dist_from_start = maze.get_all_travel_costs_starting_at_node(self._start_node)
-        self._node_to_dist_from_end = maze.get_all_travel_costs_starting_at_node(self._end_node)
-        self._no_cheat_cost = int(self._node_to_dist_from_start[self._end_node])
+        # Travel costs by flat index, and infinite for walls and anywhere unreachable
+        self._dists_from_start = self._to_flat_costs(maze.get_all_travel_costs_starting_at_node(self._start_node))
+        self._dists_from_end = self._to_flat_costs(maze.get_all_travel_costs_starting_at_node(self._end_node))
+        self._no_cheat_cost = int(self._dists_from_start[self._index.to_index(self._end_node)])
+
+    def _to_flat_costs(self, costs: dict[PositionType, float]) -> list[float]:
+        flat_costs = [math.inf] * self._index.size
+        for point, cost in costs.items():
+            if self._maze.is_valid_point(point) and self._maze[point] != MazeCell.WALL:
+                flat_costs[self._index.to_index(point)] = cost
+        return flat_costs
 
     def count_cheats_by_savings_threshold(
         self,
@@ -62,64 +69,50 @@ class MazeCheatSolver:
     ) -> tuple[int, dict[int, int]]:
         num_cheats_above_threshold = 0
         cheat_counts_by_savings_threshold = collections.defaultdict(int)
+        height, width = self._index.height, self._index.width
+        dists_from_end = self._dists_from_end
+        # A cheat must save at least the threshold, so its start and end costs (plus its own length) can total at
+        # most this much
+        max_cheat_path_cost = self._no_cheat_cost - cheat_savings_threshold
+        offsets = [
+            (d_row, d_col, d_row * width + d_col, abs(d_row) + abs(d_col))
+            for d_row, d_col in self._iter_offsets_within_dist(max_cheat_duration)
+        ]
 
-        for cell_loc, cell_val in self._maze.iter_points_and_values():
-            if cell_val == MazeCell.WALL:
+        for start_idx, start_cost in enumerate(self._dists_from_start):
+            if start_cost > max_cheat_path_cost:
                 continue
-            cheats = self._get_cheats_for_starting_point(
-                cheat_start=cell_loc,
-                max_cheat_duration=max_cheat_duration,
-                cheat_savings_threshold=cheat_savings_threshold,
-            )
-            num_cheats_above_threshold += len(cheats)
-            for cheat in cheats:
-                cheat_counts_by_savings_threshold[cheat.savings] += 1
+            row, col = divmod(start_idx, width)
+            for d_row, d_col, d_idx, cheat_duration in offsets:
+                if not (0 <= row + d_row < height and 0 <= col + d_col < width):
+                    continue
+                total_path_cost = start_cost + dists_from_end[start_idx + d_idx] + cheat_duration
+                if total_path_cost <= max_cheat_path_cost:
+                    num_cheats_above_threshold += 1
+                    cheat_counts_by_savings_threshold[int(self._no_cheat_cost - total_path_cost)] += 1
         return num_cheats_above_threshold, cheat_counts_by_savings_threshold
 
-    def _get_cheats_for_starting_point(
-        self,
-        cheat_start: PositionType,
-        max_cheat_duration: int,
-        cheat_savings_threshold: int,
-    ) -> set[_Cheat]:
-        potential_cheat_end = self._iter_bound_points_within_dist(cheat_start, max_cheat_duration)
-        cheats = (
-            self._compute_cheat(cheat_start, cheat_end)
-            for cheat_end in potential_cheat_end
-            if self._maze[cheat_end] != MazeCell.WALL
-        )
-        return {
-            cheat for cheat in cheats if cheat.savings >= cheat_savings_threshold
-        }
-
-    def _compute_cheat(self, cheat_start: PositionType, cheat_end: PositionType) -> _Cheat:
-        total_path_cost = sum((
-            self._node_to_dist_from_start[cheat_start],
-            self._node_to_dist_from_end[cheat_end],
-            manhattan_distance(cheat_start, cheat_end)
-        ))
-        savings = self._no_cheat_cost - total_path_cost
-        return MazeCheatSolver._Cheat(cheat_start, cheat_end, savings)
-
-    def _iter_bound_points_within_dist(self, point: PositionType, distance: int) -> typing.Iterable[PositionType]:
-        return [
-            p
-            for p in self._iter_unbound_points_within_dist(point, distance)
-            if self._maze.is_valid_point(p)
-        ]
+    @staticmethod
+    def _iter_offsets_within_dist(distance: int) -> typing.Iterable[tuple[int, int]]:
+        for d_row in range(-distance, distance + 1):
+            max_d_col = distance - abs(d_row)
+            for d_col in range(-max_d_col, max_d_col + 1):
+                if d_row or d_col:
+                    yield d_row, d_col
 
-    def _iter_unbound_points_within_dist(self, point: PositionType, distance: int) -> typing.Iterable[PositionType]:
-        for i in range(1, distance + 1):
-            for j in range(i + 1):
-                for row_mult, col_mult in itertools.product((-1, 1), (-1, 1)):
-                    yield add_relative_point(point, (row_mult * j, col_mult * (i - j)))
-                    yield add_relative_point(point, (row_mult * (i - j), col_mult * j))
+
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType].construct_for_day(
+            day_number=20,
+            loader=load,
+            solutions=[solve_pt1, solve_pt2],
+            stages={'cheat_solver': build_cheat_solver},
+        ),
+    ]
 
 
 if __name__ == "__main__":
-    solver = FileSolver[MazeGrid[MazeCell]].construct_for_day(
-        day_number=20,
-        loader=load,
-        solutions=[solve_pt1, solve_pt2]
-    )
-    print('=' * 80 + f'\nTime taken: {timeit(lambda: solver.solve_all(), number=1):0.4} seconds')
+    for solver in get_solvers():
+        solver.instrumentation = Instrumentation(LogSink(), trace_memory=False)
+        solver.solve_all()
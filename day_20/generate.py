@@ -0,0 +1,15 @@
+import random
+from typing import TextIO
+
+from common.generate import generate_maze, register_generator, scaled_side, write_grid
+
+
+@register_generator(day_number=20)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(141, scale)
+    # Without loops there's exactly one track from start to end, as in the real inputs
+    maze = generate_maze(side, side, rng)
+    maze[1][1] = 'S'
+    maze[-2][-2] = 'E'
+    file.write('2,100\n')
+    write_grid(file, maze)
@@ -81,12 +81,19 @@ def compute_code_complexity(line_data: LineDataType, robot_count: int) -> int:
     return _count_arrow_keypad_options(seq_options, robot_count) * numeric_val
 
 
+def get_solvers() -> list[LineSolver[LineDataType, None]]:
+    return [
+        LineSolver[LineDataType, None].construct_for_day(
+            day_number=21,
+            line_parser=parse_line,
+            solutions=[
+                create_summing_solution(functools.partial(compute_code_complexity, robot_count=2)),
+                create_summing_solution(functools.partial(compute_code_complexity, robot_count=25)),
+            ],
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    LineSolver[LineDataType, None].construct_for_day(
-        day_number=21,
-        line_parser=parse_line,
-        solutions=[
-            create_summing_solution(functools.partial(compute_code_complexity, robot_count=2)),
-            create_summing_solution(functools.partial(compute_code_complexity, robot_count=25)),
-        ],
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -1,18 +1,32 @@
+import functools
 from collections import Counter
 from typing import Iterable, cast
 
 from common.iter_utils import group_wise
-from common.line_solver import LineSolver, create_summing_solution, AbstractLineByLineSolution
+from common.line_solver import LineSolver, create_summing_solution, MergeableLineByLineSolution
 
 
 def parse_line(line: str) -> int:
     return int(line.strip())
 
 
-def compute_secret_number(secret: int, expansions: int = 2000) -> int:
+def parse_line_bytes(line: bytes) -> int:
+    return int(line)
+
+
+def final_secret_number(initial_secret: int) -> int:
+    return _secret_sequence(initial_secret)[-1]
+
+
+# When streaming or sharding, LineSolver hands each line to every solution before moving on to the next, so both
+# parts ask for the same sequence back to back and only the most recent one is worth keeping around. The instrumented
+# path runs each part over every line in turn instead, so there the cache misses on every line.
+@functools.lru_cache(maxsize=1)
+def _secret_sequence(initial_secret: int, expansions: int = 2000) -> tuple[int, ...]:
+    secrets = [initial_secret]
     for _ in range(expansions):
-        secret = _generate_next_secret_num(secret)
-    return secret
+        secrets.append(_generate_next_secret_num(secrets[-1]))
+    return tuple(secrets)
 
 
 def _generate_next_secret_num(secret: int) -> int:
@@ -26,19 +40,17 @@ def _mix_prune(secret: int, val: int) -> int:
     return (secret ^ val) % 16777216
 
 
-class MonkeyMarketSolver(AbstractLineByLineSolution[int, None]):
+class MonkeyMarketSolver(MergeableLineByLineSolution[int, None]):
 
     def __init__(self) -> None:
         self._seq_counters: Counter[tuple[int, int, int, int]] = Counter()
 
     @staticmethod
-    def _iter_prices(secret: int, expansions: int) -> Iterable[int]:
-        for _ in range(expansions + 1):
-            yield secret % 10
-            secret = _generate_next_secret_num(secret)
+    def _iter_prices(secret: int) -> Iterable[int]:
+        return (s % 10 for s in _secret_sequence(secret))
 
     def process_line(self, initial_secret: int) -> None:
-        prices = self._iter_prices(initial_secret, 2000)
+        prices = self._iter_prices(initial_secret)
         cur_monkey_counter: Counter[tuple[int, int, int, int]] = Counter()
         for group in group_wise(prices, 5):
             key = cast(
@@ -52,13 +64,27 @@ class MonkeyMarketSolver(AbstractLineByLineSolution[int, None]):
     def result(self) -> str | int:
         return self._seq_counters.most_common(1)[0][1]
 
+    def partial_state(self) -> Counter[tuple[int, int, int, int]]:
+        return self._seq_counters
+
+    def merge(self, partial_state: Counter[tuple[int, int, int, int]]) -> None:
+        self._seq_counters.update(partial_state)
+
+
+def get_solvers() -> list[LineSolver[int, None]]:
+    return [
+        LineSolver[int, None].construct_for_day(
+            day_number=22,
+            line_parser=parse_line,
+            bytes_line_parser=parse_line_bytes,
+            solutions=[
+                create_summing_solution(final_secret_number),
+                MonkeyMarketSolver,
+            ],
+        ),
+    ]
+
 
 if __name__ == "__main__":
-    LineSolver[int, None].construct_for_day(
-        day_number=22,
-        line_parser=parse_line,
-        solutions=[
-            create_summing_solution(compute_secret_number),
-            MonkeyMarketSolver,
-        ],
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,10 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+@register_generator(day_number=22)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    for _ in range(1600 * scale):
+        file.write(f'{rng.randrange(1, 1 << 24)}\n')
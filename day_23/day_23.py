@@ -91,9 +91,16 @@ def solve_pt2(lan_graph: LanNetworkGraphType) -> str:
     return ','.join(sorted(best_subgraph))
 
 
+def get_solvers() -> list[FileSolver[LanNetworkGraphType]]:
+    return [
+        FileSolver[LanNetworkGraphType].construct_for_day(
+            day_number=23,
+            loader=load,
+            solutions=[solve_pt1, solve_pt2]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[LanNetworkGraphType].construct_for_day(
-        day_number=23,
-        loader=load,
-        solutions=[solve_pt1, solve_pt2]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
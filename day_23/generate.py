@@ -0,0 +1,29 @@
+import itertools
+import math
+import random
+import string
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+@register_generator(day_number=23)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    num_computers = 520 * scale
+    name_length = max(2, math.ceil(math.log(num_computers, 26)))
+    names = [
+        ''.join(letters)
+        for letters in itertools.islice(itertools.product(string.ascii_lowercase, repeat=name_length), num_computers)
+    ]
+    rng.shuffle(names)
+
+    # Each computer has about 13 connections, plus one planted party in which everyone is connected
+    connections = set()
+    while len(connections) < num_computers * 13 // 2:
+        left, right = rng.sample(names, 2)
+        connections.add((min(left, right), max(left, right)))
+    party = sorted(rng.sample(names, 13))
+    connections.update(itertools.combinations(party, 2))
+
+    for left, right in sorted(connections):
+        file.write(f'{left}-{right}\n')
@@ -31,9 +31,16 @@ def solve_pt2(data: LoadedDataType) -> int:
     return result
 
 
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType](
+            file_names=['sample_3_1.txt', 'sample_3_2.txt', 'input_3.txt'],
+            loader=load,
+            solutions=[solve_pt1, solve_pt2]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[LoadedDataType](
-        file_names=['sample_3_1.txt', 'sample_3_2.txt', 'input_3.txt'],
-        loader=load,
-        solutions=[solve_pt1, solve_pt2]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,27 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+_NOISE_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789()[]{}<>,;:!@#$%^&*+-_/? '
+_DECOYS = ('mul(', 'mul[3,4]', 'mul ( 2 , 4 )', 'mul(1234,5)', 'do', "don't", 'mul(4*')
+
+
+@register_generator(day_number=3)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    for _ in range(6 * scale):
+        tokens = []
+        line_length = 0
+        while line_length < 3000:
+            roll = rng.random()
+            if roll < 0.25:
+                token = f'mul({rng.randint(1, 999)},{rng.randint(1, 999)})'
+            elif roll < 0.28:
+                token = rng.choice(('do()', "don't()"))
+            elif roll < 0.35:
+                token = rng.choice(_DECOYS)
+            else:
+                token = ''.join(rng.choices(_NOISE_CHARS, k=rng.randint(1, 8)))
+            tokens.append(token)
+            line_length += len(token)
+        file.write(''.join(tokens) + '\n')
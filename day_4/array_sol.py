@@ -0,0 +1,50 @@
+from typing import TextIO
+
+import numpy as np
+
+from common.array_grid import ArrayGrid
+from common.file_solver import FileSolver
+from common.grid import ALL_DIRECTIONS, Direction, load_char_grid, scale_relative_point
+
+LoadedDataType = ArrayGrid[str]
+
+_WORD = 'XMAS'
+
+
+def load(file: TextIO) -> LoadedDataType:
+    return load_char_grid(file, as_array=True)
+
+
+def solve_pt1(grid: LoadedDataType) -> int:
+    # For each direction, find every start point whose following letters in that direction spell the word
+    result = 0
+    for direction in ALL_DIRECTIONS:
+        matches = grid.mask(_WORD[0])
+        for i, letter in enumerate(_WORD[1:], start=1):
+            matches &= grid.shift(scale_relative_point(direction.value, i), '') == letter
+        result += int(matches.sum())
+    return result
+
+
+def solve_pt2(grid: LoadedDataType) -> int:
+    def is_mas_diagonal(first: Direction, second: Direction) -> np.ndarray:
+        first_letters, second_letters = grid.shift(first, ''), grid.shift(second, '')
+        return (
+            ((first_letters == 'M') & (second_letters == 'S'))
+            | ((first_letters == 'S') & (second_letters == 'M'))
+        )
+
+    matches = (
+        grid.mask('A')
+        & is_mas_diagonal(Direction.NORTH_WEST, Direction.SOUTH_EAST)
+        & is_mas_diagonal(Direction.NORTH_EAST, Direction.SOUTH_WEST)
+    )
+    return int(matches.sum())
+
+
+if __name__ == "__main__":
+    FileSolver[LoadedDataType].construct_for_day(
+        day_number=4,
+        loader=load,
+        solutions=[solve_pt1, solve_pt2]
+    ).solve_all()
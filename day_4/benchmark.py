@@ -1,29 +1,46 @@
-from timeit import timeit
+import importlib.util
 
-from day_4 import *
-from fast_sol import *
+from common.benchmark import format_day_report, register_benchmark, run_day_benchmarks
+from common.file_solver import FileSolver
+from common.grid import load_char_grid
+from common.line_solver import LineSolver
+import day_4
+import fast_sol
 
 
-def fast_solve() -> None:
-    solver = LineSolver[LineDataType].construct_for_day(
+@register_benchmark(day_number=4, name='day_4.day_4')
+def slow_solve() -> None:
+    FileSolver[day_4.LoadedDataType].construct_for_day(
         day_number=4,
-        line_parser=lambda x: x.strip(),
-        solutions=[FastXMASWordSolver],
+        loader=load_char_grid,
+        solutions=[day_4.solve_pt1],
         log_func=lambda x: ...,
-    )
-    solver.solve_file('input_4.txt')
+    ).solve_file('input_4.txt')
 
 
-def slow_solve() -> None:
-    FileSolver[LoadedDataType].construct_for_day(
+@register_benchmark(day_number=4, name='day_4.fast_sol')
+def fast_solve() -> None:
+    LineSolver[fast_sol.LineDataType, None].construct_for_day(
         day_number=4,
-        loader=load_char_grid,
-        solutions=[solve_pt1],
+        line_parser=lambda x: x.strip(),
+        solutions=[fast_sol.FastXMASWordSolver],
         log_func=lambda x: ...,
     ).solve_file('input_4.txt')
 
 
-if __name__ == "__main__":
-    fast = timeit(fast_solve, number=10)
-    slow = timeit(slow_solve, number=10)
-    print(f'Fast: {fast:.2}s, slow: {slow:.2}s. Speedup: {slow / fast:.4}x')
+# NumPy is optional, so only benchmark the vectorised solution where it's installed
+if importlib.util.find_spec('numpy') is not None:
+    import array_sol
+
+    @register_benchmark(day_number=4, name='day_4.array_sol')
+    def array_solve() -> None:
+        FileSolver[array_sol.LoadedDataType].construct_for_day(
+            day_number=4,
+            loader=array_sol.load,
+            solutions=[array_sol.solve_pt1],
+            log_func=lambda x: ...,
+        ).solve_file('input_4.txt')
+
+
+if __name__ == '__main__':
+    print(format_day_report(run_day_benchmarks(4)))
@@ -0,0 +1,10 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator, scaled_side, write_grid
+
+
+@register_generator(day_number=4)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(140, scale)
+    write_grid(file, (rng.choices('XMAS', k=side) for _ in range(side)))
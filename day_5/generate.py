@@ -0,0 +1,20 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+@register_generator(day_number=5)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    # Like real inputs, every pair of pages has a rule, so every update has exactly one valid ordering
+    pages = rng.sample(range(10, 100), 49)
+    for i, left in enumerate(pages):
+        for right in pages[i + 1:]:
+            file.write(f'{left}|{right}\n')
+    file.write('\n')
+
+    for _ in range(200 * scale):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        file.write(','.join(map(str, update)) + '\n')
@@ -1,28 +1,30 @@
-from timeit import timeit
-
+from common.benchmark import format_day_report, register_benchmark, run_day_benchmarks
+from common.file_solver import FileSolver
+import day_6
 import fast
-from day_6 import *
 
 
-def fast_solve() -> None:
-    FileSolver[fast.LoadedDataType].construct_for_day(
+@register_benchmark(day_number=6, name='day_6.day_6')
+def slow_solve() -> None:
+    FileSolver[day_6.LoadedDataType].construct_for_day(
         day_number=6,
-        loader=fast.load,
-        solutions=[fast.solve_pt1, fast.solve_pt2],
+        loader=day_6.load,
+        solutions=[day_6.solve_pt1, day_6.solve_pt2],
+        stages={'guard_path': day_6.guard_path},
         log_func=lambda x: ...,
     ).solve_all()
 
 
-def slow_solve() -> None:
-    FileSolver[LoadedDataType].construct_for_day(
+@register_benchmark(day_number=6, name='day_6.fast')
+def fast_solve() -> None:
+    FileSolver[fast.LoadedDataType].construct_for_day(
         day_number=6,
-        loader=load,
-        solutions=[solve_pt1, solve_pt2],
+        loader=fast.load,
+        solutions=[fast.solve_pt1, fast.solve_pt2],
+        stages={'visited_positions': fast.visited_positions},
         log_func=lambda x: ...,
     ).solve_all()
 
 
-if __name__ == "__main__":
-    fast = timeit(fast_solve, number=10)
-    slow = timeit(slow_solve, number=10)
-    print(f'Fast: {fast:.2}s, slow: {slow:.2}s. Speedup: {slow / fast:.4}x')
+if __name__ == '__main__':
+    print(format_day_report(run_day_benchmarks(6)))
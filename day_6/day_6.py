@@ -2,7 +2,7 @@ from collections import deque
 from typing import TextIO, Optional
 
 from common.file_solver import FileSolver
-from common.grid import Grid, Direction, PositionType, add_point, rotate_90
+from common.grid import BitGrid, Direction, PositionType, add_point, rotate_90
 
 GuardPosType = tuple[PositionType, Direction]
 
@@ -14,7 +14,7 @@ _GUARD_CHAR_TO_DIR = {
 }
 
 
-class LabGrid(Grid[bool]):
+class LabGrid(BitGrid):
     pass
 
 
@@ -38,9 +38,13 @@ def load(file: TextIO) -> LoadedDataType:
     return LabGrid(list(grid_data)), guard_pos
 
 
-def solve_pt1(data: LoadedDataType) -> int:
+def guard_path(data: LoadedDataType) -> set[PositionType]:
     visited_squares, _ = _get_path(*data)
-    return len(visited_squares)
+    return visited_squares
+
+
+def solve_pt1(data: LoadedDataType, guard_path: set[PositionType]) -> int:
+    return len(guard_path)
 
 
 def _get_path(obstacle_grid: LabGrid, guard_pos: GuardPosType) -> tuple[set[PositionType], bool]:
@@ -66,11 +70,10 @@ def _get_next_guard_pos(obstacle_grid: LabGrid, guard_pos: GuardPosType) -> Guar
     return next_point, direction
 
 
-def solve_pt2(data: LoadedDataType) -> int:
+def solve_pt2(data: LoadedDataType, guard_path: set[PositionType]) -> int:
     obstacle_grid, guard_pos = data
-    visited_squares, _ = _get_path(obstacle_grid, guard_pos)
     result = 0
-    for point in visited_squares:
+    for point in guard_path:
         if _can_cause_cycle_at(obstacle_grid, guard_pos, point):
             # print(point)
             result += 1
@@ -80,15 +83,46 @@ def solve_pt2(data: LoadedDataType) -> int:
 def _can_cause_cycle_at(obstacle_grid: LabGrid, guard_pos: GuardPosType, new_obstacle_pos: PositionType) -> bool:
     if new_obstacle_pos == guard_pos[0]:
         return False
-    obstacle_grid[new_obstacle_pos] = True
-    _, is_cycle = _get_path(obstacle_grid, guard_pos)
-    obstacle_grid[new_obstacle_pos] = False
-    return is_cycle
+    with obstacle_grid.what_if():
+        obstacle_grid[new_obstacle_pos] = True
+        return _is_cycle(obstacle_grid, guard_pos)
+
+
+def _is_cycle(obstacle_grid: LabGrid, guard_pos: GuardPosType) -> bool:
+    # Jumps straight to the next obstacle on each leg rather than stepping through every square. The guard only
+    # cycles if it turns at the same point, facing the same direction, twice.
+    turns: set[GuardPosType] = set()
+    (row, col), direction = guard_pos
+    while True:
+        d_row, d_col = direction.value
+        if d_row:
+            obstacle_row = obstacle_grid.next_set_in_col(col, row, reverse=d_row < 0)
+            if obstacle_row is None:
+                return False
+            row = obstacle_row - d_row
+        else:
+            obstacle_col = obstacle_grid.next_set_in_row(row, col, reverse=d_col < 0)
+            if obstacle_col is None:
+                return False
+            col = obstacle_col - d_col
+
+        if ((row, col), direction) in turns:
+            return True
+        turns.add(((row, col), direction))
+        direction = rotate_90(direction)
+
+
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType].construct_for_day(
+            day_number=6,
+            loader=load,
+            solutions=[solve_pt1, solve_pt2],
+            stages={'guard_path': guard_path},
+        ),
+    ]
 
 
 if __name__ == "__main__":
-    FileSolver[LoadedDataType].construct_for_day(
-        day_number=6,
-        loader=load,
-        solutions=[solve_pt1, solve_pt2]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
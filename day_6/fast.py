@@ -1,10 +1,9 @@
-import bisect
 import itertools
 from collections import deque
 from typing import TextIO, Optional, Sequence, Iterable
 
 from common.file_solver import FileSolver
-from common.grid import Grid, Direction, PositionType, rotate_90
+from common.grid import CARDINAL_DIRS, Grid, Direction, PositionType, rotate_90
 
 GuardPosType = tuple[PositionType, Direction]
 
@@ -19,36 +18,7 @@ _GUARD_CHAR_TO_DIR = {
 class LabGrid(Grid[str]):
     def __init__(self, lab_data: Sequence[Sequence[str]]) -> None:
         super().__init__(lab_data)
-
-        self._obstructions_by_row = [
-            [
-                col_idx
-                for col_idx, col_val in enumerate(row_val)
-                if col_val == '#'
-            ]
-            for row_val in lab_data
-        ]
-        self._obstructions_by_col = [
-            [
-                row_idx
-                for row_idx in range(self.height)
-                if lab_data[row_idx][col_idx] == '#'
-            ]
-            for col_idx in range(self.width)
-        ]
-
-    def __setitem__(self, position: PositionType, value: str) -> None:
-        super().__setitem__(position, value)
-
-        row, col = position
-        if value == '#':
-            # Add our new obstruction to our internal data structures
-            bisect.insort(self._obstructions_by_row[row], col)
-            bisect.insort(self._obstructions_by_col[col], row)
-        else:
-            # Filter out our removed obstruction from internal data structures
-            self._obstructions_by_row[row] = [c for c in self._obstructions_by_row[row] if c != col]
-            self._obstructions_by_col[col] = [r for r in self._obstructions_by_col[col] if r != row]
+        self._obstructions = self.ray_cast_index(lambda value: value == '#', CARDINAL_DIRS)
 
     def get_sparse_path(self, initial_guard_pos: GuardPosType) -> tuple[Sequence[GuardPosType], bool]:
         path = deque()
@@ -62,50 +32,21 @@ class LabGrid(Grid[str]):
         return list(path), cur_guard_pos in visited_guard_positions
 
     def _get_next_location(self, guard_pos: GuardPosType) -> GuardPosType:
-        (row, col), direction = guard_pos
-
-        sign = sum(direction.value)  # -1 if NORTH or WEST, +1 if SOUTH or EAST
-        if direction in {Direction.NORTH, Direction.SOUTH}:
+        point, direction = guard_pos
+        d_row, d_col = direction.value
+        obstruction = self._obstructions.next_match(point, direction)
+        if obstruction is None:
+            # Walk off the edge of the grid
+            row, col = point
             next_point = (
-                self._get_next_dimension_on_axis(
-                    current_location_on_axis=row,
-                    relevant_obstructions_on_axis=self._obstructions_by_col[col],
-                    sign=sign,
-                    axis_length=self.height,
-                ),
-                col,
+                (-1 if d_row < 0 else self.height) if d_row else row,
+                (-1 if d_col < 0 else self.width) if d_col else col,
             )
         else:
-            next_point = (
-                row,
-                self._get_next_dimension_on_axis(
-                    current_location_on_axis=col,
-                    relevant_obstructions_on_axis=self._obstructions_by_row[row],
-                    sign=sign,
-                    axis_length=self.height,
-                ),
-            )
+            next_point = obstruction[0] - d_row, obstruction[1] - d_col
 
         return next_point, rotate_90(direction)
 
-    @staticmethod
-    def _get_next_dimension_on_axis(
-            current_location_on_axis: int,
-            relevant_obstructions_on_axis: Sequence[int],
-            sign: int,
-            axis_length: int,
-    ) -> int:
-        next_obstruction_idx = (
-                bisect.bisect(relevant_obstructions_on_axis, current_location_on_axis)
-                + ((sign - 1) >> 1)
-        )
-        if next_obstruction_idx < 0:
-            return -1
-        elif next_obstruction_idx >= len(relevant_obstructions_on_axis):
-            return axis_length
-        else:
-            return relevant_obstructions_on_axis[next_obstruction_idx] - sign
-
     def fill_sparse_path(self, path: Sequence[GuardPosType]) -> set[PositionType]:
         visited_positions: set[PositionType] = set()
         for cur, next in itertools.pairwise(path):
@@ -143,18 +84,20 @@ def load(file: TextIO) -> LoadedDataType:
     return LabGrid(lines), guard_pos
 
 
-def solve_pt1(data: LoadedDataType) -> int:
+def visited_positions(data: LoadedDataType) -> set[PositionType]:
     grid, guard_pos = data
     path, _ = grid.get_sparse_path(guard_pos)
-    return len(grid.fill_sparse_path(path))
+    return grid.fill_sparse_path(path)
+
+
+def solve_pt1(data: LoadedDataType, visited_positions: set[PositionType]) -> int:
+    return len(visited_positions)
 
 
-def solve_pt2(data: LoadedDataType) -> int:
+def solve_pt2(data: LoadedDataType, visited_positions: set[PositionType]) -> int:
     obstacle_grid, initial_pos = data
-    sparse_path, _ = obstacle_grid.get_sparse_path(initial_pos)
-    full_path = obstacle_grid.fill_sparse_path(sparse_path)
     result = 0
-    for point in full_path:
+    for point in visited_positions:
         if _can_cause_cycle_at(obstacle_grid, initial_pos, point):
             # print(point)
             result += 1
@@ -164,9 +107,9 @@ def solve_pt2(data: LoadedDataType) -> int:
 def _can_cause_cycle_at(obstacle_grid: LabGrid, initial_pos: GuardPosType, new_obstacle_pos: PositionType) -> bool:
     if new_obstacle_pos == initial_pos[0]:
         return False
-    obstacle_grid[new_obstacle_pos] = '#'
-    _, is_cycle = obstacle_grid.get_sparse_path(initial_pos)
-    obstacle_grid[new_obstacle_pos] = '.'
+    with obstacle_grid.what_if():
+        obstacle_grid[new_obstacle_pos] = '#'
+        _, is_cycle = obstacle_grid.get_sparse_path(initial_pos)
     return is_cycle
 
 
@@ -174,5 +117,6 @@ if __name__ == "__main__":
     FileSolver[LoadedDataType].construct_for_day(
         day_number=6,
         loader=load,
-        solutions=[solve_pt1, solve_pt2]
+        solutions=[solve_pt1, solve_pt2],
+        stages={'visited_positions': visited_positions},
     ).solve_all()
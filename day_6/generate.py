@@ -0,0 +1,13 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator, scaled_side, write_grid
+
+
+@register_generator(day_number=6)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(130, scale)
+    grid = [['#' if rng.random() < 0.05 else '.' for _ in range(side)] for _ in range(side)]
+    guard_row, guard_col = rng.randrange(side), rng.randrange(side)
+    grid[guard_row][guard_col] = '^'
+    write_grid(file, grid)
@@ -13,6 +13,11 @@ def parse_line(line: str) -> LineDataType:
     return int(target), tuple(map(int, seq))
 
 
+def parse_line_bytes(line: bytes) -> LineDataType:
+    target, rest = line.split(b':')
+    return int(target), tuple(map(int, rest.split()))
+
+
 def pt1_line_score(line: LineDataType) -> int:
     return score_line(
         line,
@@ -61,13 +66,21 @@ def concat_ints(a: int, b: int) -> int:
     return a * (10 ** math.ceil(math.log10(b + 1))) + b
 
 
+def get_solvers() -> list[LineSolver[LineDataType, None]]:
+    return [
+        LineSolver[LineDataType, None].construct_for_day(
+            day_number=7,
+            line_parser=parse_line,
+            bytes_line_parser=parse_line_bytes,
+            solutions=[
+                create_summing_solution(pt1_line_score),
+                create_summing_solution(pt2_line_score),
+            ]
+        ),
+    ]
+
+
 if __name__ == "__main__":
     print(concat_ints(23, 100))
-    LineSolver[LineDataType, None].construct_for_day(
-        day_number=7,
-        line_parser=parse_line,
-        solutions=[
-            create_summing_solution(pt1_line_score),
-            create_summing_solution(pt2_line_score),
-        ]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,23 @@
+import operator
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+def _concat(left: int, right: int) -> int:
+    return int(f'{left}{right}')
+
+
+@register_generator(day_number=7)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    for _ in range(850 * scale):
+        nums = [rng.randint(1, 999) for _ in range(rng.randint(2, 12))]
+        if rng.random() < 0.5:
+            # Build the target out of the numbers so that the equation is solvable
+            target = nums[0]
+            for num in nums[1:]:
+                target = rng.choice((operator.add, operator.mul, _concat))(target, num)
+        else:
+            target = rng.randint(1, 10 ** rng.randint(3, 15))
+        file.write(f'{target}: {" ".join(map(str, nums))}\n')
@@ -1,10 +1,10 @@
 import collections
 import itertools
 import math
-from typing import Iterable, Deque
+from typing import Iterable, Deque, Sequence, TextIO
 
 from common.file_solver import FileSolver
-from common.grid import *
+from common.grid import Grid, PositionType, add_point, scale_relative_point, load_char_grid
 
 
 class AntennaGrid:
@@ -72,9 +72,16 @@ def solve_pt2(antenna_grid: LoadedDataType) -> int:
     return len(visited)
 
 
+def get_solvers() -> list[FileSolver[LoadedDataType]]:
+    return [
+        FileSolver[LoadedDataType].construct_for_day(
+            day_number=8,
+            loader=load,
+            solutions=[solve_pt1, solve_pt2]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[LoadedDataType].construct_for_day(
-        day_number=8,
-        loader=load,
-        solutions=[solve_pt1, solve_pt2]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,16 @@
+import random
+import string
+from typing import TextIO
+
+from common.generate import register_generator, scaled_side, write_grid
+
+_FREQUENCIES = string.digits + string.ascii_letters
+
+
+@register_generator(day_number=8)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    side = scaled_side(50, scale)
+    grid = [['.'] * side for _ in range(side)]
+    for _ in range(side * side // 14):
+        grid[rng.randrange(side)][rng.randrange(side)] = rng.choice(_FREQUENCIES)
+    write_grid(file, grid)
@@ -100,9 +100,16 @@ def solve_pt2(data: str) -> int:
     )
 
 
+def get_solvers() -> list[FileSolver[str]]:
+    return [
+        FileSolver[str].construct_for_day(
+            day_number=9,
+            loader=load,
+            solutions=[solve_pt1, solve_pt2]
+        ),
+    ]
+
+
 if __name__ == "__main__":
-    FileSolver[str].construct_for_day(
-        day_number=9,
-        loader=load,
-        solutions=[solve_pt1, solve_pt2]
-    ).solve_all()
+    for solver in get_solvers():
+        solver.solve_all()
@@ -0,0 +1,15 @@
+import random
+from typing import TextIO
+
+from common.generate import register_generator
+
+
+@register_generator(day_number=9)
+def generate(file: TextIO, scale: int, rng: random.Random) -> None:
+    num_files = 10_000 * scale
+    digits = []
+    for _ in range(num_files - 1):
+        digits.append(str(rng.randint(1, 9)))
+        digits.append(str(rng.randint(0, 9)))
+    digits.append(str(rng.randint(1, 9)))
+    file.write(''.join(digits) + '\n')